@@ -0,0 +1,85 @@
+"""Checkpointed team runs — snapshot after every turn, resume after a crash or a move.
+
+``run_checkpointed`` wraps ``team.run_stream``: each time a participant
+(planner, user, specialists, itinerary agent) finishes a turn the team's
+state is saved to a ``CheckpointStore``, and the checkpoint is dropped once
+the run completes. Calling it with ``task=None`` rebuilds the conversation
+from the last checkpoint and continues from the next speaker, so completed
+turns (and their LLM and tool calls) are not paid for again — in the same
+process, after a restart, or on another server worker sharing the store.
+A turn that was in progress when the process died is run again.
+
+The snapshot is taken from the team's speaker selector
+(``RoutingSelector.between_turns``), not from the event stream: there the
+manager has recorded the turn and waits for the save before it starts the
+next speaker, so the team is not running while its state is read.
+"""
+
+import asyncio
+from typing import AsyncGenerator, Sequence
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_agentchat.teams import SelectorGroupChat
+from autogen_core import CancellationToken
+
+from agents.names import ITINERARY_AGENT, PLANNER, SPECIALISTS, USER
+from agents.team import team_selector
+from config.checkpoints import CheckpointStore
+from config.memory import DEFAULT_USER
+
+# Messages that end a participant's turn (the specialists' own messages are inner events of one turn)
+TURN_SOURCES = frozenset({PLANNER, USER, SPECIALISTS, ITINERARY_AGENT})
+
+
+def count_turns(thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> int:
+    """Completed participant turns in a group chat thread."""
+    return sum(isinstance(message, BaseChatMessage) and message.source in TURN_SOURCES for message in thread)
+
+
+async def run_checkpointed(
+    team: SelectorGroupChat,
+    store: CheckpointStore,
+    session_id: str,
+    task: str | None = None,
+    user_id: str = DEFAULT_USER,
+    cancellation_token: CancellationToken | None = None,
+) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | TaskResult, None]:
+    """``team.run_stream(task=task)`` with a checkpoint after every turn.
+
+    Args:
+        team: a team from ``build_team()`` that is not running; on resume its state is replaced.
+        store: where checkpoints are written (and read on resume).
+        session_id: checkpoint key for this conversation.
+        task: the trip request, or None to resume ``session_id`` from ``store``.
+        user_id: traveler recorded with the checkpoint (ignored on resume).
+        cancellation_token: passed through to ``run_stream``.
+
+    Raises:
+        KeyError: ``task`` is None and ``session_id`` has no checkpoint.
+        ValueError: ``team`` was not made by ``build_team()``.
+    """
+    selector = team_selector(team)
+    if selector is None:
+        raise ValueError("run_checkpointed needs a team made by build_team()")
+    request = task or ""
+    if task is None:
+        checkpoint = await asyncio.to_thread(store.load, session_id)
+        if checkpoint is None:
+            raise KeyError(f"No checkpoint for session {session_id!r}")
+        await team.load_state(checkpoint.state)
+        request, user_id = checkpoint.request, checkpoint.user_id
+
+    async def save(thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        state = await team.save_state()
+        # Compression and the SQLite write stay off the event loop
+        await asyncio.to_thread(store.save, session_id, state, request, user_id, count_turns(thread))
+
+    selector.between_turns = save
+    try:
+        async for item in team.run_stream(task=task, cancellation_token=cancellation_token):
+            if isinstance(item, TaskResult):
+                await asyncio.to_thread(store.delete, session_id)
+            yield item
+    finally:
+        selector.between_turns = None
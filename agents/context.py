@@ -0,0 +1,207 @@
+"""Per-agent model contexts — each agent sees only the slice of the transcript it needs.
+
+In a ``SelectorGroupChat`` every agent receives every message, so without
+these policies the specialists' raw results and the planner's prose are
+re-sent to the model on every later turn.
+
+- :class:`SpecialistContext` — only the planner's latest delegation, cut
+  down to the specialist's own domain, plus the specialist's current tool round.
+- :class:`ItineraryContext` — the traveler's messages, a compact digest of
+  the specialist results and the planner's final summary.
+- :class:`TokenBudgetContext` — the full conversation, with the oldest turns
+  condensed to one line each once a tiktoken-measured budget is exceeded.
+"""
+
+import json
+import re
+from typing import Any, List
+
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import AssistantMessage, FunctionExecutionResultMessage, LLMMessage, UserMessage
+
+from agents.names import PLANNER, SPECIALISTS, USER
+from llm.tokens import count_tokens
+from tools.format import expand_records
+
+_AGENT_MENTION = re.compile(r"\**\b(flight|hotel|weather|itinerary)\s+agent\b", re.IGNORECASE)
+_SENTENCE_BEFORE_MENTION = re.compile(
+    r"(?<=[.;!])\s+(?=[^.;!]*\b(?:flight|hotel|weather|itinerary)\s+agent\b)", re.IGNORECASE
+)
+_SECTION = re.compile(r"^### (\w+)\s*$", re.MULTILINE)
+_SUMMARY_CHARS = 160
+
+
+def _message_tokens(message: LLMMessage) -> int:
+    content = message.content
+    if isinstance(content, str):
+        return count_tokens(content)
+    return count_tokens(json.dumps(message.model_dump(mode="json")["content"], ensure_ascii=False))
+
+
+def _fit_budget(messages: List[LLMMessage], max_tokens: int) -> List[LLMMessage]:
+    """Keep the first message and the newest messages that fit; condense the rest."""
+    if sum(_message_tokens(m) for m in messages) <= max_tokens or len(messages) <= 2:
+        return messages
+
+    head, rest = messages[0], messages[1:]
+    budget = max_tokens - _message_tokens(head)
+    kept: List[LLMMessage] = []
+    for message in reversed(rest):
+        cost = _message_tokens(message)
+        if cost > budget and kept:
+            break
+        kept.insert(0, message)
+        budget -= cost
+    # Never start on a tool result whose call was dropped
+    while kept and isinstance(kept[0], FunctionExecutionResultMessage):
+        kept.pop(0)
+
+    dropped = rest[: len(rest) - len(kept)]
+    lines = ["Earlier conversation (condensed):"]
+    for message in dropped:
+        if isinstance(message.content, str):
+            source = getattr(message, "source", "assistant")
+            text = " ".join(message.content.split())
+            lines.append(f"- {source}: {text[:_SUMMARY_CHARS]}{'…' if len(text) > _SUMMARY_CHARS else ''}")
+    summary = UserMessage(content="\n".join(lines), source="context")
+    return [head, summary, *kept] if len(lines) > 1 else [head, *kept]
+
+
+class TokenBudgetContext(ChatCompletionContext):
+    """Unbounded storage, but ``get_messages`` stays within ``max_tokens``.
+
+    Args:
+        max_tokens: budget for the conversation part of the prompt (system
+            message excluded), measured with tiktoken.
+    """
+
+    def __init__(self, max_tokens: int, initial_messages: List[LLMMessage] | None = None) -> None:
+        super().__init__(initial_messages)
+        self._max_tokens = max_tokens
+
+    async def get_messages(self) -> List[LLMMessage]:
+        return _fit_budget(self._messages, self._max_tokens)
+
+
+def scope_delegation(text: str, domain: str) -> str:
+    """Cut a planner message down to its preamble plus the parts addressed to ``domain``.
+
+    ``domain`` is ``"flight"``, ``"hotel"`` or ``"weather"``. The message is
+    split into lines (and lines addressing several agents into sentences);
+    lines without a mention belong to the agent mentioned last, and those
+    before any mention are kept as shared preamble. A message that never
+    mentions the domain's agent is returned unchanged.
+    """
+    chunks = []
+    for line in text.splitlines():
+        chunks.extend(_SENTENCE_BEFORE_MENTION.split(line))
+
+    kept, owners, found = [], set(), False
+    for chunk in chunks:
+        mentioned = {m.group(1).lower() for m in _AGENT_MENTION.finditer(chunk)}
+        if mentioned:
+            owners = mentioned
+        if not owners or domain in owners:
+            kept.append(chunk)
+            found = found or domain in owners
+    return "\n".join(kept).strip() if found else text
+
+
+class SpecialistContext(ChatCompletionContext):
+    """Only the planner's latest delegation (scoped to ``domain``) and what followed it."""
+
+    def __init__(self, domain: str, initial_messages: List[LLMMessage] | None = None) -> None:
+        super().__init__(initial_messages)
+        self._domain = domain
+
+    async def get_messages(self) -> List[LLMMessage]:
+        for index in range(len(self._messages) - 1, -1, -1):
+            message = self._messages[index]
+            if isinstance(message, UserMessage) and message.source == PLANNER and isinstance(message.content, str):
+                scoped = UserMessage(content=scope_delegation(message.content, self._domain), source=PLANNER)
+                return [scoped, *self._messages[index + 1:]]
+        # No delegation yet — fall back to the latest user message
+        users = [m for m in self._messages if isinstance(m, UserMessage)]
+        return users[-1:]
+
+
+def iter_json(text: str):
+    """Yield every JSON value in ``text`` (tool summaries may hold several back to back)."""
+    decoder = json.JSONDecoder()
+    index = 0
+    while index < len(text):
+        while index < len(text) and text[index].isspace():
+            index += 1
+        if index >= len(text):
+            return
+        try:
+            value, index = decoder.raw_decode(text, index)
+        except json.JSONDecodeError:
+            return
+        yield value
+
+
+def report_sections(text: str) -> list[tuple[str, str]]:
+    """``(agent, body)`` for each ``### agent`` section of the merged ``specialists`` message."""
+    sections = _SECTION.split(text)
+    return list(zip(sections[1::2], sections[2::2])) or [(SPECIALISTS, text)]
+
+
+def _digest_record(record: dict[str, Any]) -> str:
+    if "flight_no" in record:
+        return (
+            f"{record.get('airline')} {record['flight_no']} {record.get('origin')}→{record.get('destination')} "
+            f"{record.get('date')} dep {record.get('departure')} ({record.get('duration')}) ${record.get('price_usd')}"
+        )
+    if "price_per_night_usd" in record:
+        amenities = ", ".join(record.get("amenities", [])[:3])
+        return (
+            f"{record.get('name')} ({record.get('city')}) ${record['price_per_night_usd']}/night "
+            f"★{record.get('rating')} {record.get('check_in')}→{record.get('check_out')} — {amenities}"
+        )
+    if "condition" in record:
+        return (
+            f"{record.get('city')} {record.get('date')}: {record['condition']}, "
+            f"{record.get('temperature_celsius')}°C/{record.get('temperature_fahrenheit')}°F, "
+            f"humidity {record.get('humidity_percent')}%, wind {record.get('wind_speed_kmh')} km/h"
+        )
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+
+
+def digest_specialist_report(text: str, top_k: int = 3, max_chars: int = 1200) -> str:
+    """Compact, structured digest of the merged ``specialists`` message.
+
+    JSON tool results become one line per option (best ``top_k`` kept, in
+    the tools' own ranking); prose replies are trimmed to ``max_chars``.
+    """
+    lines = []
+    for name, body in report_sections(text):
+        lines.append(f"{name}:")
+        values = list(iter_json(body.strip()))
+        if not values:
+            trimmed = body.strip()
+            lines.append(f"  {trimmed[:max_chars]}{'…' if len(trimmed) > max_chars else ''}")
+            continue
+        for value in values:
+            records = expand_records(value)
+            for record in records[:top_k]:
+                lines.append(f"  - {_digest_record(record) if isinstance(record, dict) else record}")
+    return "\n".join(lines)
+
+
+class ItineraryContext(ChatCompletionContext):
+    """Traveler messages + digest of the specialist results + the planner's latest summary."""
+
+    async def get_messages(self) -> List[LLMMessage]:
+        travelers = [m for m in self._messages if isinstance(m, UserMessage) and m.source == USER]
+        reports = [m for m in self._messages if isinstance(m, UserMessage) and m.source == SPECIALISTS]
+        planner = [m for m in self._messages if isinstance(m, UserMessage) and m.source == PLANNER]
+        own = [m for m in self._messages if isinstance(m, (AssistantMessage, FunctionExecutionResultMessage))]
+
+        messages: List[LLMMessage] = list(travelers)
+        if reports and isinstance(reports[-1].content, str):
+            digest = digest_specialist_report(reports[-1].content)
+            messages.append(UserMessage(content=f"Specialist results (digest):\n{digest}", source=SPECIALISTS))
+        messages.extend(planner[-1:])
+        messages.extend(own)
+        return messages
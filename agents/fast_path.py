@@ -0,0 +1,409 @@
+"""Rule-based fast path for the planner's first turn.
+
+Well-formed requests ("New York to Tokyo, 2026-03-10 to 2026-03-15, $3000")
+are parsed locally, together with the traveler's remembered preferences,
+and the specialists are dispatched straight away — no planner LLM call.
+Anything ambiguous (a missing city or date, several routes or legs,
+relative or partial dates, an amount per night or person or in another
+currency) falls through to the LLM planner unchanged, as does a request
+stating a preference ("I prefer Delta"): only the planner's own turn
+records it with ``SAVE_PREFERENCE``. The traveler's own words travel with
+the delegation, so constraints the parser does not model ("business class",
+"a hotel with a pool") still reach the specialists.
+"""
+
+import re
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, AsyncGenerator, Mapping, Sequence
+
+from autogen_agentchat.agents import AssistantAgent, BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_core.models import AssistantMessage
+
+from agents.names import USER
+from telemetry.tracing import Tracer
+from tools.cache import normalize_date
+
+_MONTHS = (
+    r"(?:January|February|March|April|May|June|July|August|September|October|November|December"
+    r"|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sept|Sep|Oct|Nov|Dec)\.?"
+)
+_CITY_WORD = rf"(?!{_MONTHS}(?:\s|$))(?!(?i:to)\b)[A-Z][\w.'-]*"
+_CITY = rf"{_CITY_WORD}(?:\s+{_CITY_WORD})*"
+_ROUTE_FROM = re.compile(rf"\b(?i:from)\s+({_CITY})\s+(?i:to|→|->)\s+({_CITY})")
+_ROUTE_BARE = re.compile(rf"^\s*({_CITY})\s+(?i:to|→|->)\s+({_CITY})")
+# Any-case fallback ("from boston to paris"): up to three words, ended by punctuation or a following clause
+_LOOSE_WORD = r"(?!(?:to|and)\b)[A-Za-z][\w.'-]*"
+_LOOSE_CITY = rf"{_LOOSE_WORD}(?:\s+{_LOOSE_WORD}){{0,2}}?"
+_CITY_END = (
+    r"(?=\s*(?:[,;!?]|\.(?:\s|$)|$)"
+    r"|\s+(?:on|in|for|from|between|with|departing|leaving|returning|next|this|around|budget|\d))"
+)
+_ROUTE_LOOSE = re.compile(rf"(?:\bfrom\s+|^\s*)({_LOOSE_CITY})\s+(?:to|→|->)\s+({_LOOSE_CITY}){_CITY_END}", re.IGNORECASE)
+_TO_CITY = re.compile(rf"\b(?i:to)\s+({_CITY})")
+_TO_CITY_LOOSE = re.compile(rf"\bto\s+({_LOOSE_CITY}){_CITY_END}", re.IGNORECASE)
+_MULTI_CITY = re.compile(r"\b(?:then|via|stopover|multi-city|and on to|continuing to)\b", re.IGNORECASE)
+# Another leg right after the destination ("… to Tokyo to Osaka", "… to Paris and Rome")
+_NEXT_LEG = re.compile(rf"\s*,?\s*(?:(?i:to|and)|→|->|&)\s+({_CITY})")
+# A leg right before a lone "to <city>" ("new york to tokyo to osaka"), but not "to go to"
+_PREVIOUS_LEG = re.compile(
+    rf"\b(?:to|→|->)\s+(?!(?:go|fly|travel|get|head|visit|see|book|plan|take)\b){_LOOSE_WORD}(?:\s+{_LOOSE_WORD}){{0,2}}\s+$",
+    re.IGNORECASE,
+)
+_DATE = re.compile(
+    rf"\b\d{{4}}[-/.]\d{{2}}[-/.]\d{{2}}\b"
+    rf"|\b{_MONTHS}\s+\d{{1,2}},?\s+\d{{4}}\b"
+    rf"|\b\d{{1,2}}\s+{_MONTHS}\s+\d{{4}}\b",
+    re.IGNORECASE,
+)
+_MONEY = re.compile(
+    r"[$€£¥₹₩]\s?(?P<amount>\d[\d,]*(?:\.\d+)?)(?!,?\d)(?P<k>\s?k\b)?"
+    r"|\bbudget\b[^\d\n]{0,12}?(?P<labelled>\d[\d,]*(?:\.\d+)?)(?!,?\d)(?P<lk>\s?k\b)?"
+    r"(?!\s*(?:travell?ers|people|persons|adults|guests|passengers|nights?|days?)\b)",
+    re.IGNORECASE,
+)
+# An amount per night, day or person ("$150 per night", "$90/day", "$100 pp")
+_PER_UNIT = re.compile(
+    r"\s*(?:usd|dollars?)?\s*(?:(?:/|per\b|an?\b|each\b)\s*(?:night|day|person|head|pax|travell?er|adult|room)s?\b"
+    r"|(?:each|nightly|daily|pp|pppn)\b)",
+    re.IGNORECASE,
+)
+# An amount for part of the trip ("hotels under $150", "flight budget $600")
+_SCOPED = re.compile(r"\b(?:hotels?|rooms?|flights?|airfare|food|meals?|daily|nightly|per\s+\w+)\b[^,;.\d]{0,15}$", re.IGNORECASE)
+_FOREIGN = re.compile(
+    r"[€£¥₹₩]|\b(?:eur|euros?|gbp|pounds?|jpy|yen|inr|rupees?|cad|aud|chf|francs?|cny|rmb|yuan|mxn|pesos?|won)\b",
+    re.IGNORECASE,
+)
+_OTHER_DOLLAR = re.compile(r"\b(?!US$)[A-Z]{1,2}$")  # "C$", "A$", "HK$" written before the amount
+_TOTAL = re.compile(r"\b(?:budget|total|in total|overall|all-in)\b", re.IGNORECASE)
+_TRAVELERS = re.compile(r"\b(\d+)\s+(?:travell?ers|people|persons|guests|passengers)\b", re.IGNORECASE)
+# Members of the party counted by age ("2 adults and 1 child")
+_PARTY_MEMBERS = re.compile(r"\b(\d+)\s+(?:adults?|child(?:ren)?|kids?|infants?|bab(?:y|ies)|toddlers?)\b", re.IGNORECASE)
+# Wording that states a preference the planner should remember ("I prefer Delta", "window seat")
+_PREFERENCE_CUES = re.compile(
+    r"\b(?:prefer\w*|always|usually|never|favou?rite|seats?|aisle|window|airlines?|frequent flyer|loyalty)\b",
+    re.IGNORECASE,
+)
+# Capitalized words that start a sentence rather than name a city ("Trip to Tokyo")
+_NOT_CITIES = {
+    "Trip", "Plan", "Travel", "Traveling", "Travelling", "Going", "Fly", "Flying", "Vacation", "Holiday", "Help", "I", "We",
+    "The", "My", "Our", "Here", "There", "Home", "Work", "Me", "Us",
+}
+# Remembered-preference keys that can stand in for a missing origin
+_ORIGIN_PREFERENCES = ("home_city", "origin", "home_airport")
+
+
+@dataclass(frozen=True)
+class TripRequest:
+    """The fields the planner's first turn would have extracted."""
+
+    origin: str
+    destination: str
+    depart: str
+    return_date: str
+    budget_usd: float | None = None
+    travelers: int | None = None
+    request: str = ""  # the traveler's own words, for the constraints not parsed above
+
+    def delegation(self, preferences: dict[str, Any] | None = None) -> str:
+        """The planner's step-4 message: one line per specialist, in the planner's own format."""
+        facts = [f"{self.origin} → {self.destination}", f"{self.depart} to {self.return_date}"]
+        if self.budget_usd is not None:
+            facts.append(f"budget ${self.budget_usd:,.0f}")
+        if self.travelers:
+            facts.append(f"{self.travelers} traveler{'s' if self.travelers != 1 else ''}")
+        lines = [f"Trip: {', '.join(facts)}."]
+        if self.request:
+            lines.append(f"Traveler's request (respect any other constraints in it): \"{' '.join(self.request.split())}\"")
+        if preferences:
+            lines.append("Remembered preferences: " + "; ".join(f"{k}: {v}" for k, v in preferences.items()) + ".")
+        lines += [
+            f"- Tell **Flight Agent** to search flights {self.origin} → {self.destination} on {self.depart} "
+            f"and {self.destination} → {self.origin} on {self.return_date}.",
+            f"- Tell **Hotel Agent** to search hotels in {self.destination}, "
+            f"check-in {self.depart}, check-out {self.return_date}.",
+            f"- Tell **Weather Agent** to check the weather in {self.destination} "
+            f"from {self.depart} to {self.return_date}.",
+        ]
+        return "\n".join(lines)
+
+
+def _city(name: str) -> str:
+    """``name`` as written, capitalized if the traveler typed it all in lower case."""
+    name = name.strip()
+    return name.title() if name.islower() else name
+
+
+def _next_leg(text: str, end: int) -> bool:
+    """Whether another city follows the destination that ends at ``end``."""
+    match = _NEXT_LEG.match(text, end)
+    return bool(match) and match.group(1).split()[0] not in _NOT_CITIES
+
+
+def _route(text: str) -> tuple[str, str] | None:
+    routes = (
+        list(_ROUTE_FROM.finditer(text)) or list(_ROUTE_BARE.finditer(text)) or list(_ROUTE_LOOSE.finditer(text))
+    )
+    if len(routes) != 1 or _next_leg(text, routes[0].end()):
+        return None  # no route, or a multi-city request
+    origin, destination = (_city(city) for city in routes[0].groups())
+    if origin.split()[0].title() in _NOT_CITIES or destination.split()[0].title() in _NOT_CITIES:
+        return None
+    if origin.casefold() == destination.casefold():
+        return None
+    return origin, destination
+
+
+def _route_or_home(text: str, preferences: dict[str, Any]) -> tuple[str, str] | None:
+    """The route in ``text``, or the remembered home city to a lone "to <City>"."""
+    route = _route(text)
+    if route is not None:
+        return route
+    home = next((preferences[key] for key in _ORIGIN_PREFERENCES if preferences.get(key)), None)
+    match = _TO_CITY.search(text) or _TO_CITY_LOOSE.search(text)
+    if not home or not match or match.group(1).split()[0].title() in _NOT_CITIES:
+        return None
+    if _next_leg(text, match.end()) or _PREVIOUS_LEG.search(text[:match.start()]):
+        return None
+    return str(home), _city(match.group(1))
+
+
+def _dates(text: str) -> list[str]:
+    """Valid ISO dates mentioned in ``text``, in order."""
+    dates = []
+    for raw in _DATE.findall(text):
+        try:
+            dates.append(date.fromisoformat(normalize_date(raw)).isoformat())
+        except ValueError:
+            continue
+    return dates
+
+
+@dataclass(frozen=True)
+class _Amount:
+    """A sum of money in the request."""
+
+    value: float
+    total: bool  # labelled as the trip's budget or total
+    qualified: bool  # per night / day / person, for part of the trip, or not in US dollars
+
+
+def _amounts(text: str) -> list[_Amount]:
+    amounts = []
+    for match in _MONEY.finditer(text):
+        value = float((match["amount"] or match["labelled"]).replace(",", ""))
+        if match["k"] or match["lk"]:
+            value *= 1000
+        before, after = text[max(0, match.start() - 25):match.start()], text[match.end():match.end() + 15]
+        qualified = bool(
+            _PER_UNIT.match(after) or _SCOPED.search(before)
+            or _FOREIGN.search(match.group()) or _FOREIGN.match(after.lstrip())
+            or (match.group().startswith("$") and _OTHER_DOLLAR.search(before))
+        )
+        total = bool(match["labelled"] or _TOTAL.search(before[-12:]) or _TOTAL.match(after.lstrip()))
+        amounts.append(_Amount(value, total, qualified))
+    return amounts
+
+
+def _budget_ambiguous(text: str) -> bool:
+    """Whether the amounts in ``text`` might not be a total trip budget in US dollars."""
+    amounts = _amounts(text)
+    totals = {a.value for a in amounts if a.total}
+    return any(a.qualified for a in amounts) or len(totals) > 1 or (not totals and len({a.value for a in amounts}) > 1)
+
+
+def _budget(text: str, preferences: dict[str, Any], labelled: bool = False) -> float | None:
+    """The trip's total budget in US dollars; amounts per night or person, or in another currency, are not one.
+
+    With ``labelled`` only an amount called the budget or total counts (a bare "$3000" does not).
+    """
+    amounts = _amounts(text)
+    if not amounts:
+        value = preferences.get("budget")
+        return float(value) if isinstance(value, (int, float)) else None
+    usable = [a for a in amounts if not a.qualified and (a.total or not labelled)]
+    if not usable:
+        return None
+    return next((a.value for a in usable if a.total), usable[0].value)
+
+
+def _travelers(text: str, preferences: dict[str, Any]) -> int | None:
+    """The party size: a stated total, else the sum of the adults, children and infants listed."""
+    match = _TRAVELERS.search(text)
+    if match:
+        return int(match.group(1))
+    members = _PARTY_MEMBERS.findall(text)
+    if members:
+        return sum(int(count) for count in members)
+    value = preferences.get("travelers")
+    return value if isinstance(value, int) else None
+
+
+def parse_trip_request(text: str, preferences: dict[str, Any] | None = None) -> TripRequest | None:
+    """Extract a single-destination round trip from ``text``, or ``None`` if it is ambiguous.
+
+    ``preferences`` (as returned by ``load_memory()``) fill in a missing
+    origin (``home_city``), budget or traveler count. A request that states
+    a preference is left to the planner, which saves it.
+    """
+    preferences = preferences or {}
+    if _MULTI_CITY.search(text) or _PREFERENCE_CUES.search(text) or _budget_ambiguous(text):
+        return None
+    if len(_DATE.findall(text)) != 2:
+        return None
+    dates = _dates(text)
+    if len(dates) != 2:
+        return None
+    depart, return_date = (date.fromisoformat(d) for d in dates)
+    if return_date <= depart:
+        return None
+
+    route = _route_or_home(text, preferences)
+    if route is None:
+        return None
+
+    return TripRequest(
+        origin=route[0],
+        destination=route[1],
+        depart=depart.isoformat(),
+        return_date=return_date.isoformat(),
+        budget_usd=_budget(text, preferences),
+        travelers=_travelers(text, preferences),
+        request=text.strip(),
+    )
+
+
+def extract_trip_fields(text: str, preferences: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Whatever ``text`` pins down — ``origin`` / ``destination``, ``dates``, ``budget_usd``
+    and ``travelers`` — even if the request is incomplete.
+
+    Unlike ``parse_trip_request`` this never gives up on a missing field;
+    it returns only the fields it found (multi-city requests yield nothing).
+    ``budget_usd`` is only set for an amount labelled as the trip's budget
+    or total ("Budget: $3000", "$3000 in total"), or a remembered budget.
+    """
+    if _MULTI_CITY.search(text):
+        return {}
+    preferences = preferences or {}
+    fields: dict[str, Any] = {}
+    route = _route_or_home(text, preferences)
+    if route is not None:
+        fields["origin"], fields["destination"] = route
+    dates = _dates(text)
+    if dates:
+        fields["dates"] = dates
+    budget = _budget(text, preferences, labelled=True)
+    if budget is not None:
+        fields["budget_usd"] = budget
+    travelers = _travelers(text, preferences)
+    if travelers is not None:
+        fields["travelers"] = travelers
+    return fields
+
+
+@dataclass
+class FastPathStats:
+    """How many conversations the planner fast path handled."""
+
+    requests: int = 0
+    fast_path: int = 0
+    seconds: float = 0.0
+
+    def record(self, hit: bool, seconds: float) -> None:
+        self.requests += 1
+        self.seconds += seconds
+        if hit:
+            self.fast_path += 1
+
+
+# Process-wide totals across every planner (all teams / sessions)
+_GLOBAL_STATS = FastPathStats()
+
+
+def fast_path_metrics() -> dict:
+    """Snapshot of the process-wide fast-path counters, with the fraction taken."""
+    stats = asdict(_GLOBAL_STATS)
+    stats["fraction"] = round(stats["fast_path"] / stats["requests"], 4) if stats["requests"] else 0.0
+    return stats
+
+
+class FastPathPlanner(BaseChatAgent):
+    """Wraps the planner; answers its first turn with a parsed delegation when it can.
+
+    When the fast path is taken, the task and the delegation are written to
+    the planner's model context as if it had produced the delegation itself,
+    so it later summarizes with the same context it would have had.
+
+    Args:
+        planner: the LLM planner agent.
+        preferences: the traveler's remembered preferences.
+        tracer: optional tracer; each attempt becomes a ``planner.fast_path`` span.
+    """
+
+    def __init__(self, planner: AssistantAgent, preferences: dict[str, Any] | None = None, tracer: Tracer | None = None) -> None:
+        super().__init__(name=planner.name, description=planner.description)
+        self._planner = planner
+        self._preferences = preferences or {}
+        self._tracer = tracer
+        self._spoken = False
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self._planner.produced_message_types
+
+    def _try_fast_path(self, messages: Sequence[BaseChatMessage]) -> TextMessage | None:
+        task = "\n".join(m.to_text() for m in messages if m.source == USER)
+        started = time.perf_counter()
+        trip = parse_trip_request(task, self._preferences) if task else None
+        _GLOBAL_STATS.record(trip is not None, time.perf_counter() - started)
+        if trip is None:
+            return None
+        return TextMessage(source=self.name, content=trip.delegation(self._preferences))
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response: Response | None = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        if not self._spoken:
+            self._spoken = True
+            if self._tracer:
+                with self._tracer.span("planner.fast_path") as span:
+                    reply = self._try_fast_path(messages)
+                    span.set(hit=reply is not None)
+            else:
+                reply = self._try_fast_path(messages)
+            if reply is not None:
+                context = self._planner.model_context
+                for message in messages:
+                    await context.add_message(message.to_model_message())
+                await context.add_message(AssistantMessage(content=reply.content, source=self.name))
+                yield Response(chat_message=reply)
+                return
+
+        async for item in self._planner.on_messages_stream(messages, cancellation_token):
+            yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._spoken = False
+        await self._planner.on_reset(cancellation_token)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"planner": await self._planner.save_state(), "spoken": self._spoken}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await self._planner.load_state(state["planner"])
+        self._spoken = state.get("spoken", False)
+
+    async def close(self) -> None:
+        await self._planner.close()
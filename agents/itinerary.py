@@ -0,0 +1,444 @@
+"""Template itinerary — the fixed sections rendered from the tool results.
+
+Most of the itinerary agent's output is data the specialists already
+returned: the chosen flights and hotel, the forecast and the budget
+arithmetic. ``collect_trip`` reads them from the merged ``specialists``
+report (in any ``TOOL_OUTPUT_FORMAT``, bundles from ``optimize_trip``
+included) and ``render_head`` / ``render_tail`` lay them out in the format
+of ``prompts/itinerary_agent.md`` with exact totals. ``TemplateItineraryAgent``
+sends those sections at once and leaves only the day-by-day activities to
+the model (``prompts/itinerary_days.md``), streamed in between; without a
+model client the days are templated as well.
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, AsyncGenerator, Mapping, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, ModelClientStreamingChunkEvent, TextMessage
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, SystemMessage, UserMessage
+
+from agents.context import iter_json, report_sections
+from agents.fast_path import extract_trip_fields
+from agents.names import PLANNER, SPECIALISTS, USER
+from tools.format import expand_records
+
+_WET = ("Rain", "Thunderstorm", "Snow")
+
+
+def _records(value: Any) -> list[Any]:
+    """Plain records of a tool result, including the batched tools' ``columns`` / ``rows`` matrices."""
+    if isinstance(value, dict) and {"columns", "rows"} <= set(value) and "shared" not in value:
+        fixed = {k: v for k, v in value.items() if k not in ("columns", "rows")}
+        return [{**fixed, **dict(zip(value["columns"], row))} for row in value["rows"]]
+    return expand_records(value)
+
+
+def _usd(amount: float) -> str:
+    return f"${amount:,.0f}" if float(amount).is_integer() else f"${amount:,.2f}"
+
+
+def _arrives(flight: dict[str, Any]) -> str:
+    """Where a flight lands — search results name it, ``optimize_trip`` bundles spell out the ``leg``."""
+    return flight.get("destination") or flight.get("leg", "").split(" → ")[-1]
+
+
+def _nights(check_in: str, check_out: str) -> int:
+    try:
+        return (date.fromisoformat(check_out) - date.fromisoformat(check_in)).days
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class TripPlan:
+    """What the itinerary is built on: the trip and the option chosen for each flight leg and stay."""
+
+    origin: str = ""
+    destination: str = ""
+    depart: str = ""
+    return_date: str = ""
+    travelers: int = 1
+    budget_usd: float | None = None
+    flights: list[dict[str, Any]] = field(default_factory=list)  # one per leg, in travel order
+    hotels: list[dict[str, Any]] = field(default_factory=list)   # one per city, with ``nights`` and ``subtotal_usd``
+    weather: list[dict[str, Any]] = field(default_factory=list)  # daily forecasts, by date
+    bundle_total_usd: float | None = None  # ``optimize_trip``'s total for the chosen bundle
+
+    @property
+    def flights_usd(self) -> float:
+        return sum(f["subtotal_usd"] for f in self.flights)
+
+    @property
+    def hotels_usd(self) -> float:
+        return sum(h["subtotal_usd"] for h in self.hotels)
+
+    @property
+    def total_usd(self) -> float:
+        if self.bundle_total_usd is not None:
+            return self.bundle_total_usd
+        return round(self.flights_usd + self.hotels_usd, 2)
+
+    @property
+    def days(self) -> list[str]:
+        """Every date of the trip, arrival and departure days included."""
+        try:
+            first, last = date.fromisoformat(self.depart), date.fromisoformat(self.return_date)
+        except ValueError:
+            return [self.depart] if self.depart else []
+        return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+    def forecast(self, day: str) -> dict[str, Any] | None:
+        return next((w for w in self.weather if w.get("date") == day), None)
+
+
+def _pick_flights(records: list[dict[str, Any]], plan: TripPlan) -> list[dict[str, Any]]:
+    """The cheapest flight per leg, preferring the planned travel dates."""
+    legs: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for record in records:
+        legs.setdefault((record.get("origin", ""), record.get("destination", "")), []).append(record)
+    planned = {plan.depart, plan.return_date}
+    chosen = []
+    for options in legs.values():
+        on_date = [f for f in options if f.get("date") in planned] or options
+        best = min(on_date, key=lambda f: f["price_usd"])
+        chosen.append({**best, "subtotal_usd": best["price_usd"] * plan.travelers})
+    return sorted(chosen, key=lambda f: f.get("date", ""))
+
+
+def _pick_hotel(records: list[dict[str, Any]], plan: TripPlan) -> dict[str, Any]:
+    """The first (best-ranked) hotel, priced for the stay and the rooms the party needs."""
+    best = records[0]
+    rooms = math.ceil(plan.travelers / 2)
+    if "total_usd" in best:  # search_hotel_rates: the exact rate of every night
+        dates = best.get("nights") or []
+        stay = {"check_in": dates[0], "check_out": (date.fromisoformat(dates[-1]) + timedelta(days=1)).isoformat()} if dates else {}
+        nights = len(best.get("nightly_usd", dates))
+        return {**best, **stay, "nights": nights, "rooms": rooms, "subtotal_usd": best["total_usd"] * rooms}
+    nights = _nights(best.get("check_in", plan.depart), best.get("check_out", plan.return_date))
+    return {**best, "nights": nights, "rooms": rooms, "subtotal_usd": best["price_per_night_usd"] * nights * rooms}
+
+
+def collect_trip(traveler_text: str, report: str, preferences: dict[str, Any] | None = None) -> TripPlan:
+    """Build a :class:`TripPlan` from the traveler's messages and the merged ``specialists`` report.
+
+    The first ``optimize_trip`` bundle, when the flight agent returned one,
+    fixes the flights, hotels and total. Otherwise the cheapest flight per
+    leg and the best-ranked hotel are used. Dates and cities come from the
+    tool results, falling back to what the traveler wrote. The budget is
+    ``optimize_trip``'s, or one the traveler labelled as the trip's budget
+    or total; other amounts ("under $150 per night") leave it unset.
+    """
+    fields = extract_trip_fields(traveler_text, preferences)
+    dates = fields.get("dates", [])
+    plan = TripPlan(
+        origin=fields.get("origin", ""),
+        destination=fields.get("destination", ""),
+        depart=dates[0] if dates else "",
+        return_date=dates[1] if len(dates) > 1 else "",
+        travelers=fields.get("travelers") or 1,
+        budget_usd=fields.get("budget_usd"),
+    )
+
+    flights, hotels, bundle = [], [], None
+    for _, body in report_sections(report):
+        for value in iter_json(body.strip()):
+            if isinstance(value, dict) and "bundles" in value:
+                bundle = bundle or (value["bundles"][0] if value["bundles"] else None)
+                plan.travelers = value.get("travelers") or plan.travelers
+                plan.budget_usd = value.get("budget_usd") or plan.budget_usd
+                continue
+            for record in _records(value):
+                if not isinstance(record, dict):
+                    continue
+                if "flight_no" in record and "price_usd" in record:
+                    flights.append(record)
+                elif "price_per_night_usd" in record or "total_usd" in record:
+                    hotels.append(record)
+                elif "condition" in record:
+                    plan.weather.append(record)
+
+    if bundle is not None:
+        plan.flights = list(bundle.get("flights", []))
+        plan.hotels = [{**h, "rooms": math.ceil(plan.travelers / 2)} for h in bundle.get("hotels", [])]
+        plan.bundle_total_usd = bundle.get("total_usd")
+        if plan.flights and not plan.origin:
+            plan.origin = plan.flights[0].get("leg", "").split(" → ")[0]
+        if plan.hotels:
+            plan.depart = plan.flights[0]["date"] if plan.flights else plan.hotels[0]["check_in"]
+            plan.return_date = plan.flights[-1]["date"] if plan.flights else plan.hotels[-1]["check_out"]
+            plan.destination = ", ".join(dict.fromkeys(h["city"] for h in plan.hotels))
+    else:
+        if hotels:
+            plan.hotels = [_pick_hotel(hotels, plan)]
+            stay = plan.hotels[0]
+            plan.destination = stay.get("city") or plan.destination
+            plan.depart = stay.get("check_in") or plan.depart
+            plan.return_date = stay.get("check_out") or plan.return_date
+        plan.flights = _pick_flights(flights, plan)
+        if plan.flights:
+            plan.origin = plan.flights[0].get("origin") or plan.origin
+            plan.destination = plan.destination or plan.flights[0].get("destination", "")
+
+    unique = {w.get("date"): w for w in sorted(plan.weather, key=lambda w: str(w.get("date")))}
+    plan.weather = list(unique.values())
+    return plan
+
+
+def _flight_line(label: str, flight: dict[str, Any], travelers: int) -> str:
+    route = flight.get("leg") or f"{flight.get('origin')} → {flight.get('destination')}"
+    details = f"{flight.get('airline')} {flight.get('flight_no')}, {route}, {flight.get('date')} dep {flight.get('departure')}"
+    if flight.get("duration"):
+        details += f" ({flight['duration']})"
+    price = _usd(flight["price_usd"])
+    cost = f"{price} × {travelers} = {_usd(flight['subtotal_usd'])}" if travelers > 1 else price
+    return f"  • {label}: {details} — {cost}"
+
+
+def _hotel_lines(hotel: dict[str, Any]) -> list[str]:
+    nightly = hotel.get("price_per_night_usd")
+    rate = f"{_usd(nightly)}/night" if nightly is not None else f"{_usd(hotel['total_usd'])} for the stay"
+    amenities = ", ".join(sorted(hotel.get("amenities", [])))
+    line = f"  • {hotel.get('name')} ({hotel.get('city')}) — {rate} — ★{hotel.get('rating')}"
+    lines = [f"{line} — {amenities}" if amenities else line]
+    if hotel.get("check_in"):
+        lines.append(f"    {hotel['check_in']} → {hotel.get('check_out')}, {hotel['nights']} night{'s' if hotel['nights'] != 1 else ''}")
+    return lines
+
+
+def _packing(weather: list[dict[str, Any]]) -> str:
+    temps = [w["temperature_celsius"] for w in weather if isinstance(w.get("temperature_celsius"), (int, float))]
+    tips = []
+    if any(any(wet in str(w.get("condition")) for wet in _WET) for w in weather):
+        tips.append("an umbrella and waterproof shoes")
+    if temps and min(temps) < 10:
+        tips.append("warm layers")
+    if temps and max(temps) > 25:
+        tips.append("light clothing and sunscreen")
+    return f"Pack {' and '.join(tips)}." if tips else "Comfortable layers for mild weather."
+
+
+def _weather_lines(plan: TripPlan) -> list[str]:
+    if not plan.weather:
+        return ["  • No forecast was reported."]
+    lines = []
+    by_city: dict[str, list[dict[str, Any]]] = {}
+    for forecast in plan.weather:
+        by_city.setdefault(forecast.get("city", plan.destination), []).append(forecast)
+    for city, forecasts in by_city.items():
+        temps = [w["temperature_celsius"] for w in forecasts if "temperature_celsius" in w]
+        summary = []
+        if temps:
+            summary.append(f"{min(temps)}–{max(temps)}°C" if min(temps) != max(temps) else f"{temps[0]}°C")
+        summary.append(", ".join(str(c) for c, _ in Counter(w.get("condition") for w in forecasts).most_common(2)))
+        dates = f"{forecasts[0].get('date')} → {forecasts[-1].get('date')}" if len(forecasts) > 1 else forecasts[0].get("date")
+        lines.append(f"  • {city} ({dates}): {', '.join(summary)}")
+    lines.append(f"  • {_packing(plan.weather)}")
+    return lines
+
+
+def render_head(plan: TripPlan) -> str:
+    """Everything before the day-by-day activities: header, flights, accommodation and weather."""
+    dates = f"{plan.depart} → {plan.return_date}" if plan.return_date else plan.depart or "dates to be confirmed"
+    lines = [f"🗺️ TRAVEL ITINERARY: {plan.destination or 'your trip'}", f"📅 {dates}"]
+    if plan.travelers > 1:
+        lines.append(f"👥 {plan.travelers} travelers")
+    budget = f"💰 Estimated Budget: {_usd(plan.total_usd)}"
+    lines.append(f"{budget} (of {_usd(plan.budget_usd)})" if plan.budget_usd else budget)
+
+    lines += ["", "---", "✈️ FLIGHTS"]
+    if not plan.flights:
+        lines.append("  • No flights were reported.")
+    for index, flight in enumerate(plan.flights):
+        if index == 0:
+            label = "Outbound"
+        elif index == len(plan.flights) - 1 and _arrives(flight) == plan.origin:
+            label = "Return"
+        else:
+            label = f"Leg {index + 1}"
+        lines.append(_flight_line(label, flight, plan.travelers))
+    if plan.flights and plan.return_date and _arrives(plan.flights[-1]) != plan.origin:
+        lines.append("  • Return: no return flight was reported — not included in the budget.")
+
+    lines += ["", "🏨 ACCOMMODATION"]
+    if not plan.hotels:
+        lines.append("  • No hotels were reported.")
+    for hotel in plan.hotels:
+        lines += _hotel_lines(hotel)
+
+    lines += ["", "🌤️ WEATHER OVERVIEW", *_weather_lines(plan), "", "---", "📋 DAY-BY-DAY PLAN", "", ""]
+    return "\n".join(lines)
+
+
+def _day_facts(plan: TripPlan, index: int, day: str) -> tuple[str, list[str]]:
+    """Theme and logistics of one day, shared by the templated plan and the model's brief."""
+    days = plan.days
+    flight = next((f for f in plan.flights if f.get("date") == day), None)
+    hotel = next((h for h in plan.hotels if h.get("check_in", "") <= day < h.get("check_out", "")), None)
+    facts = []
+    if index == 0:
+        theme = "Arrival"
+        if flight:
+            facts.append(f"Fly {flight.get('airline')} {flight.get('flight_no')}, departing {flight.get('departure')}")
+        if hotel:
+            facts.append(f"Check in at {hotel.get('name')}")
+    elif index == len(days) - 1:
+        theme = "Departure"
+        facts.append("Check out")
+        if flight:
+            facts.append(f"Fly {flight.get('airline')} {flight.get('flight_no')}, departing {flight.get('departure')}")
+    else:
+        theme = f"Explore {hotel.get('city') if hotel else plan.destination}"
+        if flight:  # multi-city transfer
+            theme = f"Transfer to {_arrives(flight)}"
+            facts.append(f"Fly {flight.get('airline')} {flight.get('flight_no')}, departing {flight.get('departure')}")
+    forecast = plan.forecast(day)
+    if forecast:
+        facts.append(f"Forecast: {forecast.get('condition')}, {forecast.get('temperature_celsius')}°C")
+    return theme, facts
+
+
+def render_days(plan: TripPlan) -> str:
+    """A day-by-day plan from the logistics alone — used when no model writes the activities."""
+    blocks = []
+    for index, day in enumerate(plan.days):
+        theme, facts = _day_facts(plan, index, day)
+        forecast = plan.forecast(day)
+        if 0 < index < len(plan.days) - 1:
+            wet = forecast and any(wet in str(forecast.get("condition")) for wet in _WET)
+            facts.append("Indoor sights — museums, markets, galleries" if wet else "Neighborhoods, parks and landmarks on foot")
+        lines = [f"**Day {index + 1} — {day} — {theme}**", *(f"  • {fact}" for fact in facts)]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def day_brief(plan: TripPlan) -> str:
+    """The model's task for the day-by-day plan: each day's date, theme and fixed logistics."""
+    lines = [f"Trip: {plan.origin} → {plan.destination}, {plan.travelers} traveler(s)."]
+    for index, day in enumerate(plan.days):
+        theme, facts = _day_facts(plan, index, day)
+        lines.append(f"Day {index + 1} — {day} — {theme}" + (f": {'; '.join(facts)}" if facts else ""))
+    return "\n".join(lines)
+
+
+def render_tail(plan: TripPlan) -> str:
+    """Tips and the budget summary, with exact totals, ending in TERMINATE."""
+    tips, budget = [], []
+    if plan.flights:
+        budget.append(f"  • Flights: {_usd(plan.flights_usd)}" + (f" ({plan.travelers} travelers)" if plan.travelers > 1 else ""))
+    for hotel in plan.hotels:
+        rate = hotel.get("price_per_night_usd")
+        detail = f"{hotel['nights']} nights × {_usd(rate)}/night" if rate is not None else f"{hotel['nights']} nights"
+        if hotel.get("rooms", 1) > 1:
+            detail += f" × {hotel['rooms']} rooms"
+        budget.append(f"  • Hotels: {_usd(hotel['subtotal_usd'])} ({detail})")
+    budget.append(f"  • Total: {_usd(plan.total_usd)}")
+    if plan.budget_usd:
+        left = round(plan.budget_usd - plan.total_usd, 2)
+        if left >= 0:
+            per_day = f" ({_usd(round(left / len(plan.days), 2))}/day)" if plan.days else ""
+            budget.append(f"  • Left for daily expenses: {_usd(left)}{per_day}")
+        else:
+            tips.append(f"Flights and hotels exceed the {_usd(plan.budget_usd)} budget by {_usd(-left)}.")
+    if plan.bundle_total_usd is not None:
+        tips.append("Flights and hotels are the optimizer's best bundle within the budget.")
+    if plan.hotels and plan.hotels[0].get("rooms", 1) > 1:
+        tips.append(f"Hotel prices assume {plan.hotels[0]['rooms']} rooms for {plan.travelers} travelers.")
+    tips.append("Prices are the quotes found while planning and may change before booking.")
+    lines = ["", "", "---", "💡 TIPS & NOTES", *(f"  • {tip}" for tip in tips), "", "📊 BUDGET SUMMARY", *budget, "", "TERMINATE"]
+    return "\n".join(lines)
+
+
+class TemplateItineraryAgent(BaseChatAgent):
+    """The itinerary agent with its fixed sections rendered from the tool results.
+
+    Args:
+        name: the participant name (``itinerary_agent``).
+        description: what the selector sees.
+        model_client: writes the day-by-day activities; ``None`` templates them too.
+        system_message: the model's instructions for the day-by-day plan.
+        preferences: remembered preferences that fill in a missing budget or traveler count.
+        stream: yield the text as ``ModelClientStreamingChunkEvent``s — the
+            rendered sections in one chunk each, the model's days token by token.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        model_client: ChatCompletionClient | None = None,
+        system_message: str = "",
+        preferences: dict[str, Any] | None = None,
+        stream: bool = False,
+    ) -> None:
+        super().__init__(name=name, description=description)
+        self._model_client = model_client
+        self._system_message = system_message
+        self._preferences = preferences or {}
+        self._stream = stream
+        self._traveler: list[str] = []
+        self._report = ""
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response: Response | None = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        for message in messages:
+            if message.source == USER:
+                self._traveler.append(message.to_text())
+            elif message.source == SPECIALISTS:
+                self._report = message.to_text()
+        plan = collect_trip("\n".join(self._traveler), self._report, self._preferences)
+
+        head, tail = render_head(plan), render_tail(plan)
+        if self._stream:
+            yield ModelClientStreamingChunkEvent(content=head, source=self.name)
+
+        usage = None
+        if self._model_client is None:
+            days = render_days(plan)
+            if self._stream:
+                yield ModelClientStreamingChunkEvent(content=days, source=self.name)
+        else:
+            prompt = [SystemMessage(content=self._system_message), UserMessage(content=day_brief(plan), source=PLANNER)]
+            result: CreateResult | None = None
+            if self._stream:
+                async for chunk in self._model_client.create_stream(prompt, cancellation_token=cancellation_token):
+                    if isinstance(chunk, CreateResult):
+                        result = chunk
+                    else:
+                        yield ModelClientStreamingChunkEvent(content=chunk, source=self.name)
+            else:
+                result = await self._model_client.create(prompt, cancellation_token=cancellation_token)
+            assert result is not None and isinstance(result.content, str)
+            days, usage = result.content.replace("TERMINATE", "").strip(), result.usage
+
+        if self._stream:
+            yield ModelClientStreamingChunkEvent(content=tail, source=self.name)
+        yield Response(chat_message=TextMessage(source=self.name, content=head + days + tail, models_usage=usage))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._traveler, self._report = [], ""
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"traveler": list(self._traveler), "report": self._report}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self._traveler = list(state.get("traveler", []))
+        self._report = state.get("report", "")
@@ -0,0 +1,84 @@
+"""Agents constructed on their first turn.
+
+The specialists and the itinerary agent only speak late in a plan — and
+not at all in sessions that end during clarification or are cancelled —
+yet building them (tool schemas, model contexts) was part of every
+``build_team()``. ``LazyAgent`` stands in for such an agent with just its
+name and description and calls the factory when the agent is first needed.
+"""
+
+from typing import Any, AsyncGenerator, Callable, Mapping, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+
+
+class LazyAgent(BaseChatAgent):
+    """Build ``factory()`` on the first turn (or first state load) and delegate to it.
+
+    An agent that was never built has nothing to reset and saves an empty
+    state, which loads back as "still unbuilt".
+
+    Args:
+        name: must match the name of the agent ``factory`` returns.
+        description: the selector sees this before the agent exists.
+        factory: builds the real agent; called at most once.
+        produced_message_types: declared up front, since the team reads them at construction.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        factory: Callable[[], ChatAgent],
+        produced_message_types: Sequence[type[BaseChatMessage]] = (TextMessage,),
+    ) -> None:
+        super().__init__(name=name, description=description)
+        self._factory = factory
+        self._produced_message_types = tuple(produced_message_types)
+        self._agent: ChatAgent | None = None
+
+    @property
+    def built(self) -> bool:
+        return self._agent is not None
+
+    @property
+    def agent(self) -> ChatAgent:
+        if self._agent is None:
+            agent = self._factory()
+            if agent.name != self.name:
+                raise ValueError(f"LazyAgent {self.name!r} factory built an agent named {agent.name!r}")
+            self._agent = agent
+        return self._agent
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self._produced_message_types
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        return await self.agent.on_messages(messages, cancellation_token)
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        async for item in self.agent.on_messages_stream(messages, cancellation_token):
+            yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        if self._agent is not None:
+            await self._agent.on_reset(cancellation_token)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return await self._agent.save_state() if self._agent is not None else {}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        if state:
+            await self.agent.load_state(state)
+        elif self._agent is not None:  # saved before it was built: back to a fresh agent
+            await self._agent.on_reset(CancellationToken())
+
+    async def close(self) -> None:
+        if self._agent is not None:
+            await self._agent.close()
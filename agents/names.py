@@ -0,0 +1,10 @@
+"""Agent name constants shared by the team wiring and the selector."""
+
+PLANNER = "planner"
+FLIGHT_AGENT = "flight_agent"
+HOTEL_AGENT = "hotel_agent"
+WEATHER_AGENT = "weather_agent"
+ITINERARY_AGENT = "itinerary_agent"
+SPECIALISTS = "specialists"
+USER = "user"
+SELECTOR = "selector"  # the routing step (model fallback of the selector)
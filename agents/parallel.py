@@ -0,0 +1,91 @@
+"""Parallel specialist stage — runs flight, hotel and weather agents concurrently."""
+
+import asyncio
+from typing import Any, AsyncGenerator, Mapping, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+
+
+class ParallelSpecialists(BaseChatAgent):
+    """Fan the planner's delegation out to several specialists at once.
+
+    Every wrapped specialist receives the same new messages and runs
+    concurrently (one LLM call + tool call each). Their replies are joined
+    into a single merged message so the planner and itinerary agent see one
+    batch instead of three separate turns. A specialist that fails (its model
+    call out of retries, say) gets a ``failed: …`` section instead, so the
+    others' results are still used; only if every specialist fails does the
+    stage raise.
+    """
+
+    def __init__(self, name: str, specialists: Sequence[BaseChatAgent], description: str) -> None:
+        super().__init__(name=name, description=description)
+        if not specialists:
+            raise ValueError("ParallelSpecialists needs at least one specialist agent.")
+        self._specialists = list(specialists)
+
+    @property
+    def specialists(self) -> list[BaseChatAgent]:
+        """The wrapped specialist agents, in report order."""
+        return list(self._specialists)
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response: Response | None = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        responses = await asyncio.gather(
+            *(agent.on_messages(messages, cancellation_token) for agent in self._specialists),
+            return_exceptions=True,
+        )
+        failures = [r for r in responses if isinstance(r, BaseException)]
+        for failure in failures:
+            if not isinstance(failure, Exception):  # cancellation is not a specialist failure
+                raise failure
+        if len(failures) == len(responses):
+            raise failures[0]
+
+        inner_messages: list[BaseAgentEvent | BaseChatMessage] = []
+        sections = []
+        for agent, response in zip(self._specialists, responses):
+            if isinstance(response, Exception):
+                sections.append(f"### {agent.name}\nfailed: {type(response).__name__}: {response}")
+                continue
+            inner_messages.extend(response.inner_messages or [])
+            inner_messages.append(response.chat_message)
+            sections.append(f"### {agent.name}\n{response.chat_message.to_text()}")
+
+        for message in inner_messages:
+            yield message
+        yield Response(
+            chat_message=TextMessage(source=self.name, content="\n\n".join(sections)),
+            inner_messages=inner_messages,
+        )
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await asyncio.gather(*(agent.on_reset(cancellation_token) for agent in self._specialists))
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"specialists": {agent.name: await agent.save_state() for agent in self._specialists}}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        saved = state.get("specialists", {})
+        for agent in self._specialists:
+            if agent.name in saved:
+                await agent.load_state(saved[agent.name])
+
+    async def close(self) -> None:
+        await asyncio.gather(*(agent.close() for agent in self._specialists))
@@ -0,0 +1,164 @@
+"""Speculative tool prefetch while the planner thinks or the traveler types.
+
+As soon as the traveler's messages pin down enough parameters (route and
+dates, or just the destination and a date), the likely flight, hotel and
+weather lookups are started in background threads through the cached
+tools, so the specialists find the results ready — or join the call still
+in flight. When a later message changes the parameters (the traveler
+answers a clarifying question differently), speculations that no longer
+match are cancelled if not started, and discarded from the cache otherwise.
+Hit rates are reported by ``get_tool_cache().stats()``.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncGenerator, Callable, Mapping, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+
+from agents.fast_path import extract_trip_fields
+from agents.names import USER
+from tools.cache import ToolCache
+
+
+class Prefetcher:
+    """Starts likely tool calls for the trip taking shape in the traveler's messages.
+
+    Args:
+        cache: the cache the tools write to (used to discard mis-speculations).
+        tools: cached tool functions by name (``cache.wrap`` results); any of
+            ``search_flights``, ``search_hotels``, ``get_weather``, ``get_weather_range``.
+        preferences: remembered preferences (a ``home_city`` stands in for the origin).
+        max_workers: background threads for speculative calls.
+    """
+
+    def __init__(
+        self,
+        cache: ToolCache,
+        tools: Mapping[str, Callable[..., str]],
+        preferences: dict[str, Any] | None = None,
+        max_workers: int = 4,
+    ) -> None:
+        self._cache = cache
+        self._tools = dict(tools)
+        self._preferences = preferences or {}
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._fields: dict[str, str] = {}
+        self._seen: set[str] = set()  # message ids already folded into the fields
+        self._pending: dict[str, tuple[str, Future]] = {}  # cache key → (tool, future)
+
+    def _merge(self, text: str) -> None:
+        """Fold one traveler message into the known fields; later messages win."""
+        found = extract_trip_fields(text, self._preferences)
+        for key in ("origin", "destination"):
+            if key in found:
+                self._fields[key] = found[key]
+        dates = found.get("dates", [])
+        if len(dates) >= 2:
+            self._fields["depart"], self._fields["return_date"] = dates[0], dates[1]
+        elif len(dates) == 1:
+            # A lone date answers whichever end of the trip is still open
+            depart = self._fields.get("depart")
+            if depart and dates[0] > depart:
+                self._fields["return_date"] = dates[0]
+            else:
+                self._fields["depart"] = dates[0]
+                if self._fields.get("return_date", "") <= dates[0]:
+                    self._fields.pop("return_date", None)
+
+    def _calls(self) -> list[tuple[str, tuple[str, ...]]]:
+        """The tool calls the specialists are likely to make for the current fields."""
+        f = self._fields
+        origin, destination = f.get("origin"), f.get("destination")
+        depart, return_date = f.get("depart"), f.get("return_date")
+        calls = []
+        if origin and destination and depart:
+            calls.append(("search_flights", (origin, destination, depart)))
+        if origin and destination and return_date:
+            calls.append(("search_flights", (destination, origin, return_date)))
+        if destination and depart:
+            calls.append(("get_weather", (destination, depart)))
+        if destination and depart and return_date:
+            calls.append(("search_hotels", (destination, depart, return_date)))
+            calls.append(("get_weather_range", (destination, depart, return_date)))
+        return [(name, args) for name, args in calls if name in self._tools]
+
+    def observe(self, messages: Sequence[BaseChatMessage]) -> None:
+        """Update the speculation from new traveler messages (called on each agent turn)."""
+        with self._lock:
+            fresh = [m for m in messages if m.source == USER and isinstance(m, TextMessage) and m.id not in self._seen]
+            if not fresh:
+                return
+            for message in fresh:
+                self._seen.add(message.id)
+                self._merge(message.content)
+
+            wanted = {self._tools[name].cache_key(*args): (name, args) for name, args in self._calls()}
+            for key in [key for key in self._pending if key not in wanted]:
+                self._drop(key)
+            for key, (name, args) in wanted.items():
+                if key not in self._pending:
+                    self._pending[key] = (name, self._executor.submit(self._tools[name].prefetch, *args))
+
+    def _drop(self, key: str) -> None:
+        """Cancel a mis-speculated call, or discard its cached result if it already ran."""
+        name, future = self._pending.pop(key)
+        if not future.cancel():
+            self._cache.discard(name, key)
+
+    def reset(self) -> None:
+        """Forget the conversation; speculations that were never used are dropped."""
+        with self._lock:
+            for key in list(self._pending):
+                self._drop(key)
+            self._fields.clear()
+            self._seen.clear()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PrefetchingAgent(BaseChatAgent):
+    """Wraps an agent so every turn first feeds its incoming messages to a ``Prefetcher``.
+
+    Wrapping the planner and the user proxy covers the two waits worth
+    overlapping: the planner's LLM call and the traveler's typing.
+    """
+
+    def __init__(self, agent: ChatAgent, prefetcher: Prefetcher) -> None:
+        super().__init__(name=agent.name, description=agent.description)
+        self._agent = agent
+        self._prefetcher = prefetcher
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self._agent.produced_message_types
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        self._prefetcher.observe(messages)
+        return await self._agent.on_messages(messages, cancellation_token)
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        self._prefetcher.observe(messages)
+        async for item in self._agent.on_messages_stream(messages, cancellation_token):
+            yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._prefetcher.reset()
+        await self._agent.on_reset(cancellation_token)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return await self._agent.save_state()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await self._agent.load_state(state)
+
+    async def close(self) -> None:
+        self._prefetcher.close()
+        await self._agent.close()
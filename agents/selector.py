@@ -0,0 +1,150 @@
+"""Deterministic, incremental speaker selection for the travel planner team."""
+
+import contextlib
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Awaitable, Callable, Sequence
+
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+
+from agents.names import ITINERARY_AGENT, PLANNER, SPECIALISTS, USER
+from telemetry.tracing import Tracer
+
+_DELEGATION_KEYWORDS = ("flight agent", "hotel agent", "weather agent")
+# Wording that passes the turn to another agent rather than asking the traveler
+_HANDOFF_KEYWORDS = (*_DELEGATION_KEYWORDS, "itinerary agent")
+
+
+@dataclass
+class SelectorStats:
+    """Counters describing the routing decisions a selector has made."""
+
+    decisions: int = 0
+    fallbacks: int = 0
+    seconds: float = 0.0
+    routes: dict[str, int] = field(default_factory=dict)
+
+    def record(self, speaker: str, fallback: bool, seconds: float) -> None:
+        self.decisions += 1
+        self.seconds += seconds
+        self.routes[speaker] = self.routes.get(speaker, 0) + 1
+        if fallback:
+            self.fallbacks += 1
+
+
+# Process-wide totals across every selector instance (all teams / sessions)
+_GLOBAL_STATS = SelectorStats()
+
+
+def selector_metrics() -> dict:
+    """Snapshot of the process-wide selector counters."""
+    return asdict(_GLOBAL_STATS)
+
+
+class RoutingSelector:
+    """State-machine ``selector_func`` for ``SelectorGroupChat``.
+
+    Routing state (whether the specialists have reported) is
+    updated only from messages appended since the previous call, so each
+    decision is O(new messages) instead of a rescan of the whole thread.
+    Every transition returns a speaker — the model-based selector is never
+    consulted. Transitions not covered by the normal flow are still resolved
+    deterministically but counted as ``fallbacks``.
+
+    Flow: planner → (user → planner)* → specialists → planner → (user → planner)* → itinerary_agent.
+
+    The team calls :meth:`select`, which also runs ``between_turns`` (if set)
+    with the thread: the manager has recorded the last turn and waits for
+    it, and no participant is working, so it is a consistent point to save
+    the team's state.
+
+    Args:
+        tracer: optional tracer; each decision becomes a ``selector.decide``
+            span and every new conversation starts a new trace.
+    """
+
+    def __init__(self, tracer: Tracer | None = None) -> None:
+        self.stats = SelectorStats()
+        self.between_turns: Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], Awaitable[None]] | None = None
+        self._tracer = tracer
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self._seen = 0
+        self._first: BaseAgentEvent | BaseChatMessage | None = None
+        self._specialists_done = False
+
+    def _update(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        # A shorter or different thread means the team was reset or reloaded
+        if len(messages) < self._seen or (messages and messages[0] is not self._first):
+            self._reset_state()
+            self._first = messages[0] if messages else None
+            if self._tracer:
+                self._tracer.new_trace()
+
+        for message in messages[self._seen:]:
+            if getattr(message, "source", "") == SPECIALISTS:
+                self._specialists_done = True
+        self._seen = len(messages)
+
+    def _route(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> tuple[str, bool]:
+        """Return ``(speaker, is_fallback)`` for the current thread."""
+        if not messages:
+            return PLANNER, False
+
+        last = messages[-1]
+        last_source = getattr(last, "source", "")
+        last_content = getattr(last, "content", "")
+        last_content = last_content.strip() if isinstance(last_content, str) else ""
+
+        # After the user responds (or submits the task), always go back to planner
+        if last_source == USER:
+            return PLANNER, False
+
+        if last_source == PLANNER:
+            content_lower = last_content.lower()
+            # A question that hands off to no agent is for the traveler, even after the specialists reported
+            if "?" in last_content and not any(keyword in content_lower for keyword in _HANDOFF_KEYWORDS):
+                return USER, False
+
+            # Planner summary after the specialists reported → itinerary
+            if self._specialists_done:
+                return ITINERARY_AGENT, False
+
+            if any(keyword in content_lower for keyword in _DELEGATION_KEYWORDS):
+                return SPECIALISTS, False
+
+            # Neither a delegation nor a question — let the specialists work
+            # from what the planner has parsed so far
+            return SPECIALISTS, True
+
+        # After the specialists report, planner summarizes
+        if last_source == SPECIALISTS:
+            return PLANNER, False
+
+        # Itinerary agent spoke without terminating — give it another turn
+        if last_source == ITINERARY_AGENT:
+            return ITINERARY_AGENT, True
+
+        # Unknown source — hand control back to the coordinator
+        return PLANNER, True
+
+    def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
+        started = time.perf_counter()
+        self._update(messages)  # may start a new trace, so before the span opens
+        decide = self._tracer.span("selector.decide", thread_length=len(messages)) if self._tracer else contextlib.nullcontext()
+        with decide as span:
+            speaker, fallback = self._route(messages)
+            elapsed = time.perf_counter() - started
+            if span is not None:
+                span.set(speaker=speaker, fallback=fallback, decide_us=round(elapsed * 1e6, 2))
+        self.stats.record(speaker, fallback, elapsed)
+        _GLOBAL_STATS.record(speaker, fallback, elapsed)
+        return speaker
+
+    async def select(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
+        """Async ``selector_func``: the next speaker, after the ``between_turns`` hook has run."""
+        speaker = self(messages)
+        if self.between_turns is not None:
+            await self.between_turns(messages)
+        return speaker
@@ -1,63 +1,139 @@
 """Build the multi-agent travel planner team using AutoGen 0.4+ SelectorGroupChat."""
 
-from typing import Sequence
+import asyncio
+import weakref
+from typing import Callable
 
 from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
 from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
-from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_agentchat.messages import TextMessage, ToolCallSummaryMessage
 from autogen_agentchat.teams import SelectorGroupChat
+from autogen_core.models import ChatCompletionClient
 from autogen_core.tools import FunctionTool
-from autogen_ext.models.openai import AzureOpenAIChatCompletionClient, OpenAIChatCompletionClient
 
-from config.settings import Settings, load_prompt
-from config.memory import load_memory, format_memory_context
-from tools.flight_search import search_flights
-from tools.hotel_search import search_hotels
-from tools.weather import get_weather
-
-# Agent name constants (referenced in selector prompt)
-PLANNER = "planner"
-FLIGHT_AGENT = "flight_agent"
-HOTEL_AGENT = "hotel_agent"
-WEATHER_AGENT = "weather_agent"
-ITINERARY_AGENT = "itinerary_agent"
-USER = "user"
+from agents.context import ItineraryContext, SpecialistContext, TokenBudgetContext
+from agents.fast_path import FastPathPlanner
+from agents.itinerary import TemplateItineraryAgent
+from agents.lazy import LazyAgent
+from agents.names import (
+    FLIGHT_AGENT,
+    HOTEL_AGENT,
+    ITINERARY_AGENT,
+    PLANNER,
+    SELECTOR,
+    SPECIALISTS,
+    USER,
+    WEATHER_AGENT,
+)
+from agents.parallel import ParallelSpecialists
+from agents.prefetch import PrefetchingAgent, Prefetcher
+from agents.selector import RoutingSelector
+from config.settings import ModelConfig, Settings, load_prompt
+from llm.cache import CachedChatCompletionClient
+from llm.lazy import LazyChatCompletionClient
+from llm.ratelimit import RateLimitedChatCompletionClient, get_rate_limiter
+from config.memory import DEFAULT_USER, format_memory_context, load_memory
+from telemetry.instrument import TracedAgent, TracingChatCompletionClient, trace_tool
+from telemetry.tracing import Tracer, get_exporter
+from tools.cache import (
+    FLIGHT_TTL,
+    HOTEL_TTL,
+    WEATHER_TTL,
+    get_tool_cache,
+    normalize_city,
+    normalize_date,
+)
+from tools.flight_search import search_flight_dates, search_flights
+from tools.format import compact_output
+from tools.ranking import rank_flights, rank_hotels
+from tools.hotel_search import search_hotel_rates, search_hotels
+from tools.inventory import get_inventory
+from tools.optimizer import make_optimizer
+from tools.weather import get_weather, get_weather_range
+
+# AGENT_MODELS keys each participant answers to, most specific first
+_MODEL_ROLES = {
+    PLANNER: (PLANNER,),
+    FLIGHT_AGENT: (FLIGHT_AGENT, SPECIALISTS),
+    HOTEL_AGENT: (HOTEL_AGENT, SPECIALISTS),
+    WEATHER_AGENT: (WEATHER_AGENT, SPECIALISTS),
+    SPECIALISTS: (SPECIALISTS,),
+    ITINERARY_AGENT: (ITINERARY_AGENT,),
+    SELECTOR: (SELECTOR,),
+}
+
+ITINERARY_RENDERERS = ("llm", "hybrid", "template")
+
+# Model clients build_team() created for each team (not injected ones), for close_team()
+_TEAM_CLIENTS: "weakref.WeakKeyDictionary[SelectorGroupChat, list[ChatCompletionClient]]" = weakref.WeakKeyDictionary()
+# Each team's speaker selector, for team_selector()
+_TEAM_SELECTORS: "weakref.WeakKeyDictionary[SelectorGroupChat, RoutingSelector]" = weakref.WeakKeyDictionary()
+
+_MODEL_INFO = {
+    "vision": False,
+    "function_calling": True,
+    "json_output": True,
+    "family": "unknown",
+    "structured_output": True,
+}
+
+
+def _build_model_client(config: ModelConfig, settings: Settings):
+    """Create an LLM client for ``config``, behind the completion cache when enabled.
+
+    Retries are left to the shared rate limiter (llm/ratelimit.py), which
+    every client of the same model goes through; cache hits skip it. The
+    provider client itself (SDK import, connection pool) is only built on
+    the first request that reaches it (llm/lazy.py).
+    """
+    limiter = get_rate_limiter(
+        f"{config.provider}:{config.model_name}:{config.azure_openai_endpoint or config.base_url}",
+        rpm=settings.llm_rpm,
+        tpm=settings.llm_tpm,
+        max_concurrency=settings.llm_max_concurrency,
+        max_retries=settings.llm_max_retries,
+    )
+    provider = LazyChatCompletionClient(lambda: _build_provider_client(config, max_retries=0), _MODEL_INFO)
+    client = RateLimitedChatCompletionClient(provider, limiter)
+    if settings.llm_cache_mode:
+        client = CachedChatCompletionClient(
+            client, model=config.model_name, db_path=settings.llm_cache_db, mode=settings.llm_cache_mode
+        )
+    return client
 
 
-def _build_model_client(settings: Settings):
-    """Create the shared LLM client.
+def _build_provider_client(config: ModelConfig, max_retries: int = 2):
+    """Create the provider-specific LLM client (``max_retries`` is the SDK's own retry count).
 
     Supports:
-        - Groq Cloud   — free, fast inference (Llama 3.3 70B, Mixtral, etc.)
+        - Groq Cloud   — free, fast inference (Llama 3.3 70B, Mixtral, etc.),
+          or any OpenAI-compatible ``base_url``
         - Azure OpenAI — API key or Entra ID (DefaultAzureCredential) auth
     """
-    model_info = {
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-        "structured_output": True,
-    }
+    # The SDKs are imported here so that importing this module stays cheap
+    from autogen_ext.models.openai import AzureOpenAIChatCompletionClient, OpenAIChatCompletionClient
 
-    if settings.provider == "groq":
+    if config.provider == "groq":
         # Groq Cloud — OpenAI-compatible API
         return OpenAIChatCompletionClient(
-            model=settings.model_name,
-            api_key=settings.api_key,
-            base_url="https://api.groq.com/openai/v1",
-            model_info=model_info,
+            model=config.model_name,
+            api_key=config.api_key,
+            base_url=config.base_url or "https://api.groq.com/openai/v1",
+            model_info=_MODEL_INFO,
+            max_retries=max_retries,
         )
 
     # Azure OpenAI
-    if settings.api_key:
+    if config.api_key:
         # API key auth
         return AzureOpenAIChatCompletionClient(
-            azure_deployment=settings.model_name,
-            model=settings.model_name,
-            api_key=settings.api_key,
-            azure_endpoint=settings.azure_openai_endpoint,
-            api_version=settings.azure_openai_api_version,
-            model_info=model_info,
+            azure_deployment=config.model_name,
+            model=config.model_name,
+            api_key=config.api_key,
+            azure_endpoint=config.azure_openai_endpoint,
+            api_version=config.azure_openai_api_version,
+            model_info=_MODEL_INFO,
+            max_retries=max_retries,
         )
 
     # Entra ID auth (local dev — requires `az login`)
@@ -67,39 +143,160 @@ def _build_model_client(settings: Settings):
         credential, "https://cognitiveservices.azure.com/.default"
     )
     return AzureOpenAIChatCompletionClient(
-        azure_deployment=settings.model_name,
-        model=settings.model_name,
+        azure_deployment=config.model_name,
+        model=config.model_name,
         azure_ad_token_provider=token_provider,
-        azure_endpoint=settings.azure_openai_endpoint,
-        api_version=settings.azure_openai_api_version,
-        model_info=model_info,
+        azure_endpoint=config.azure_openai_endpoint,
+        api_version=config.azure_openai_api_version,
+        model_info=_MODEL_INFO,
+        max_retries=max_retries,
     )
 
 
-def _build_tools() -> dict[str, list[FunctionTool]]:
-    """Wrap mock API functions as AutoGen FunctionTools."""
-    return {
-        FLIGHT_AGENT: [FunctionTool(search_flights, description="Search for available flights between two cities on a given date.")],
-        HOTEL_AGENT: [FunctionTool(search_hotels, description="Search for available hotels in a city for given dates.")],
-        WEATHER_AGENT: [FunctionTool(get_weather, description="Get weather forecast for a city on a given date.")],
+def _build_tools(
+    settings: Settings, tracer: Tracer | None = None
+) -> tuple[dict[str, Callable[[], list[FunctionTool]]], dict[str, Callable[..., str]]]:
+    """Wrap mock API functions as AutoGen FunctionTools behind the shared result cache.
+
+    Results are cached as the APIs return them, then ranked deterministically
+    (cheapest flight, best-rated hotel first) and re-serialized in
+    ``settings.tool_output_format`` on the way out. Flight and hotel data
+    come from the small built-in mocks unless ``settings.inventory`` selects
+    the synthetic inventory backend (built here on first use; async callers
+    load it beforehand with ``load_inventory``). The flight agent also gets
+    ``optimize_trip``, which searches every leg and stay of a round trip or
+    multi-city trip through the same cached backend and returns the best
+    bundles within the budget.
+
+    Returns a factory for each specialist's tools (tool schemas are only
+    generated for specialists that get built), plus the cached (unformatted)
+    lookups by name for speculative prefetching.
+    """
+    cache = get_tool_cache(settings.tool_cache_db)
+    fmt, top_k = settings.tool_output_format, settings.tool_top_k
+    backend = {
+        "search_flights": search_flights,
+        "search_flight_dates": search_flight_dates,
+        "search_hotels": search_hotels,
+        "search_hotel_rates": search_hotel_rates,
     }
+    namespace = ""
+    if settings.inventory:
+        backend.update(get_inventory(settings.inventory).tools())
+        namespace = f"inventory:{settings.inventory}:"
+
+    def cached(func, ttl, normalizers):
+        return cache.wrap(backend.get(func.__name__, func), ttl, normalizers, namespace)
+
+    def tool(func, ttl, normalizers, agent, description, rank=None) -> FunctionTool:
+        return as_tool(compact_output(cached(func, ttl, normalizers), fmt, top_k, rank=rank), agent, description)
+
+    def as_tool(func, agent, description) -> FunctionTool:
+        return FunctionTool(trace_tool(func, tracer, agent) if tracer else func, description=description)
+
+    route = {"origin": normalize_city, "destination": normalize_city}
+    stay = {"city": normalize_city, "check_in": normalize_date, "check_out": normalize_date}
+    date_span = {"start_date": normalize_date, "end_date": normalize_date}
+    # Fetches legs and stays through the cached searches, so they share results with the specialists
+    lookups = {
+        "search_flights": cached(search_flights, FLIGHT_TTL, {**route, "date": normalize_date}),
+        "search_hotels": cached(search_hotels, HOTEL_TTL, stay),
+        "get_weather": cached(get_weather, WEATHER_TTL, {"city": normalize_city, "date": normalize_date}),
+        "get_weather_range": cached(get_weather_range, WEATHER_TTL, {"city": normalize_city, **date_span}),
+    }
+    optimize_trip = make_optimizer(lookups["search_flights"], lookups["search_hotels"])
+    tools = {
+        FLIGHT_AGENT: lambda: [
+            tool(search_flights, FLIGHT_TTL, {**route, "date": normalize_date}, FLIGHT_AGENT,
+                 "Search for available flights between two cities on a given date.", rank=rank_flights),
+            tool(search_flight_dates, FLIGHT_TTL, {**route, **date_span}, FLIGHT_AGENT,
+                 "Cheapest flight for every date in a range (optionally ±flex_days) in one call."),
+            as_tool(optimize_trip, FLIGHT_AGENT,
+                    "Best flight + hotel bundles for a round trip or multi-city trip within a total budget."),
+        ],
+        HOTEL_AGENT: lambda: [
+            tool(search_hotels, HOTEL_TTL, stay, HOTEL_AGENT,
+                 "Search for available hotels in a city for given dates.", rank=rank_hotels),
+            tool(search_hotel_rates, HOTEL_TTL, stay, HOTEL_AGENT,
+                 "Every hotel's rate for each night of a stay in one call."),
+        ],
+        WEATHER_AGENT: lambda: [
+            tool(get_weather, WEATHER_TTL, {"city": normalize_city, "date": normalize_date}, WEATHER_AGENT,
+                 "Get weather forecast for a city on a given date."),
+            tool(get_weather_range, WEATHER_TTL, {"city": normalize_city, **date_span}, WEATHER_AGENT,
+                 "Daily weather forecast for a city over a date range in one call."),
+        ],
+    }
+    return tools, lookups
 
 
-def build_team() -> SelectorGroupChat:
+def build_team(
+    input_func: Callable[[str], str] | None = None,
+    settings: Settings | None = None,
+    model_client: ChatCompletionClient | None = None,
+    tracer: Tracer | None = None,
+    user_id: str = DEFAULT_USER,
+    stream: bool = False,
+) -> SelectorGroupChat:
     """Assemble and return the travel planner agent team.
 
+    Args:
+        input_func: how the ``user`` agent obtains answers to clarifying
+            questions. Defaults to reading from the terminal.
+        settings: configuration to use instead of ``Settings.from_env()``.
+        model_client: client shared by every agent (benchmarks and tests
+            inject a fake here). When omitted, each agent and the selector
+            get the client for ``settings.model_config(name)``, with one
+            client per distinct configuration, so ``AGENT_MODELS`` can put
+            the specialists and routing on a small fast model.
+        tracer: records agent-turn, selector, LLM and tool spans plus
+            per-agent token usage. Created from ``settings.trace_file`` when
+            omitted; tracing is off if neither is set.
+        user_id: whose remembered preferences are injected into the planner.
+        stream: have the itinerary agent stream its text, so ``run_stream``
+            also yields ``ModelClientStreamingChunkEvent`` tokens (server mode).
+            With ``settings.itinerary_renderer`` set, the rendered sections
+            arrive as whole chunks around the model's streamed day plan.
+
     Returns:
         A SelectorGroupChat ready to run with ``team.run_stream(task=...)``.
     """
-    settings = Settings.from_env()
-    model_client = _build_model_client(settings)
-    tools = _build_tools()
+    settings = settings or Settings.from_env()
+    unknown = {agent for agent, _ in settings.agent_models} - set(_MODEL_ROLES)
+    if unknown:
+        raise ValueError(f"AGENT_MODELS names unknown agents {sorted(unknown)}; expected some of {list(_MODEL_ROLES)}")
+    if settings.itinerary_renderer not in ITINERARY_RENDERERS:
+        raise ValueError(f"Unknown ITINERARY_RENDERER {settings.itinerary_renderer!r}; expected one of {', '.join(ITINERARY_RENDERERS)}")
+    if settings.itinerary_renderer != "llm" and settings.specialist_reflection:
+        # The renderer reads the specialists' tool results, which reflection replaces with prose
+        raise ValueError(f"ITINERARY_RENDERER={settings.itinerary_renderer} needs the raw tool results; set SPECIALIST_REFLECTION=false")
+    if tracer is None and settings.trace_file:
+        tracer = Tracer(get_exporter(settings.trace_file))
+    tools, lookups = _build_tools(settings, tracer)
+
+    clients: dict[ModelConfig, ChatCompletionClient] = {}
+
+    def client_for(agent_name: str) -> ChatCompletionClient:
+        if model_client is not None:
+            client = model_client
+        else:
+            # Agents whose configurations match share one client (and its connection pool)
+            config = settings.model_config(*_MODEL_ROLES[agent_name])
+            if config not in clients:
+                clients[config] = _build_model_client(config, settings)
+            client = clients[config]
+        # Per-agent view of the shared client so LLM spans and tokens are attributed
+        return TracingChatCompletionClient(client, tracer, agent_name) if tracer else client
+
+    def traced(agent):
+        return TracedAgent(agent, tracer) if tracer else agent
 
     # --- Agents ---
+    # Each agent gets a scoped model context (agents/context.py) instead of the full transcript
 
     # Build planner system message with memory context injected
     planner_base_prompt = load_prompt("planner")
-    memory_data = load_memory()
+    memory_data = load_memory(user_id, settings.memory_db)
     memory_context = format_memory_context(memory_data)
     planner_system_message = (
         f"{planner_base_prompt}\n\n{memory_context}" if memory_context else planner_base_prompt
@@ -107,47 +304,75 @@ def build_team() -> SelectorGroupChat:
 
     planner = AssistantAgent(
         name=PLANNER,
-        model_client=model_client,
+        model_client=client_for(PLANNER),
+        model_context=TokenBudgetContext(settings.context_token_budget),
         system_message=planner_system_message,
         description="The lead travel planner that coordinates the team. Delegates to specialists, asks the user clarifying questions when needed, and synthesizes results.",
     )
+    if settings.planner_fast_path:
+        # Well-formed requests are parsed locally and delegated without the planner's first LLM call
+        planner = FastPathPlanner(planner, memory_data, tracer)
 
-    # Human-in-the-loop: prompts the real user for input in the terminal
+    # Human-in-the-loop: prompts the real user for input in the terminal (unless overridden)
     user_proxy = UserProxyAgent(
         name=USER,
         description="The human traveler. Route here when the planner asks a clarifying question or needs user input.",
+        input_func=input_func,
     )
-
-    flight_agent = AssistantAgent(
-        name=FLIGHT_AGENT,
-        model_client=model_client,
-        tools=tools[FLIGHT_AGENT],
-        system_message=load_prompt("flight_agent"),
-        description="Searches for flights between cities using the search_flights tool.",
+    if settings.prefetch:
+        # Warm the likely lookups while the planner thinks and while the traveler answers
+        prefetcher = Prefetcher(get_tool_cache(settings.tool_cache_db), lookups, memory_data)
+        planner = PrefetchingAgent(planner, prefetcher)
+        user_proxy = PrefetchingAgent(user_proxy, prefetcher)
+
+    # The specialists and the itinerary agent speak late (or never, if the session
+    # ends early), so they and their tool schemas are built on first use (agents/lazy.py)
+    def specialist(name: str, domain: str, description: str) -> LazyAgent:
+        # Without reflection a specialist's reply is its (already ranked) tool output,
+        # saving one LLM call per specialist per delegation
+        return LazyAgent(name, description, lambda: AssistantAgent(
+            name=name,
+            model_client=client_for(name),
+            model_context=SpecialistContext(domain),
+            tools=tools[name](),
+            reflect_on_tool_use=settings.specialist_reflection,
+            system_message=load_prompt(name),
+            description=description,
+        ), produced_message_types=(TextMessage, ToolCallSummaryMessage))
+
+    flight_agent = specialist(FLIGHT_AGENT, "flight", "Searches for flights between cities using the search_flights tool.")
+    hotel_agent = specialist(HOTEL_AGENT, "hotel", "Searches for hotels in a city using the search_hotels tool.")
+    weather_agent = specialist(WEATHER_AGENT, "weather", "Provides weather forecasts using the get_weather tool.")
+
+    # Flight, hotel and weather lookups are independent — run them concurrently
+    specialists = ParallelSpecialists(
+        name=SPECIALISTS,
+        specialists=[traced(agent) for agent in (flight_agent, hotel_agent, weather_agent)],
+        description="Runs the flight, hotel and weather agents in parallel and reports their merged results.",
     )
 
-    hotel_agent = AssistantAgent(
-        name=HOTEL_AGENT,
-        model_client=model_client,
-        tools=tools[HOTEL_AGENT],
-        system_message=load_prompt("hotel_agent"),
-        description="Searches for hotels in a city using the search_hotels tool.",
-    )
-
-    weather_agent = AssistantAgent(
-        name=WEATHER_AGENT,
-        model_client=model_client,
-        tools=tools[WEATHER_AGENT],
-        system_message=load_prompt("weather_agent"),
-        description="Provides weather forecasts using the get_weather tool.",
-    )
-
-    itinerary_agent = AssistantAgent(
-        name=ITINERARY_AGENT,
-        model_client=model_client,
-        system_message=load_prompt("itinerary_agent"),
-        description="Compiles all gathered information into a polished day-by-day travel itinerary. Says TERMINATE when done.",
-    )
+    itinerary_description = "Compiles all gathered information into a polished day-by-day travel itinerary. Says TERMINATE when done."
+    if settings.itinerary_renderer == "llm":
+        itinerary_agent = LazyAgent(ITINERARY_AGENT, itinerary_description, lambda: AssistantAgent(
+            name=ITINERARY_AGENT,
+            model_client=client_for(ITINERARY_AGENT),
+            model_context=ItineraryContext(),
+            model_client_stream=stream,
+            system_message=load_prompt("itinerary_agent"),
+            description=itinerary_description,
+        ))
+    else:
+        # Flights, hotels, weather and budget are rendered from the tool results (agents/itinerary.py);
+        # "hybrid" still has the model write the day-by-day activities
+        hybrid = settings.itinerary_renderer == "hybrid"
+        itinerary_agent = LazyAgent(ITINERARY_AGENT, itinerary_description, lambda: TemplateItineraryAgent(
+            name=ITINERARY_AGENT,
+            description=itinerary_description,
+            model_client=client_for(ITINERARY_AGENT) if hybrid else None,
+            system_message=load_prompt("itinerary_days") if hybrid else "",
+            preferences=memory_data,
+            stream=stream,
+        ))
 
     # --- Termination conditions ---
     termination = TextMentionTermination("TERMINATE") | MaxMessageTermination(max_messages=30)
@@ -157,16 +382,14 @@ def build_team() -> SelectorGroupChat:
 The available agents are:
 - planner: Coordinates the team. Speaks FIRST to parse the request. Can ask clarifying questions.
 - user: The human traveler. Select ONLY when the planner has asked a question that needs human input.
-- flight_agent: Searches for flights. Call when flight information is needed.
-- hotel_agent: Searches for hotels. Call when hotel information is needed.
-- weather_agent: Provides weather forecasts. Call when weather data is needed.
+- specialists: Runs the flight, hotel and weather agents in parallel. Call once the planner has delegated.
 - itinerary_agent: Compiles the final itinerary. Call ONLY ONCE after ALL specialist data is collected.
 
 Flow:
 1. planner (parse request — may ask the user a question OR delegate directly)
 2. IF planner asked a question → user (human responds)
 3. IF user responded → planner (process answer, then delegate to specialists)
-4. flight_agent → hotel_agent → weather_agent (in any order, one at a time)
+4. specialists (flight, hotel and weather searches run together)
 5. planner (summarize all findings)
 6. itinerary_agent (compile final itinerary — says TERMINATE when done)
 
@@ -174,76 +397,36 @@ Key rules:
 - Select "user" ONLY RIGHT AFTER the planner asks a question. Never select "user" at any other time.
 - After "user" responds, ALWAYS go back to "planner".
 - NEVER select the same agent twice in a row (except planner after user).
-- NEVER go back to a specialist that has already reported.
+- NEVER go back to specialists once they have reported.
 """
 
-    def _selector_func(messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> str | None:
-        """Deterministic selector that gates human-in-the-loop properly.
-
-        Only routes to 'user' when the planner asks a genuine question
-        (has '?' but does NOT delegate to specialists). Otherwise follows:
-        planner → specialists → planner (summary) → itinerary_agent.
-        """
-        if not messages:
-            return PLANNER
-
-        last = messages[-1]
-        last_source = getattr(last, "source", "")
-        last_content = (getattr(last, "content", "") or "").strip()
-
-        # After the user responds, always go back to planner
-        if last_source == USER:
-            return PLANNER
-
-        # If planner just spoke, decide: question → user, delegation → first specialist
-        if last_source == PLANNER:
-            content_lower = last_content.lower()
-            delegation_map = [
-                ("flight agent", FLIGHT_AGENT),
-                ("hotel agent", HOTEL_AGENT),
-                ("weather agent", WEATHER_AGENT),
-                ("itinerary agent", ITINERARY_AGENT),
-            ]
-            first_specialist = None
-            for keyword, agent_name in delegation_map:
-                if keyword in content_lower:
-                    first_specialist = agent_name
-                    break
-
-            if first_specialist:
-                # Planner delegated — go to the first specialist mentioned
-                return first_specialist
-
-            # Not a delegation — if there's a '?', it's a question for the user
-            if "?" in last_content:
-                return USER
-
-            # Planner said something else (e.g., summary) — fall through
-            return None
-
-        # After a specialist (or tool call) responds, find the next specialist
-        # that hasn't spoken yet, then planner summary, then itinerary
-        spoken_agents = {getattr(m, "source", "") for m in messages}
-        specialist_order = [FLIGHT_AGENT, HOTEL_AGENT, WEATHER_AGENT]
-
-        for agent in specialist_order:
-            if agent not in spoken_agents:
-                return agent
-
-        # All specialists done — if planner hasn't summarized (spoke only once), go to planner
-        planner_turns = sum(1 for m in messages if getattr(m, "source", "") == PLANNER)
-        if planner_turns < 2:
-            return PLANNER
-
-        # Planner has summarized — go to itinerary agent
-        return ITINERARY_AGENT
+    # Deterministic routing — the model-based selector above is only a safety net
+    selector = RoutingSelector(tracer=tracer)
 
     team = SelectorGroupChat(
-        participants=[planner, user_proxy, flight_agent, hotel_agent, weather_agent, itinerary_agent],
-        model_client=model_client,
+        participants=[traced(agent) for agent in (planner, user_proxy, specialists, itinerary_agent)],
+        model_client=client_for(SELECTOR),
         termination_condition=termination,
         selector_prompt=selector_prompt,
-        selector_func=_selector_func,
+        selector_func=selector.select,
     )
+    _TEAM_CLIENTS[team] = list(clients.values())
+    _TEAM_SELECTORS[team] = selector
 
     return team
+
+
+def team_selector(team: SelectorGroupChat) -> RoutingSelector | None:
+    """The ``RoutingSelector`` of a team made by ``build_team()`` (None for any other team)."""
+    return _TEAM_SELECTORS.get(team)
+
+
+async def close_team(team: SelectorGroupChat) -> None:
+    """Close ``team``'s participants (and the prefetch threads they own), then the
+    model clients ``build_team()`` created for it.
+
+    A client passed in as ``model_client`` belongs to the caller and is left open.
+    """
+    await asyncio.gather(*(participant.close() for participant in team._participants))
+    clients = _TEAM_CLIENTS.pop(team, [])
+    await asyncio.gather(*(client.close() for client in clients))
@@ -0,0 +1,262 @@
+"""Headless batch mode — plan trips from a JSONL file with a bounded pool of teams.
+
+Input lines look like::
+
+    {"id": "trip-1", "request": "New York to Tokyo, 2026-03-10 to 2026-03-15, $3000",
+     "answers": ["2 travelers"]}
+
+``answers`` is optional: they are fed, in order, to the ``user`` agent
+whenever the planner asks a clarifying question. Once they run out the
+planner is told to proceed with reasonable assumptions. An optional
+``"user"`` plans with that traveler's remembered preferences, and the
+preferences a request reveals are saved for that traveler's later requests.
+
+A line that is not valid JSON, or lacks a non-empty string ``"request"``,
+gets an error record (with its ``id`` or ``line`` number) and the batch
+moves on.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseChatMessage
+
+from agents.names import ITINERARY_AGENT
+from agents.team import build_team, close_team
+from config.memory import DEFAULT_USER, extract_preferences, save_memory
+from config.settings import Settings
+from telemetry.tracing import Tracer, get_exporter
+from tools.inventory import load_inventory
+
+DEFAULT_ANSWER = "No further details — please proceed with reasonable assumptions."
+TEAMS_PER_WORKER = 4  # travelers whose teams each worker keeps built
+
+
+class ScriptedUser:
+    """``input_func`` for the ``user`` agent that replays canned answers."""
+
+    def __init__(self) -> None:
+        self._answers: list[str] = []
+        self.questions = 0
+
+    def load(self, answers: list[str]) -> None:
+        self._answers = list(answers)
+        self.questions = 0
+
+    def __call__(self, prompt: str) -> str:
+        self.questions += 1
+        return self._answers.pop(0) if self._answers else DEFAULT_ANSWER
+
+
+class InvalidRequest(ValueError):
+    """An input line that cannot be planned."""
+
+    def __init__(self, message: str, record_id: str, line_no: int) -> None:
+        super().__init__(message)
+        self.record_id = record_id
+        self.line_no = line_no
+
+
+def _parse_request(line: str, line_no: int) -> dict:
+    """One input line as a trip request; raises :class:`InvalidRequest` if it is not one."""
+    record_id = f"line-{line_no}"
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise InvalidRequest(f"Invalid JSON: {exc}", record_id, line_no)
+    if not isinstance(record, dict):
+        raise InvalidRequest("Expected a JSON object", record_id, line_no)
+    record_id = str(record.get("id") or record_id)
+    if not isinstance(record.get("request"), str) or not record["request"].strip():
+        raise InvalidRequest('"request" must be a non-empty string', record_id, line_no)
+    answers = record.get("answers", [])
+    if not isinstance(answers, list) or not all(isinstance(answer, str) for answer in answers):
+        raise InvalidRequest('"answers" must be a list of strings', record_id, line_no)
+    record["id"] = record_id
+    return record
+
+
+class _TeamCache:
+    """One worker's teams, one per traveler, least recently used evicted (and closed) first.
+
+    Preferences are part of the planner's system prompt, so a team serves
+    only the traveler it was built for, and only until ``generations``
+    records that the traveler's preferences changed.
+    """
+
+    def __init__(self, user: ScriptedUser, tracer: Tracer, settings: Settings, generations: dict[str, int]) -> None:
+        self.user = user
+        self.tracer = tracer
+        self._settings = settings
+        self._generations = generations
+        self._teams: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+
+    async def get(self, user_id: str) -> Any:
+        generation = self._generations.get(user_id, 0)
+        entry = self._teams.pop(user_id, None)
+        if entry is not None and entry[1] != generation:
+            await close_team(entry[0])
+            entry = None
+        if entry is None:
+            team = build_team(input_func=self.user, settings=self._settings, tracer=self.tracer, user_id=user_id)
+            entry = (team, generation)
+        self._teams[user_id] = entry
+        while len(self._teams) > TEAMS_PER_WORKER:
+            _, (evicted, _) = self._teams.popitem(last=False)
+            await close_team(evicted)
+        return entry[0]
+
+    async def close(self) -> None:
+        await asyncio.gather(*(close_team(team) for team, _ in self._teams.values()))
+        self._teams.clear()
+
+
+async def _read_requests(path: Path) -> AsyncIterator[dict | InvalidRequest]:
+    """Yield trip requests one line at a time (the file is never loaded whole), or why a line is invalid."""
+    with path.open(encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield _parse_request(line, line_no)
+            except InvalidRequest as exc:
+                yield exc
+
+
+def itinerary_text(messages: list) -> str:
+    for msg in reversed(messages):
+        if getattr(msg, "source", "") == ITINERARY_AGENT and isinstance(getattr(msg, "content", None), str):
+            return msg.content.replace("TERMINATE", "").strip()
+    return ""
+
+
+def _usage_delta(before: dict, after: dict) -> dict[str, dict[str, int]]:
+    delta = {}
+    for agent, usage in after.items():
+        previous = before.get(agent, {})
+        diff = {key: value - previous.get(key, 0) for key, value in usage.items()}
+        if diff["calls"]:
+            delta[agent] = diff
+    return delta
+
+
+async def _plan_one(team, user: ScriptedUser, tracer: Tracer, record: dict) -> dict:
+    """Run one request to completion and return its output record."""
+    user.load(record.get("answers", []))
+    usage_before = tracer.token_usage()
+    agent_seconds: dict[str, float] = {}
+    started = last = time.perf_counter()
+    result: TaskResult | None = None
+    error = ""
+
+    try:
+        async for item in team.run_stream(task=record["request"]):
+            if isinstance(item, TaskResult):
+                result = item
+            elif isinstance(item, BaseChatMessage):
+                # Attribute the time since the previous message to this speaker
+                now = time.perf_counter()
+                agent_seconds[item.source] = agent_seconds.get(item.source, 0.0) + (now - last)
+                last = now
+    except Exception as exc:  # one bad request must not stop the batch
+        error = f"{type(exc).__name__}: {exc}"
+    finally:
+        await team.reset()
+
+    messages = result.messages if result else []
+    return {
+        "id": record["id"],
+        "request": record["request"],
+        "user": str(record.get("user") or DEFAULT_USER),
+        "itinerary": itinerary_text(messages),
+        "preferences": extract_preferences(messages),
+        "stop_reason": result.stop_reason if result else None,
+        "clarifying_questions": user.questions,
+        "timings": {
+            "total_seconds": round(time.perf_counter() - started, 4),
+            "agent_seconds": {name: round(sec, 4) for name, sec in agent_seconds.items()},
+        },
+        "tokens": _usage_delta(usage_before, tracer.token_usage()),
+        "error": error,
+    }
+
+
+async def run_batch(input_path: str, output_path: str, concurrency: int = 4) -> int:
+    """Plan every request in ``input_path`` and append results to ``output_path``.
+
+    Each of the ``concurrency`` workers owns independent teams (one per
+    traveler, up to ``TEAMS_PER_WORKER``), so sessions never share
+    conversation state. Results are written as soon as each request
+    finishes (completion order, not input order).
+
+    Returns:
+        The number of requests processed.
+    """
+    queue: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=concurrency * 2)
+    write_lock = asyncio.Lock()
+    processed = 0
+
+    settings = Settings.from_env()
+    exporter = get_exporter(settings.trace_file) if settings.trace_file else None
+    generations: dict[str, int] = {}  # bumped when a request saves new preferences for a traveler
+    workers = [_TeamCache(ScriptedUser(), Tracer(exporter), settings, generations) for _ in range(concurrency)]
+    if settings.inventory:
+        await load_inventory(settings.inventory)
+    # Build a team per worker up front so configuration errors fail fast
+    for teams in workers:
+        await teams.get(DEFAULT_USER)
+
+    async def emit(out, output: dict) -> None:
+        nonlocal processed
+        async with write_lock:
+            out.write(json.dumps(output, ensure_ascii=False) + "\n")
+            out.flush()
+            processed += 1
+        print(f"[{output['id']}] {'error' if output['error'] else 'done'} in {output['timings']['total_seconds']}s")
+
+    async def produce(out) -> None:
+        try:
+            async for record in _read_requests(Path(input_path)):
+                if isinstance(record, InvalidRequest):
+                    await emit(out, {
+                        "id": record.record_id, "line": record.line_no, "error": str(record),
+                        "timings": {"total_seconds": 0.0},
+                    })
+                else:
+                    await queue.put(record)
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def work(out, teams: _TeamCache) -> None:
+        while (record := await queue.get()) is not None:
+            user_id = str(record.get("user") or DEFAULT_USER)
+            try:
+                team = await teams.get(user_id)
+            except Exception as exc:  # e.g. an unreadable preference store; the other requests go on
+                await emit(out, {
+                    "id": record["id"], "request": record["request"], "user": user_id,
+                    "error": f"{type(exc).__name__}: {exc}", "timings": {"total_seconds": 0.0},
+                })
+                continue
+            output = await _plan_one(team, teams.user, teams.tracer, record)
+            if output["preferences"]:
+                save_memory(output["preferences"], user_id, settings.memory_db)
+                generations[user_id] = generations.get(user_id, 0) + 1
+            await emit(out, output)
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "a", encoding="utf-8") as out:
+        # Let every worker finish writing before the file is closed, even if reading the input failed
+        results = await asyncio.gather(produce(out), *(work(out, teams) for teams in workers), return_exceptions=True)
+    await asyncio.gather(*(teams.close() for teams in workers))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return processed
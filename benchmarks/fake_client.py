@@ -0,0 +1,271 @@
+"""Deterministic scripted model for network-free benchmarks.
+
+``ScriptedChatCompletionClient`` replaces the model client in-process;
+``travel_reply`` plays the same team over HTTP behind ``benchmarks/stub_llm.py``.
+"""
+
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken, FunctionCall
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    ModelCapabilities,
+    ModelInfo,
+    RequestUsage,
+    SystemMessage,
+    UserMessage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from agents.fast_path import TripRequest
+from agents.names import SPECIALISTS, USER
+
+MODEL_INFO: ModelInfo = {
+    "vision": False,
+    "function_calling": True,
+    "json_output": True,
+    "family": "unknown",
+    "structured_output": True,
+}
+_QUESTION = re.compile(r"Question \d+:")
+# What the scripted planner of ``travel_reply`` understands in the traveler's messages
+_ORIGIN = re.compile(r"\bfrom ([A-Z][a-z]+(?: [A-Z][a-z]+)*)")
+_DESTINATION = re.compile(r"\b(?:to|in|visit) ([A-Z][a-z]+(?: [A-Z][a-z]+)*)")
+_ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+_TRIP_LINE = re.compile(r"Trip: (.+?) → (.+?), (\d{4}-\d{2}-\d{2}) to (\d{4}-\d{2}-\d{2})")
+_MAX_QUESTIONS = 6
+
+
+@dataclass(frozen=True)
+class TripScript:
+    """The canned trip every scripted session plans."""
+
+    origin: str = "New York"
+    destination: str = "Tokyo"
+    depart: str = "2026-03-10"
+    return_date: str = "2026-03-15"
+    clarifications: int = 0     # planner questions asked before delegating
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _tool_name(tool: Tool | ToolSchema) -> str:
+    return tool.name if isinstance(tool, Tool) else tool["name"]
+
+
+class ScriptedChatCompletionClient(ChatCompletionClient):
+    """Replays canned planner / specialist / itinerary responses.
+
+    The role is recognised from the agent's system prompt (or its tools),
+    so one client can be shared by the whole team exactly like the real one.
+    Every call sleeps ``latency`` seconds to model provider round-trips.
+    """
+
+    def __init__(self, script: TripScript = TripScript(), latency: float = 0.0) -> None:
+        self._script = script
+        self._latency = latency
+        self._usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self.calls = 0
+
+    # --- scripted behaviour ---
+
+    def _respond(self, messages: Sequence[LLMMessage], tools: Sequence[Tool | ToolSchema]) -> str | list[FunctionCall]:
+        s = self._script
+        if messages and isinstance(messages[-1], FunctionExecutionResultMessage):
+            # Specialist reflecting on its tool results
+            return "Results are ranked above; the first option is recommended."
+        tool_names = {_tool_name(tool) for tool in tools}
+        if "search_flights" in tool_names:
+            args = {"origin": s.origin, "destination": s.destination, "date": s.depart}
+            return [FunctionCall(id=f"call-{self.calls}", name="search_flights", arguments=json.dumps(args))]
+        if "search_hotels" in tool_names:
+            args = {"city": s.destination, "check_in": s.depart, "check_out": s.return_date}
+            return [FunctionCall(id=f"call-{self.calls}", name="search_hotels", arguments=json.dumps(args))]
+        if "get_weather" in tool_names:
+            args = {"city": s.destination, "date": s.depart}
+            return [FunctionCall(id=f"call-{self.calls}", name="get_weather", arguments=json.dumps(args))]
+
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        if system.startswith("You are the **Itinerary Agent** writing the day-by-day plan"):
+            days = re.findall(r"^(Day \d+ — [\d-]+ — [^:\n]+)", str(messages[-1].content), re.MULTILINE)
+            return "\n\n".join(f"**{day}**\n  • Explore the neighborhood." for day in days)
+        if system.startswith("You are the **Itinerary Agent**"):
+            return (
+                f"🗺️ TRAVEL ITINERARY: {s.destination}\n📅 {s.depart} → {s.return_date}\n"
+                "Day 1 — Arrival. Day 2 — Explore. Day 3 — Depart.\nTERMINATE"
+            )
+
+        # Planner: ask the scripted clarifications, then delegate, then summarize
+        if any(isinstance(m, UserMessage) and m.source == SPECIALISTS for m in messages):
+            return "All specialists have reported. Itinerary Agent, please compile the final plan."
+        # Count questions from the text so condensed history still counts them
+        asked = len(_QUESTION.findall(" ".join(str(m.content) for m in messages)))
+        if asked < s.clarifications:
+            return f"Question {asked + 1}: could you tell me a bit more about your preferences?"
+        return (
+            f"Flight Agent: search flights {s.origin} → {s.destination} on {s.depart}. "
+            f"Hotel Agent: search hotels in {s.destination} from {s.depart} to {s.return_date}. "
+            f"Weather Agent: check weather in {s.destination} on {s.depart}."
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        self.calls += 1
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        content = self._respond(messages, tools)
+        usage = RequestUsage(
+            prompt_tokens=self.count_tokens(messages, tools=tools),
+            completion_tokens=_approx_tokens(content if isinstance(content, str) else json.dumps([c.arguments for c in content])),
+        )
+        self._usage = RequestUsage(
+            prompt_tokens=self._usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._usage.completion_tokens + usage.completion_tokens,
+        )
+        finish_reason = "stop" if isinstance(content, str) else "function_calls"
+        return CreateResult(finish_reason=finish_reason, content=content, usage=usage, cached=False)
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        result = await self.create(messages, tools=tools, cancellation_token=cancellation_token)
+        if isinstance(result.content, str):
+            for word in result.content.split(" "):
+                yield word + " "
+        yield result
+
+    # --- bookkeeping ---
+
+    async def close(self) -> None:
+        pass
+
+    def actual_usage(self) -> RequestUsage:
+        return self._usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._usage
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return sum(_approx_tokens(str(m.content)) for m in messages)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return 128_000 - self.count_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore[override]
+        return MODEL_INFO  # type: ignore[return-value]
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return MODEL_INFO
+
+
+def _text(message: Mapping[str, Any]) -> str:
+    content = message.get("content")
+    return content if isinstance(content, str) else json.dumps(content or "")
+
+
+def _tool_call(index: int, name: str, **arguments: Any) -> dict[str, Any]:
+    return {"id": f"call-{index}-{name}", "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+def _scripted_planner(messages: list[Mapping[str, Any]]) -> str:
+    """Ask for whatever the traveler has not said yet (destination, origin, dates), then delegate."""
+    if any(m.get("role") == "user" and m.get("name") == SPECIALISTS for m in messages):
+        summary = "All specialists have reported. Itinerary Agent, please compile the final plan."
+        traveler = " ".join(_text(m) for m in messages if m.get("name") == USER)
+        if "window seat" in traveler:
+            summary += '\nSAVE_PREFERENCE: {"seat": "window"}'
+        return summary
+
+    fields: dict[str, str] = {}
+    for message in messages:
+        if message.get("role") != "user" or message.get("name", USER) != USER:
+            continue
+        text = _text(message)
+        for key, pattern in (("origin", _ORIGIN), ("destination", _DESTINATION)):
+            match = pattern.search(text)
+            if match:
+                fields[key] = match.group(1)
+        dates = _ISO_DATE.findall(text)
+        if len(dates) >= 2:
+            fields["depart"], fields["return_date"] = dates[0], dates[1]
+
+    asked = sum(len(_QUESTION.findall(_text(m))) for m in messages if m.get("role") == "assistant")
+    defaults = TripScript()
+    for key, question in (
+        ("destination", "where would you like to go?"),
+        ("origin", "which city are you flying from?"),
+        ("depart", "what are your exact travel dates (YYYY-MM-DD to YYYY-MM-DD)?"),
+    ):
+        if key not in fields:
+            if asked < _MAX_QUESTIONS:
+                return f"Question {asked + 1}: {question}"
+            # The traveler never said — plan the default trip rather than ask forever
+            fields.setdefault(key, getattr(defaults, key))
+            if key == "depart":
+                fields["return_date"] = defaults.return_date
+    trip = TripRequest(fields["origin"], fields["destination"], fields["depart"], fields["return_date"])
+    return trip.delegation()
+
+
+def travel_reply(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """The assistant message a scripted travel team would get for an OpenAI chat ``payload``.
+
+    The server-side counterpart of :class:`ScriptedChatCompletionClient` for
+    ``benchmarks/stub_llm.py --scripted``: one stub serves many sessions, so
+    the trip is read from the conversation instead of a ``TripScript``. The
+    planner asks one question per missing detail and delegates in the fast
+    path's format; the specialists call their tools for the delegated trip.
+    """
+    messages = list(payload.get("messages", []))
+    tools = {tool["function"]["name"] for tool in payload.get("tools", [])}
+    if messages and messages[-1].get("role") == "tool":
+        return {"content": "Results are ranked above; the first option is recommended."}
+
+    if tools & {"search_flights", "search_hotels", "get_weather_range"}:
+        match = next(filter(None, (_TRIP_LINE.search(_text(m)) for m in reversed(messages))), None)
+        s = TripScript()
+        origin, destination, depart, return_date = match.groups() if match else (s.origin, s.destination, s.depart, s.return_date)
+        if "search_flights" in tools:
+            return {"tool_calls": [
+                _tool_call(0, "search_flights", origin=origin, destination=destination, date=depart),
+                _tool_call(1, "search_flights", origin=destination, destination=origin, date=return_date),
+            ]}
+        if "search_hotels" in tools:
+            return {"tool_calls": [_tool_call(0, "search_hotels", city=destination, check_in=depart, check_out=return_date)]}
+        return {"tool_calls": [_tool_call(0, "get_weather_range", city=destination, start_date=depart, end_date=return_date)]}
+
+    system = next((_text(m) for m in messages if m.get("role") == "system"), "")
+    if system.startswith("You are the **Itinerary Agent** writing the day-by-day plan"):
+        days = re.findall(r"^(Day \d+ — [\d-]+ — [^:\n]+)", _text(messages[-1]), re.MULTILINE)
+        return {"content": "\n\n".join(f"**{day}**\n  • Explore the neighborhood." for day in days)}
+    if system.startswith("You are the **Itinerary Agent**"):
+        digest = " ".join(_text(m) for m in messages if m.get("name") == SPECIALISTS)
+        return {"content": f"🗺️ TRAVEL ITINERARY\n{digest[:400]}\nDay 1 — Arrival. Day 2 — Explore. Day 3 — Depart.\nTERMINATE"}
+    return {"content": _scripted_planner(messages)}
@@ -0,0 +1,77 @@
+"""Prompt tokens per tool output format.
+
+Usage::
+
+    python -m benchmarks.formats --top-k 3 --output output/bench.jsonl
+
+Calls each mock tool for a fixed set of trips and counts the tokens
+(``llm.tokens.count_tokens``) its result would add to the conversation in
+every format, with and without the top-k cut. One JSON object per (tool, format, top_k)
+is printed and appended to ``--output``.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from benchmarks.run import _git_revision
+from llm.tokens import count_tokens
+from tools.flight_search import search_flights
+from tools.format import FORMATS, format_result
+from tools.hotel_search import search_hotels
+from tools.weather import get_weather
+
+_TRIPS = [
+    ("New York", "Tokyo", "2026-03-10", "2026-03-15"),
+    ("London", "Paris", "2026-05-02", "2026-05-06"),
+    ("San Francisco", "Lisbon", "2026-09-18", "2026-09-25"),
+    ("Sydney", "Singapore", "2026-12-20", "2026-12-27"),
+]
+
+_CALLS = {
+    "search_flights": lambda trip: search_flights(trip[0], trip[1], trip[2]),
+    "search_hotels": lambda trip: search_hotels(trip[1], trip[2], trip[3]),
+    "get_weather": lambda trip: get_weather(trip[1], trip[2]),
+}
+
+
+def measure(top_k: int) -> list[dict]:
+    """Mean tokens per call for every tool × format, with and without ``top_k``."""
+    results = []
+    for tool, call in _CALLS.items():
+        values = [json.loads(call(trip)) for trip in _TRIPS]
+        baseline = sum(count_tokens(format_result(v, "pretty")) for v in values) / len(values)
+        for k in sorted({0, top_k}):
+            for fmt in FORMATS:
+                tokens = sum(count_tokens(format_result(v, fmt, k)) for v in values) / len(values)
+                results.append({
+                    "tool": tool,
+                    "format": fmt,
+                    "top_k": k,
+                    "tokens_per_call": round(tokens, 1),
+                    "vs_pretty": round(tokens / baseline, 3),
+                })
+    return results
+
+
+def main(args: argparse.Namespace) -> None:
+    revision = _git_revision()
+    output = Path(args.output) if args.output else None
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+    for result in measure(args.top_k):
+        record = {"benchmark": "tool_formats", "revision": revision, "timestamp": time.time(), **result}
+        line = json.dumps(record, ensure_ascii=False)
+        print(line)
+        if output:
+            with output.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure prompt tokens per tool output format")
+    parser.add_argument("--top-k", type=int, default=3, help="also measure each format truncated to k results")
+    parser.add_argument("--output", default="", help="append JSONL results to this file")
+    main(parser.parse_args())
@@ -0,0 +1,90 @@
+"""Tool-layer load test against the synthetic inventory.
+
+Usage::
+
+    python -m benchmarks.inventory --cities 2000 --queries 20000 --output output/bench.jsonl
+    python -m benchmarks.inventory --inventory .cache/inventory      # memory-mapped, prebuilt
+
+Times inventory construction (generation or memory-mapping), then runs
+random flight, hotel and flexible-date queries with filters and reports
+per-query latency. One JSON object per query kind is printed and appended
+to ``--output``.
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks.run import _git_revision, _summary
+from tools.inventory import AMENITIES, SyntheticInventory
+
+
+def _timed(queries: int, call) -> list[float]:
+    durations = []
+    for i in range(queries):
+        started = time.perf_counter()
+        call(i)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    started = time.perf_counter()
+    if args.inventory:
+        inventory = SyntheticInventory.load(args.inventory)
+    else:
+        inventory = SyntheticInventory.generate(args.cities, args.routes_per_city, days=args.days, seed=args.seed)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(args.seed)
+    cities = inventory.cities
+    dates = [(date(2026, 1, 1) + timedelta(days=rng.randrange(365))).isoformat() for _ in range(args.queries)]
+    routes = inventory.describe()["routes"]
+    pairs = [inventory.route(rng.randrange(routes)) for _ in range(args.queries)]
+    stays = [rng.choice(cities) for _ in range(args.queries)]
+
+    def stay_end(i: int) -> str:
+        return (date.fromisoformat(dates[i]) + timedelta(days=1 + i % 7)).isoformat()
+
+    kinds = {
+        "flights": lambda i: inventory.flights(*pairs[i], dates[i], limit=5),
+        "flights_filtered": lambda i: inventory.flights(*pairs[i], dates[i], max_price=400, airline="air", limit=3),
+        "hotels": lambda i: inventory.hotels(stays[i], dates[i], stay_end(i), limit=5),
+        "hotels_filtered": lambda i: inventory.hotels(
+            stays[i], dates[i], stay_end(i), max_price=300, min_rating=4.2, amenities=rng.choice(AMENITIES), limit=3
+        ),
+        "flight_dates_14d": lambda i: inventory.flight_dates(*pairs[i], dates[i], flex_days=7),
+    }
+    base = {"benchmark": "inventory", "build_seconds": round(build_seconds, 3), **inventory.describe()}
+    return [{**base, "query": kind, "queries": args.queries, "latency": _summary(_timed(args.queries, call))}
+            for kind, call in kinds.items()]
+
+
+def main(args: argparse.Namespace) -> None:
+    revision = _git_revision()
+    output = Path(args.output) if args.output else None
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+    for result in run(args):
+        record = {"revision": revision, "timestamp": time.time(), **result}
+        line = json.dumps(record, ensure_ascii=False)
+        print(line)
+        if output:
+            with output.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the tool layer against the synthetic inventory")
+    parser.add_argument("--inventory", default="", help="saved inventory directory (default: generate one)")
+    parser.add_argument("--cities", type=int, default=2000)
+    parser.add_argument("--routes-per-city", type=int, default=12)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=20000, help="queries per kind")
+    parser.add_argument("--output", default="", help="append JSONL results to this file")
+    main(parser.parse_args())
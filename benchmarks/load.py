@@ -0,0 +1,424 @@
+"""Concurrent load test — hundreds of simulated travelers against the scripted stub LLM.
+
+Usage::
+
+    python -m benchmarks.load --sessions 200 --concurrency 10,50,100,200 --latency 0.2 \\
+        --error-rate 0.02 --output output/bench.jsonl
+
+Starts ``benchmarks/stub_llm.py --scripted`` in its own process (or uses
+``--stub-url``), so the stub's work does not show up in this process's
+event-loop lag or memory. For every concurrency level it plans ``--sessions``
+trips through the production stack: ``build_team()`` per session, the real
+OpenAI client behind the shared rate limiter, the selector, the tool cache,
+the preference database and, with ``--checkpoint-db``, per-turn checkpoints.
+Sessions follow a seeded mix of scripts:
+
+- ``direct``: a well-formed request (planner fast path, no clarifications)
+- ``missing_dates``: route and budget, then the dates when asked
+- ``vague``: a destination only; a non-answer, then the origin and a seat
+  preference (saved to the preference database), then the dates
+
+The traveler answers each clarifying question after ``--think`` seconds.
+One untimed session runs first, so the levels do not pay for the provider
+SDK import and the tokenizer load.
+
+One JSON object per level reports:
+
+- throughput: sessions, turns and stub requests per second
+- session latency and ``build_team()`` / preference-save times
+- per-agent turn, LLM and tool latency (p50/p95/p99, from tracer spans)
+- event-loop lag and peak RSS
+- stub outcomes, rate-limiter counters and failed sessions by error
+
+A final ``summary`` object names the saturation point and the hotspots. The
+saturation point is the first level whose session throughput gains less
+than ``--saturation-gain`` over the previous one. The hotspots are the
+latencies whose p95 grew most from the lowest to the highest level.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseChatMessage
+
+from agents.checkpoint import run_checkpointed
+from agents.selector import selector_metrics
+from agents.team import build_team
+from benchmarks.run import _git_revision, _percentile
+from config.checkpoints import get_checkpoint_store
+from config.memory import extract_preferences, save_memory
+from config.settings import Settings
+from llm.ratelimit import get_rate_limiter
+from telemetry.tracing import Span, Tracer
+from tools.cache import get_tool_cache
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_CITIES = [
+    "New York", "Chicago", "Boston", "Seattle", "Denver", "Toronto", "London", "Paris",
+    "Lisbon", "Rome", "Berlin", "Tokyo", "Seoul", "Singapore", "Sydney", "Dubai",
+]
+_KINDS = ("direct", "missing_dates", "vague")
+_FALLBACK_ANSWER = "Whatever you think is best."
+
+
+@dataclass(frozen=True)
+class TravelerScript:
+    """One simulated traveler: the request and the answers to the planner's questions, in order."""
+
+    kind: str
+    task: str
+    answers: tuple[str, ...]
+    user_id: str
+
+
+def make_scripts(count: int, mix: dict[str, float], users: int, seed: int = 0) -> list[TravelerScript]:
+    """``count`` seeded traveler scripts, ``mix`` weighting the kinds, spread over ``users`` travelers."""
+    rng = random.Random(seed)
+    kinds, weights = zip(*mix.items())
+    scripts = []
+    for i in range(count):
+        origin, destination = rng.sample(_CITIES, 2)
+        depart = date(2026, 3, 1) + timedelta(days=rng.randrange(240))
+        dates = f"{depart.isoformat()} to {(depart + timedelta(days=rng.randint(3, 8))).isoformat()}"
+        budget = rng.choice((1500, 2500, 4000, 6000))
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "direct":
+            task, answers = f"Plan a trip from {origin} to {destination}, {dates}. Budget: ${budget}", ()
+        elif kind == "missing_dates":
+            task, answers = f"Plan a trip from {origin} to {destination}. Budget: ${budget}", (dates,)
+        else:
+            task = f"I'd like a holiday in {destination}, budget around ${budget}."
+            answers = ("Not sure yet, what do you suggest?", f"I'm flying from {origin}. I prefer a window seat.", dates)
+        scripts.append(TravelerScript(kind, task, answers, f"load-{i % users}"))
+    return scripts
+
+
+class SpanCollector:
+    """Span exporter that keeps durations by kind and agent instead of writing JSONL."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[tuple[str, str], list[float]] = defaultdict(list)
+
+    def export(self, span: Span) -> None:
+        seconds = (span.end_time_unix_nano - span.start_time_unix_nano) / 1e9
+        agent = str(span.attributes.get("agent", ""))
+        if span.name == "agent.turn":
+            self.seconds[("agent_turn", agent)].append(seconds)
+        elif span.name.startswith("llm."):
+            self.seconds[("llm", agent)].append(seconds)
+        elif span.name.startswith("tool."):
+            self.seconds[("tool", span.name[len("tool."):])].append(seconds)
+        else:
+            self.seconds[(span.name, "")].append(seconds)
+
+    def close(self) -> None:
+        pass
+
+
+class LoopMonitor:
+    """Samples event-loop lag (how late a ``sleep(interval)`` wakes up) and the process RSS."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.lag: list[float] = []
+        self.peak_rss = 0
+        self._running = True
+
+    async def run(self) -> None:
+        while self._running:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lag.append(max(0.0, time.perf_counter() - started - self.interval))
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+    def stop(self) -> None:
+        self._running = False
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No procfs: the process-lifetime peak is the closest available figure (KiB on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _latency(values: list[float]) -> dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+        "p99_ms": round(_percentile(values, 99) * 1000, 3),
+    }
+
+
+async def _run_session(
+    script: TravelerScript, settings: Settings, collector: SpanCollector, think: float, stream: bool
+) -> dict:
+    answers = iter(script.answers)
+
+    async def answer(prompt: str, cancellation_token=None) -> str:
+        await asyncio.sleep(think)
+        return next(answers, _FALLBACK_ANSWER)
+
+    outcome = {"kind": script.kind, "seconds": 0.0, "build_seconds": 0.0, "save_seconds": 0.0, "turns": 0,
+               "completed": False, "error": ""}
+    started = time.perf_counter()
+    try:
+        team = build_team(input_func=answer, settings=settings, tracer=Tracer(collector), user_id=script.user_id, stream=stream)
+        outcome["build_seconds"] = time.perf_counter() - started
+        if settings.checkpoint_db:
+            store = get_checkpoint_store(settings.checkpoint_db)
+            events = run_checkpointed(team, store, uuid.uuid4().hex, task=script.task, user_id=script.user_id)
+        else:
+            events = team.run_stream(task=script.task)
+        result: TaskResult | None = None
+        async for item in events:
+            if isinstance(item, TaskResult):
+                result = item
+            elif isinstance(item, BaseChatMessage):
+                outcome["turns"] += 1
+        outcome["turns"] -= 1  # the echoed task is not a turn
+        if result is not None:
+            outcome["completed"] = "TERMINATE" in (result.stop_reason or "")
+            # As in the CLI and the server: preferences are saved on the event loop after the run
+            saving = time.perf_counter()
+            preferences = extract_preferences(result.messages)
+            if preferences:
+                save_memory(preferences, script.user_id, settings.memory_db)
+            outcome["save_seconds"] = time.perf_counter() - saving
+    except Exception as exc:  # a failed session is a data point, not the end of the run
+        outcome["error"] = f"{type(exc).__name__}: {str(exc)[:120]}"
+    outcome["seconds"] = time.perf_counter() - started
+    return outcome
+
+
+def _stub_stats(stub_url: str) -> dict[str, int]:
+    with urllib.request.urlopen(f"{stub_url.removesuffix('/v1')}/stats", timeout=10) as response:
+        return json.load(response)
+
+
+async def run_level(concurrency: int, scripts: list[TravelerScript], settings: Settings, args: argparse.Namespace) -> dict:
+    """Plan every script with at most ``concurrency`` sessions in flight and return the level's metrics."""
+    get_tool_cache(settings.tool_cache_db).clear()
+    # The key build_team() gives the limiter of this provider, model and endpoint
+    limiter = get_rate_limiter(
+        f"{settings.provider}:{settings.model_name}:{settings.base_url}",
+        rpm=settings.llm_rpm, tpm=settings.llm_tpm,
+        max_concurrency=settings.llm_max_concurrency, max_retries=settings.llm_max_retries,
+    )
+    limiter_before, selector_before = limiter.stats(), selector_metrics()
+    stub_before = await asyncio.to_thread(_stub_stats, settings.base_url)
+    collector, monitor = SpanCollector(), LoopMonitor()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def bounded(script: TravelerScript) -> dict:
+        async with gate:
+            return await _run_session(script, settings, collector, args.think, args.stream)
+
+    watcher = asyncio.create_task(monitor.run())
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(bounded(script) for script in scripts))
+    wall = time.perf_counter() - started
+    monitor.stop()
+    await watcher
+
+    stub_after = await asyncio.to_thread(_stub_stats, settings.base_url)
+    limiter_after, selector_after = limiter.stats(), selector_metrics()
+    completed = [o for o in outcomes if o["completed"]]
+    turns = sum(o["turns"] for o in outcomes)
+    stub = {key: stub_after[key] - stub_before.get(key, 0) for key in stub_after}
+    by_kind: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    for (kind, name), seconds in collector.seconds.items():
+        by_kind[kind][name].extend(seconds)
+
+    return {
+        "concurrency": concurrency,
+        "sessions": len(scripts),
+        "kinds": dict(Counter(script.kind for script in scripts)),
+        "wall_seconds": round(wall, 3),
+        "completed": len(completed),
+        "failed": sum(1 for o in outcomes if o["error"]),
+        "errors": dict(Counter(o["error"] for o in outcomes if o["error"]).most_common(5)),
+        "sessions_per_second": round(len(completed) / wall, 3) if wall else 0.0,
+        "turns_per_second": round(turns / wall, 2) if wall else 0.0,
+        "llm_requests_per_second": round(sum(stub.values()) / wall, 2) if wall else 0.0,
+        "session_latency": _latency([o["seconds"] for o in completed]),
+        "session_latency_by_kind": {
+            kind: _latency([o["seconds"] for o in completed if o["kind"] == kind]) for kind in sorted({o["kind"] for o in completed})
+        },
+        "build_team": _latency([o["build_seconds"] for o in outcomes if o["build_seconds"]]),
+        "preference_save": _latency([o["save_seconds"] for o in completed]),
+        "agent_turn_latency": {agent: _latency(s) for agent, s in sorted(by_kind["agent_turn"].items())},
+        "llm_latency": {agent: _latency(s) for agent, s in sorted(by_kind["llm"].items())},
+        "tool_latency": {tool: _latency(s) for tool, s in sorted(by_kind["tool"].items())},
+        "selector_latency": _latency(by_kind["selector.decide"][""]),
+        "selector_fallbacks": selector_after["fallbacks"] - selector_before["fallbacks"],
+        "event_loop_lag": {**_latency(monitor.lag), "max_ms": round(max(monitor.lag, default=0.0) * 1000, 3)},
+        "peak_rss_mib": round(monitor.peak_rss / 2**20, 1),
+        "stub": stub,
+        "limiter": {key: round(limiter_after[key] - limiter_before.get(key, 0), 3)
+                    for key in limiter_after if key != "concurrency_limit"},
+    }
+
+
+def summarize(levels: list[dict], saturation_gain: float) -> dict:
+    """Saturation point and the latencies that grew most between the lowest and highest level."""
+    saturation = None
+    for previous, level in zip(levels, levels[1:]):
+        if level["sessions_per_second"] < previous["sessions_per_second"] * (1 + saturation_gain):
+            saturation = previous["concurrency"]
+            break
+
+    def p95s(level: dict) -> dict[str, float]:
+        series = {"session": level["session_latency"]["p95_ms"], "build_team": level["build_team"]["p95_ms"],
+                  "preference_save": level["preference_save"]["p95_ms"], "selector": level["selector_latency"]["p95_ms"],
+                  "event_loop_lag": level["event_loop_lag"]["p95_ms"]}
+        for group in ("agent_turn_latency", "llm_latency", "tool_latency"):
+            series.update({f"{group.removesuffix('_latency')}:{name}": stats["p95_ms"] for name, stats in level[group].items()})
+        return series
+
+    first, last = p95s(levels[0]), p95s(levels[-1])
+    growth = {name: round(last[name] / first[name], 2) for name in first.keys() & last.keys() if first[name] > 0}
+    return {
+        "summary": True,
+        "levels": [level["concurrency"] for level in levels],
+        "sessions_per_second": [level["sessions_per_second"] for level in levels],
+        "saturation_concurrency": saturation,
+        "p95_growth": dict(sorted(growth.items(), key=lambda item: -item[1])[:8]),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Launch the scripted stub in a child process; returns it and its ``/v1`` base URL once it answers."""
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "benchmarks.stub_llm", "--scripted", "--port", str(port),
+        "--latency", str(args.latency), "--error-rate", str(args.error_rate), "--seed", str(args.seed),
+        "--rpm", str(args.stub_rpm), "--max-concurrency", str(args.stub_concurrency),
+    ]
+    process = subprocess.Popen(command, cwd=_PROJECT_ROOT, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/v1"
+    deadline = time.monotonic() + 15
+    while True:
+        try:
+            _stub_stats(url)
+            return process, url
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"Stub LLM did not start: {' '.join(command)}")
+            time.sleep(0.1)
+
+
+def _mix(text: str) -> dict[str, float]:
+    mix = {}
+    for entry in filter(None, text.split(",")):
+        kind, _, weight = entry.partition("=")
+        if kind not in _KINDS:
+            raise argparse.ArgumentTypeError(f"unknown session kind {kind!r}; expected {', '.join(_KINDS)}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(part) for part in text.split(",") if part]
+
+
+async def main(args: argparse.Namespace) -> None:
+    revision = _git_revision()
+    output = Path(args.output) if args.output else None
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+    process, stub_url = (None, args.stub_url) if args.stub_url else start_stub(args)
+    workdir = tempfile.mkdtemp(prefix="load-")
+    try:
+        settings = Settings(
+            provider="groq",
+            model_name="stub",
+            api_key="stub",
+            base_url=stub_url,
+            memory_db=args.memory_db or str(Path(workdir) / "preferences.sqlite"),
+            tool_cache_db=args.tool_cache_db,
+            checkpoint_db=args.checkpoint_db,
+            itinerary_renderer=args.renderer,
+            specialist_reflection=args.renderer == "llm",  # as Settings.from_env defaults it
+            llm_rpm=args.rpm,
+            llm_max_concurrency=args.max_concurrency,
+            llm_max_retries=args.max_retries,
+        )
+        scripts = make_scripts(args.sessions, args.mix, args.users, args.seed)
+        config = {"latency_s": args.latency, "error_rate": args.error_rate, "think_s": args.think,
+                  "renderer": args.renderer, "stream": args.stream, "checkpoints": bool(args.checkpoint_db)}
+        # One untimed session first: the provider SDK import and tokenizer load are one-off costs
+        await _run_session(scripts[0], settings, SpanCollector(), 0.0, args.stream)
+        levels = []
+        for concurrency in args.concurrency:
+            level = await run_level(concurrency, scripts, settings, args)
+            levels.append(level)
+            _emit({"benchmark": "load", "revision": revision, "timestamp": time.time(), **config, **level}, output)
+        _emit({"benchmark": "load", "revision": revision, "timestamp": time.time(), **config,
+               **summarize(levels, args.saturation_gain)}, output)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+def _emit(record: dict, output: Path | None) -> None:
+    line = json.dumps(record, ensure_ascii=False)
+    print(line, flush=True)
+    if output:
+        with output.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the planner with many concurrent simulated travelers")
+    parser.add_argument("--sessions", type=int, default=200, help="sessions planned at every concurrency level")
+    parser.add_argument("--concurrency", type=_int_list, default=[10, 50, 100, 200], help="comma-separated sessions in flight")
+    parser.add_argument("--mix", type=_mix, default=_mix("direct=0.5,missing_dates=0.3,vague=0.2"),
+                        help="session kinds and weights, e.g. direct=0.5,missing_dates=0.3,vague=0.2")
+    parser.add_argument("--users", type=int, default=50, help="distinct travelers the sessions belong to")
+    parser.add_argument("--think", type=float, default=0.5, help="seconds a traveler takes to answer a question")
+    parser.add_argument("--latency", type=float, default=0.2, help="stub seconds per model call")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of stub requests failing with 500/503")
+    parser.add_argument("--stub-rpm", type=int, default=0, help="stub's per-minute limit before 429s (0 = unlimited)")
+    parser.add_argument("--stub-concurrency", type=int, default=0, help="stub's in-flight limit before 429s (0 = unlimited)")
+    parser.add_argument("--stub-url", default="", help="use a running `stub_llm --scripted` at this /v1 URL instead of starting one")
+    parser.add_argument("--rpm", type=int, default=0, help="LLM_RPM for the rate limiter")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="LLM_MAX_CONCURRENCY for the rate limiter")
+    parser.add_argument("--max-retries", type=int, default=4, help="LLM_MAX_RETRIES for the rate limiter")
+    parser.add_argument("--renderer", default="llm", help="ITINERARY_RENDERER: llm, hybrid or template")
+    parser.add_argument("--stream", action="store_true", help="stream the itinerary as in server mode")
+    parser.add_argument("--memory-db", default="", help="preference database (default: a fresh temporary file)")
+    parser.add_argument("--tool-cache-db", default="", help="SQLite tool cache (default: in-memory)")
+    parser.add_argument("--checkpoint-db", default="", help="checkpoint every turn to this SQLite file")
+    parser.add_argument("--saturation-gain", type=float, default=0.1, help="throughput gain below which a level counts as saturated")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="", help="append JSONL results to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,127 @@
+"""LLM rate-limiting benchmark against the local throttling stub (benchmarks/stub_llm.py).
+
+Usage::
+
+    python -m benchmarks.ratelimit --calls 200 --concurrency 32 --stub-rpm 240 --stub-concurrency 8 \\
+        --error-rate 0.02 --latency 0.05 --output output/bench.jsonl
+
+Fires ``--calls`` completions, ``--concurrency`` at a time, through a real
+``OpenAIChatCompletionClient`` pointed at an in-process stub. Two modes run
+against a fresh stub each: ``sdk`` (the OpenAI SDK's own retries) and
+``limited`` (SDK retries off, behind ``RateLimitedChatCompletionClient`` with
+``--rpm`` / ``--max-concurrency``). One JSON object per mode is printed and
+appended to ``--output``.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from autogen_core.models import UserMessage
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+from benchmarks.run import _git_revision, _summary
+from benchmarks.stub_llm import StubLLM, start
+from llm.ratelimit import RateLimitedChatCompletionClient, RateLimiter
+
+_MODEL_INFO = {
+    "vision": False,
+    "function_calling": True,
+    "json_output": True,
+    "family": "unknown",
+    "structured_output": True,
+}
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> dict:
+    """Run the workload in ``mode`` (``sdk`` or ``limited``) against a fresh stub."""
+    stub = StubLLM(args.stub_rpm, args.stub_concurrency, args.error_rate, args.latency, args.seed)
+    server = await start(stub)
+    port = server.sockets[0].getsockname()[1]
+    limited = mode == "limited"
+    client = OpenAIChatCompletionClient(
+        model="stub",
+        api_key="stub",
+        base_url=f"http://127.0.0.1:{port}/v1",
+        model_info=_MODEL_INFO,
+        max_retries=0 if limited else 2,
+    )
+    limiter = RateLimiter(rpm=args.rpm, max_concurrency=args.max_concurrency, max_retries=args.max_retries) if limited else None
+    if limiter:
+        client = RateLimitedChatCompletionClient(client, limiter)
+
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def call(i: int) -> None:
+        nonlocal failures
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await client.create([UserMessage(content=f"Request {i}: plan a weekend in Lisbon.", source="user")])
+            except Exception:
+                failures += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(args.calls)))
+    wall = time.perf_counter() - started
+    await client.close()
+    server.close()
+    await server.wait_closed()
+
+    return {
+        "benchmark": "ratelimit",
+        "mode": mode,
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "stub": {"rpm": args.stub_rpm, "max_concurrency": args.stub_concurrency, "error_rate": args.error_rate},
+        "wall_seconds": round(wall, 4),
+        "succeeded": len(latencies),
+        "failed": failures,
+        "calls_per_second": round(len(latencies) / wall, 2) if wall else 0.0,
+        "server": {
+            "requests": sum(stub.counts.values()),
+            "throttled": stub.counts["throttled"],
+            "errors": stub.counts["errors"],
+        },
+        "latency": _summary(latencies),
+        "limiter": limiter.stats() if limiter else {},
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    revision = _git_revision()
+    output = Path(args.output) if args.output else None
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+    for mode in args.modes.split(","):
+        result = await run_mode(mode, args)
+        record = {"revision": revision, "timestamp": time.time(), **result}
+        line = json.dumps(record, ensure_ascii=False)
+        print(line)
+        if output:
+            with output.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LLM rate limiting against a throttling stub")
+    parser.add_argument("--modes", default="sdk,limited", help="comma-separated: sdk, limited")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32, help="calls in flight from the benchmark")
+    parser.add_argument("--stub-rpm", type=int, default=600, help="stub's per-minute limit before 429s")
+    parser.add_argument("--stub-concurrency", type=int, default=8, help="stub's in-flight limit before 429s")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of stub requests failing with 500/503")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub seconds per accepted request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rpm", type=int, default=0, help="limiter requests per minute (limited mode)")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="limiter's adaptive in-flight ceiling (limited mode)")
+    parser.add_argument("--max-retries", type=int, default=4, help="limiter retries (limited mode)")
+    parser.add_argument("--output", default="", help="append JSONL results to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,186 @@
+"""End-to-end orchestration benchmark against the scripted fake model client.
+
+Usage::
+
+    python -m benchmarks.run --sessions 1,8,32 --clarifications 0,2,4 --latency 0.05 \\
+        --output output/bench.jsonl
+
+Every scenario (concurrent sessions × clarifying turns) runs twice: once for
+timing and once under ``tracemalloc`` for memory, so allocation tracing does
+not distort the latency numbers. One JSON object per scenario is printed and
+appended to ``--output``.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseChatMessage, ToolCallExecutionEvent, ToolCallRequestEvent
+
+from agents.fast_path import fast_path_metrics
+from agents.selector import selector_metrics
+from agents.team import build_team
+from benchmarks.fake_client import ScriptedChatCompletionClient, TripScript
+from config.settings import Settings
+from tools.cache import get_tool_cache
+
+_SETTINGS = Settings(provider="fake", model_name="scripted")
+_TASK = "Plan a 5-day trip from New York to Tokyo, 2026-03-10 to 2026-03-15. Budget: $3000"
+# Too vague for the planner fast path, so the scripted clarifying turns happen
+_VAGUE_TASK = "Plan a 5-day trip to Tokyo in March. Budget: $3000"
+
+
+@dataclass
+class _SessionTrace:
+    turns: int = 0
+    seconds: float = 0.0
+    agent_turn_seconds: dict[str, list[float]] = field(default_factory=dict)
+    tool_seconds: list[float] = field(default_factory=list)
+
+
+async def _run_session(script: TripScript, latency: float) -> _SessionTrace:
+    client = ScriptedChatCompletionClient(script, latency=latency)
+    team = build_team(input_func=lambda prompt: "Mid-range hotels, window seat.", settings=_SETTINGS, model_client=client)
+    trace = _SessionTrace()
+    pending_tools: dict[str, float] = {}
+    started = last = time.perf_counter()
+    task_seen = False
+
+    async for item in team.run_stream(task=_VAGUE_TASK if script.clarifications else _TASK):
+        now = time.perf_counter()
+        if isinstance(item, TaskResult):
+            break
+        if isinstance(item, ToolCallRequestEvent):
+            pending_tools[item.source] = now
+        elif isinstance(item, ToolCallExecutionEvent) and item.source in pending_tools:
+            trace.tool_seconds.append(now - pending_tools.pop(item.source))
+        elif isinstance(item, BaseChatMessage):
+            if not task_seen:  # the echoed task is not an agent turn
+                task_seen = True
+                continue
+            trace.agent_turn_seconds.setdefault(item.source, []).append(now - last)
+            trace.turns += 1
+            last = now
+
+    trace.seconds = time.perf_counter() - started
+    return trace
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    return {
+        "mean_ms": round(statistics.fmean(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+    }
+
+
+async def run_scenario(sessions: int, clarifications: int, latency: float) -> dict:
+    """Run ``sessions`` concurrent plans and return the aggregated metrics."""
+    script = TripScript(clarifications=clarifications)
+
+    get_tool_cache().clear()
+    selector_before = selector_metrics()
+    fast_path_before = fast_path_metrics()
+    started = time.perf_counter()
+    traces = await asyncio.gather(*(_run_session(script, latency) for _ in range(sessions)))
+    wall = time.perf_counter() - started
+    selector_after = selector_metrics()
+    fast_path_after = fast_path_metrics()
+    tool_stats = get_tool_cache().stats().values()
+    prefetched = sum(counters["prefetched"] for counters in tool_stats)
+    prefetch_hits = sum(counters["prefetch_hits"] for counters in tool_stats)
+
+    # Memory pass — same workload, traced allocations
+    get_tool_cache().clear()
+    tracemalloc.start()
+    await asyncio.gather(*(_run_session(script, latency) for _ in range(sessions)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_agent: dict[str, list[float]] = {}
+    for trace in traces:
+        for agent, durations in trace.agent_turn_seconds.items():
+            per_agent.setdefault(agent, []).extend(durations)
+    turns = sum(trace.turns for trace in traces)
+    decisions = selector_after["decisions"] - selector_before["decisions"]
+    selector_seconds = selector_after["seconds"] - selector_before["seconds"]
+    fast_path_requests = fast_path_after["requests"] - fast_path_before["requests"]
+    fast_path_hits = fast_path_after["fast_path"] - fast_path_before["fast_path"]
+
+    return {
+        "sessions": sessions,
+        "clarifications": clarifications,
+        "model_latency_s": latency,
+        "wall_seconds": round(wall, 4),
+        "turns": turns,
+        "turns_per_second": round(turns / wall, 2) if wall else 0.0,
+        "session_latency": _summary([trace.seconds for trace in traces]),
+        "agent_turn_latency": {agent: _summary(durations) for agent, durations in sorted(per_agent.items())},
+        "selector": {
+            "decisions": decisions,
+            "fallbacks": selector_after["fallbacks"] - selector_before["fallbacks"],
+            "mean_us": round(selector_seconds / decisions * 1e6, 2) if decisions else 0.0,
+        },
+        "fast_path_fraction": round(fast_path_hits / fast_path_requests, 4) if fast_path_requests else 0.0,
+        "prefetch": {
+            "prefetched": prefetched,
+            "hits": prefetch_hits,
+            "hit_rate": round(prefetch_hits / prefetched, 4) if prefetched else 0.0,
+        },
+        "tool_latency": _summary([sec for trace in traces for sec in trace.tool_seconds]),
+        "peak_memory_kib_per_session": round(peak / 1024 / sessions, 1),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+async def main(args: argparse.Namespace) -> None:
+    revision = _git_revision()
+    output = Path(args.output) if args.output else None
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+    for sessions in args.sessions:
+        for clarifications in args.clarifications:
+            result = await run_scenario(sessions, clarifications, args.latency)
+            record = {"benchmark": "orchestration", "revision": revision, "timestamp": time.time(), **result}
+            line = json.dumps(record, ensure_ascii=False)
+            print(line)
+            if output:
+                with output.open("a", encoding="utf-8") as fh:
+                    fh.write(line + "\n")
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(part) for part in text.split(",") if part]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark team orchestration with a scripted model client")
+    parser.add_argument("--sessions", type=_int_list, default=[1, 4, 16], help="comma-separated concurrent session counts")
+    parser.add_argument("--clarifications", type=_int_list, default=[0, 2], help="comma-separated clarifying turns per session")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per model call")
+    parser.add_argument("--output", default="", help="append JSONL results to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+"""Cold-start benchmark — import, team construction and first response in fresh processes.
+
+Usage::
+
+    python -m benchmarks.startup --runs 5 --budget-import-ms 700 --budget-first-response-ms 800 \\
+        --output output/bench.jsonl
+
+Each run starts a new interpreter (``--child``) that times, from its own start:
+
+- ``main_import`` — ``import main`` (what ``python main.py --help`` pays);
+- ``team_import`` — importing ``agents.team`` and AutoGen;
+- ``build`` — ``build_team()`` with a real provider configuration (no
+  network: clients and late agents are built on first use);
+- ``first_response`` — until the first agent message of a run against the
+  scripted fake model, i.e. the whole cold start as a short-lived worker
+  sees it.
+
+The medians are compared with the budgets; the process exits with status 1
+when one is exceeded, so CI can catch startup regressions.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_TASK = "Plan a 5-day trip from New York to Tokyo, 2026-03-10 to 2026-03-15. Budget: $3000"
+
+
+async def _child() -> dict[str, float]:
+    started = time.perf_counter()
+    import main  # noqa: F401
+
+    imported_main = time.perf_counter()
+    from autogen_agentchat.messages import BaseChatMessage
+
+    from agents.team import build_team
+    from benchmarks.fake_client import ScriptedChatCompletionClient, TripScript
+    from config.settings import Settings
+
+    imported_team = time.perf_counter()
+    settings = Settings(provider="groq", model_name="llama-3.3-70b-versatile", api_key="startup-benchmark")
+    build_team(input_func=lambda prompt: "", settings=settings)
+    built = time.perf_counter()
+
+    team = build_team(
+        input_func=lambda prompt: "", settings=settings, model_client=ScriptedChatCompletionClient(TripScript())
+    )
+    first_response = 0.0
+    async for item in team.run_stream(task=_TASK):
+        if isinstance(item, BaseChatMessage) and item.source != "user":
+            first_response = time.perf_counter()
+            break
+    return {
+        "main_import_ms": (imported_main - started) * 1000,
+        "team_import_ms": (imported_team - imported_main) * 1000,
+        "build_ms": (built - imported_team) * 1000,
+        "first_response_ms": (first_response - started) * 1000,
+    }
+
+
+def _run_child() -> dict[str, float]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        cwd=_PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def run(args: argparse.Namespace) -> dict:
+    runs = [_run_child() for _ in range(args.runs)]
+    medians = {key: round(statistics.median(run[key] for run in runs), 2) for key in runs[0]}
+    budgets = {"import_ms": args.budget_import_ms, "first_response_ms": args.budget_first_response_ms}
+    measured = {"import_ms": medians["main_import_ms"] + medians["team_import_ms"], "first_response_ms": medians["first_response_ms"]}
+    over = [key for key, budget in budgets.items() if budget and measured[key] > budget]
+    return {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "median": medians,
+        "max": {key: round(max(run[key] for run in runs), 2) for key in runs[0]},
+        "budget": budgets,
+        "over_budget": over,
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    from benchmarks.run import _git_revision  # not at module level: the child must start cold
+
+    result = run(args)
+    record = {"revision": _git_revision(), "timestamp": time.time(), **result}
+    line = json.dumps(record, ensure_ascii=False)
+    print(line)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+    for key in result["over_budget"]:
+        print(f"over budget: {key} exceeds {result['budget'][key]} ms", file=sys.stderr)
+    return 1 if result["over_budget"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold start: imports, build_team() and first response")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to time")
+    parser.add_argument("--budget-import-ms", type=float, default=700.0, help="median main + team import budget (0 = none)")
+    parser.add_argument("--budget-first-response-ms", type=float, default=800.0, help="median time-to-first-response budget (0 = none)")
+    parser.add_argument("--output", default="", help="append JSONL results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(_child())))
+    else:
+        sys.exit(main(args))
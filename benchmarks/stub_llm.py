@@ -0,0 +1,186 @@
+"""Local OpenAI-compatible chat completions stub that simulates provider throttling.
+
+Usage::
+
+    python -m benchmarks.stub_llm --port 8900 --rpm 120 --max-concurrency 4 --error-rate 0.02 --latency 0.2
+
+Then point any OpenAI-compatible client at ``http://127.0.0.1:8900/v1``.
+Requests beyond ``--rpm`` (sliding one-minute window) or ``--max-concurrency``
+get a ``429`` with ``Retry-After``. A random ``--error-rate`` share get a
+``500`` or ``503``. Every other request waits ``--latency`` seconds and gets a
+short reply (``"stream": true`` is answered as SSE chunks). With
+``--scripted`` the replies are those of a scripted travel team
+(``benchmarks.fake_client.travel_reply``), tool calls included, so the real
+planner can run against the stub (``GROQ_BASE_URL``). ``GET /stats``
+returns the counts per outcome.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Mapping
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class StubLLM:
+    """The stub's throttling policy and counters.
+
+    Args:
+        rpm: requests accepted per rolling minute (0 = unlimited).
+        max_concurrency: requests served at once before 429s (0 = unlimited).
+        error_rate: share of accepted requests that fail with a 5xx.
+        latency: seconds each accepted request takes.
+        seed: seeds the random 5xx failures.
+        reply: the assistant message (``content`` or ``tool_calls``) for a request
+            payload; by default a short canned text.
+    """
+
+    def __init__(
+        self, rpm: int = 0, max_concurrency: int = 0, error_rate: float = 0.0, latency: float = 0.0, seed: int = 0,
+        reply: Callable[[Mapping[str, Any]], dict[str, Any]] | None = None,
+    ) -> None:
+        self.rpm = rpm
+        self.max_concurrency = max_concurrency
+        self.error_rate = error_rate
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._reply = reply
+        self._accepted: deque[float] = deque()
+        self._in_flight = 0
+        self.counts = {"ok": 0, "throttled": 0, "errors": 0}
+
+    def _admit(self) -> tuple[int, float]:
+        """Status to answer with, and the Retry-After for a 429."""
+        now = time.monotonic()
+        while self._accepted and now - self._accepted[0] >= 60:
+            self._accepted.popleft()
+        if self.rpm and len(self._accepted) >= self.rpm:
+            return 429, max(0.05, 60 - (now - self._accepted[0]))
+        if self.max_concurrency and self._in_flight >= self.max_concurrency:
+            return 429, max(0.05, self.latency)
+        self._accepted.append(now)
+        if self._rng.random() < self.error_rate:
+            return self._rng.choice((500, 503)), 0.0
+        return 200, 0.0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request := await _read_request(reader):
+                method, path, body = request
+                if method == "GET" and path == "/stats":
+                    _write(writer, 200, self.counts)
+                elif method == "POST" and path.endswith("/chat/completions"):
+                    await self._complete(writer, json.loads(body or b"{}"))
+                else:
+                    _write(writer, 404, {"error": {"message": "Not found"}})
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _complete(self, writer: asyncio.StreamWriter, payload: dict) -> None:
+        status, retry_after = self._admit()
+        if status == 429:
+            self.counts["throttled"] += 1
+            _write(writer, 429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                   {"Retry-After": f"{retry_after:.2f}"})
+            return
+        self._in_flight += 1
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self._in_flight -= 1
+        if status != 200:
+            self.counts["errors"] += 1
+            _write(writer, status, {"error": {"message": "Simulated server error", "type": "server_error"}})
+            return
+
+        self.counts["ok"] += 1
+        messages = payload.get("messages", [])
+        prompt_tokens = sum(len(str(m.get("content", ""))) // 4 + 1 for m in messages)
+        message = self._reply(payload) if self._reply else {"content": f"Stub reply to {len(messages)} message(s)."}
+        content, tool_calls = message.get("content"), message.get("tool_calls")
+        finish_reason = "tool_calls" if tool_calls else "stop"
+        completion_tokens = len(content or json.dumps(tool_calls)) // 4 + 1
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+        base = {"id": f"stub-{self.counts['ok']}", "created": int(time.time()), "model": payload.get("model", "stub")}
+        if not payload.get("stream"):
+            _write(writer, 200, {
+                **base, "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", **message}, "finish_reason": finish_reason}],
+                "usage": usage,
+            })
+            return
+        if tool_calls:
+            chunks = [{"index": 0, "delta": {"role": "assistant", "tool_calls": [
+                {"index": i, **call} for i, call in enumerate(tool_calls)
+            ]}, "finish_reason": None}]
+        else:
+            chunks = [{"index": 0, "delta": {"role": "assistant", "content": word + " "}, "finish_reason": None}
+                      for word in content.split(" ")]
+        chunks.append({"index": 0, "delta": {}, "finish_reason": finish_reason})
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nConnection: close\r\n\r\n")
+        for choice in chunks:
+            data = {**base, "object": "chat.completion.chunk", "choices": [choice]}
+            writer.write(f"data: {json.dumps(data)}\n\n".encode())
+        final = {**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}
+        writer.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+        await writer.drain()
+        writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    length = 0
+    while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = header.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    return method.upper(), target.split("?", 1)[0], await reader.readexactly(length) if length else b""
+
+
+def _write(writer: asyncio.StreamWriter, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+    body = json.dumps(payload).encode()
+    head = f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    writer.write((head + "\r\n").encode() + body)
+
+
+async def start(stub: StubLLM, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+    """Serve ``stub``; ``port=0`` picks a free port (see ``server.sockets[0].getsockname()``)."""
+    return await asyncio.start_server(stub.handle, host, port)
+
+
+async def main(args: argparse.Namespace) -> None:
+    reply = None
+    if args.scripted:
+        from benchmarks.fake_client import travel_reply as reply
+    stub = StubLLM(args.rpm, args.max_concurrency, args.error_rate, args.latency, args.seed, reply)
+    server = await start(stub, args.host, args.port)
+    print(f"Stub LLM on http://{args.host}:{args.port}/v1 (rpm={args.rpm}, max_concurrency={args.max_concurrency})", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub that simulates provider throttling")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--rpm", type=int, default=0, help="requests per rolling minute before 429s (0 = unlimited)")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="requests in flight before 429s (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 500/503")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per accepted request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scripted", action="store_true", help="answer as a scripted travel team (tool calls included)")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,115 @@
+"""Session checkpoints — compressed team state snapshots in SQLite.
+
+A checkpoint is the latest ``team.save_state()`` of one planning session,
+stored as zlib-compressed compact JSON (typically 10–15× smaller than the
+raw state) with the request and traveler it belongs to. Saving overwrites
+the session's single row, so the file holds one snapshot per unfinished
+session. The database runs in WAL mode, so several processes (server
+workers, a restarted CLI) can share one file.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+from config.memory import DEFAULT_USER
+
+
+@dataclass
+class Checkpoint:
+    """The last saved state of one session."""
+
+    session_id: str
+    request: str
+    user_id: str
+    turns: int
+    state: dict[str, Any]
+    updated_at: float
+
+
+def encode_state(state: Mapping[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def decode_state(blob: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class CheckpointStore:
+    """One compressed team snapshot per unfinished session, backed by SQLite.
+
+    Args:
+        db_path: SQLite file; created (with its directory) on first use.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "session_id TEXT PRIMARY KEY, request TEXT NOT NULL, user_id TEXT NOT NULL, "
+            "turns INTEGER NOT NULL, state BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def save(
+        self, session_id: str, state: Mapping[str, Any], request: str, user_id: str = DEFAULT_USER, turns: int = 0
+    ) -> int:
+        """Replace ``session_id``'s snapshot; returns the compressed size in bytes."""
+        blob = encode_state(state)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO checkpoints (session_id, request, user_id, turns, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (session_id) DO UPDATE SET "
+                "turns = excluded.turns, state = excluded.state, updated_at = excluded.updated_at",
+                (session_id, request, user_id, turns, blob, time.time()),
+            )
+        return len(blob)
+
+    def load(self, session_id: str) -> Checkpoint | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT request, user_id, turns, state, updated_at FROM checkpoints WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        request, user_id, turns, blob, updated_at = row
+        return Checkpoint(session_id, request, user_id, turns, decode_state(blob), updated_at)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE session_id = ?", (session_id,))
+
+    def sessions(self, user_id: str | None = None) -> list[dict[str, Any]]:
+        """Unfinished sessions, newest first (without their state)."""
+        query = "SELECT session_id, request, user_id, turns, length(state), updated_at FROM checkpoints"
+        params: tuple = ()
+        if user_id is not None:
+            query, params = query + " WHERE user_id = ?", (user_id,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY updated_at DESC", params).fetchall()
+        keys = ("session_id", "request", "user_id", "turns", "bytes", "updated_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: dict[str, CheckpointStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_checkpoint_store(db_path: str | Path) -> CheckpointStore:
+    """Process-wide store per database file."""
+    path = str(db_path)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = CheckpointStore(path)
+        return _stores[path]
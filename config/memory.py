@@ -1,29 +1,118 @@
-"""Lightweight persistent memory — stores user preferences as JSON."""
+"""Lightweight persistent memory — per-user preferences in SQLite with a read-through cache.
+
+Each user's preferences live in their own namespace (one row per
+``(user_id, key)``), so saving a preference is a single-row upsert rather
+than a rewrite of every user's data. Writes are transactional and the
+database runs in WAL mode, so concurrent sessions and processes can save
+safely. Reads are served from an in-process cache after the first load,
+which keeps ``build_team()`` off the disk.
+"""
 
 import json
+import re
+import sqlite3
+import threading
+import time
 from pathlib import Path
 
 _MEMORY_DIR = Path(__file__).resolve().parent.parent / "memory"
-_MEMORY_FILE = _MEMORY_DIR / "preferences.json"
+_MEMORY_DB = _MEMORY_DIR / "preferences.sqlite"
+_LEGACY_FILE = _MEMORY_DIR / "preferences.json"
+_PREFERENCE_PATTERN = re.compile(r"SAVE_PREFERENCE:\s*(\{.*?\})", re.DOTALL)
+
+DEFAULT_USER = "default"
+
+
+class PreferenceStore:
+    """Per-user key/value preferences backed by SQLite.
+
+    Args:
+        db_path: SQLite file; created (with its directory) on first use.
+    """
+
+    def __init__(self, db_path: str | Path = _MEMORY_DB) -> None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS preferences ("
+            "user_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (user_id, key))"
+        )
+        self._lock = threading.Lock()
+        self._cache: dict[str, dict] = {}
+
+    def get(self, user_id: str = DEFAULT_USER) -> dict:
+        """Preferences for ``user_id`` (a copy); only the first call per user reads the database."""
+        with self._lock:
+            if user_id not in self._cache:
+                rows = self._conn.execute(
+                    "SELECT key, value FROM preferences WHERE user_id = ? ORDER BY rowid", (user_id,)
+                ).fetchall()
+                self._cache[user_id] = {key: json.loads(value) for key, value in rows}
+            return dict(self._cache[user_id])
+
+    def update(self, data: dict, user_id: str = DEFAULT_USER) -> None:
+        """Merge ``data`` into ``user_id``'s preferences in one transaction (only the given keys are written)."""
+        if not data:
+            return
+        now = time.time()
+        rows = [(user_id, key, json.dumps(value, ensure_ascii=False), now) for key, value in data.items()]
+        with self._lock:
+            with self._conn:  # BEGIN … COMMIT, rolled back on error
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT INTO preferences (user_id, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (user_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    rows,
+                )
+            if user_id in self._cache:
+                self._cache[user_id].update(data)
 
+    def invalidate(self, user_id: str | None = None) -> None:
+        """Forget cached preferences (all users when ``user_id`` is None), e.g. after another process wrote."""
+        with self._lock:
+            if user_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(user_id, None)
 
-def _ensure_dir() -> None:
-    _MEMORY_DIR.mkdir(parents=True, exist_ok=True)
+    def import_legacy(self, path: Path = _LEGACY_FILE, user_id: str = DEFAULT_USER) -> bool:
+        """One-time import of the old single-user ``preferences.json`` into ``user_id``'s namespace."""
+        if not path.exists() or self.get(user_id):
+            return False
+        self.update(json.loads(path.read_text(encoding="utf-8")), user_id)
+        return True
 
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
-def load_memory() -> dict:
-    """Load saved user preferences from disk. Returns empty dict if none exist."""
-    if _MEMORY_FILE.exists():
-        return json.loads(_MEMORY_FILE.read_text(encoding="utf-8"))
-    return {}
 
+_stores: dict[str, PreferenceStore] = {}
+_stores_lock = threading.Lock()
 
-def save_memory(data: dict) -> None:
-    """Persist user preferences to disk (merges with existing)."""
-    _ensure_dir()
-    existing = load_memory()
-    existing.update(data)
-    _MEMORY_FILE.write_text(json.dumps(existing, indent=2, ensure_ascii=False), encoding="utf-8")
+
+def get_preference_store(db_path: str | Path = "") -> PreferenceStore:
+    """Process-wide store per database file (``""`` → ``memory/preferences.sqlite``)."""
+    path = str(db_path or _MEMORY_DB)
+    with _stores_lock:
+        if path not in _stores:
+            store = PreferenceStore(path)
+            if path == str(_MEMORY_DB):
+                store.import_legacy()
+            _stores[path] = store
+        return _stores[path]
+
+
+def load_memory(user_id: str = DEFAULT_USER, db_path: str | Path = "") -> dict:
+    """Saved preferences for ``user_id``. Returns empty dict if none exist."""
+    return get_preference_store(db_path).get(user_id)
+
+
+def save_memory(data: dict, user_id: str = DEFAULT_USER, db_path: str | Path = "") -> None:
+    """Persist preferences for ``user_id`` (merges with existing)."""
+    get_preference_store(db_path).update(data, user_id)
 
 
 def format_memory_context(data: dict) -> str:
@@ -34,3 +123,19 @@ def format_memory_context(data: dict) -> str:
     for key, value in data.items():
         lines.append(f"- **{key}**: {value}")
     return "\n".join(lines)
+
+
+def extract_preferences(messages: list) -> dict:
+    """Scan agent messages for SAVE_PREFERENCE markers and extract them."""
+    preferences = {}
+    for msg in messages:
+        content = getattr(msg, "content", "") or ""
+        if not isinstance(content, str):
+            continue
+        for match in _PREFERENCE_PATTERN.finditer(content):
+            try:
+                prefs = json.loads(match.group(1))
+                preferences.update(prefs)
+            except json.JSONDecodeError:
+                pass
+    return preferences
@@ -1,17 +1,26 @@
 """Application settings — loads .env and exposes typed config + prompt loader."""
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
 import os
 
-# Load .env from project root
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
-load_dotenv(_PROJECT_ROOT / ".env")
-
 _PROMPTS_DIR = _PROJECT_ROOT / "prompts"
 
 
+@dataclass(frozen=True)
+class ModelConfig:
+    """One provider + model and the credentials to reach it."""
+
+    provider: str               # "groq" or "azure"
+    model_name: str
+    api_key: str = ""
+    azure_openai_endpoint: str = ""
+    azure_openai_api_version: str = ""
+    base_url: str = ""          # OpenAI-compatible endpoint in place of Groq's (a local stub, vLLM, …)
+
+
 @dataclass(frozen=True)
 class Settings:
     """Immutable application settings sourced from environment variables.
@@ -26,41 +35,134 @@ class Settings:
     api_key: str = ""           # Groq API key or Azure API key
     azure_openai_endpoint: str = ""
     azure_openai_api_version: str = ""
+    base_url: str = ""          # GROQ_BASE_URL: OpenAI-compatible endpoint in place of Groq's
+    tool_cache_db: str = ""     # SQLite file for the persistent tool cache ("" → in-memory only)
+    llm_cache_mode: str = ""    # "", "cache", "record" or "replay"
+    llm_cache_db: str = ""      # SQLite file for recorded completions
+    trace_file: str = ""        # JSONL file for agent / selector / tool spans ("" → tracing off)
+    context_token_budget: int = 6000  # planner transcript budget before older turns are condensed
+    tool_output_format: str = "pretty"  # "pretty", "json" (minified) or "table" (shared fields hoisted)
+    tool_top_k: int = 0         # keep only the best k results per tool call (0 → all)
+    memory_db: str = ""         # SQLite file for per-user preferences ("" → memory/preferences.sqlite)
+    specialist_reflection: bool = True  # extra LLM call per specialist to restate its tool results (off → ranked results as the reply)
+    inventory: str = ""         # "" → built-in mocks, "synthetic" → generated inventory, or a saved inventory directory
+    planner_fast_path: bool = True  # parse well-formed requests locally instead of the planner's first LLM call
+    prefetch: bool = True       # start likely tool calls in the background as soon as route and dates are known
+    checkpoint_db: str = ""     # SQLite file for per-turn session checkpoints ("" → off)
+    itinerary_renderer: str = "llm"  # "llm" (model writes it all), "hybrid" (model writes only the days) or "template"
+    llm_rpm: int = 0            # requests per minute per model, shared by every session in the process (0 → unlimited)
+    llm_tpm: int = 0            # prompt + completion tokens per minute per model (0 → unlimited)
+    llm_max_concurrency: int = 0  # ceiling of the adaptive in-flight cap per model (0 → uncapped)
+    llm_max_retries: int = 4    # retries with jittered backoff on 429 / 5xx / connection errors
+    # Per-agent overrides of provider / model as (agent, model) pairs — a tuple, so Settings stays hashable
+    agent_models: tuple[tuple[str, ModelConfig], ...] = ()
+
+    def model_config(self, *names: str) -> ModelConfig:
+        """Model for the first of ``names`` with an override (e.g. the agent, then its group), else the default."""
+        overrides = dict(self.agent_models)
+        for name in names:
+            if name in overrides:
+                return overrides[name]
+        return ModelConfig(
+            provider=self.provider,
+            model_name=self.model_name,
+            api_key=self.api_key,
+            azure_openai_endpoint=self.azure_openai_endpoint,
+            azure_openai_api_version=self.azure_openai_api_version,
+            base_url=self.base_url,
+        )
 
     @classmethod
     def from_env(cls) -> "Settings":
-        """Build settings from the current environment."""
+        """Build settings from the current environment (and the project's ``.env``)."""
+        load_env()
         provider = os.getenv("LLM_PROVIDER", "groq").lower()
+        renderer = os.getenv("ITINERARY_RENDERER", "llm").lower()
+        # The hybrid and template renderers read the raw tool results, so reflection defaults to off with them
+        reflection = os.getenv("SPECIALIST_REFLECTION", "true" if renderer == "llm" else "false")
+        shared = {
+            "tool_cache_db": os.getenv("TOOL_CACHE_DB", ""),
+            "llm_cache_mode": os.getenv("LLM_CACHE_MODE", "").lower(),
+            "llm_cache_db": os.getenv("LLM_CACHE_DB", str(_PROJECT_ROOT / ".cache" / "llm.sqlite")),
+            "trace_file": os.getenv("TRACE_FILE", ""),
+            "context_token_budget": int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000")),
+            "tool_output_format": os.getenv("TOOL_OUTPUT_FORMAT", "pretty").lower(),
+            "tool_top_k": int(os.getenv("TOOL_TOP_K", "0")),
+            "memory_db": os.getenv("MEMORY_DB", ""),
+            "specialist_reflection": reflection.lower() in ("1", "true", "yes"),
+            "inventory": os.getenv("INVENTORY", ""),
+            "planner_fast_path": os.getenv("PLANNER_FAST_PATH", "true").lower() in ("1", "true", "yes"),
+            "prefetch": os.getenv("PREFETCH", "true").lower() in ("1", "true", "yes"),
+            "checkpoint_db": os.getenv("CHECKPOINT_DB", ""),
+            "itinerary_renderer": renderer,
+            "llm_rpm": int(os.getenv("LLM_RPM", "0")),
+            "llm_tpm": int(os.getenv("LLM_TPM", "0")),
+            "llm_max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "0")),
+            "llm_max_retries": int(os.getenv("LLM_MAX_RETRIES", "4")),
+            "agent_models": _agent_models(os.getenv("AGENT_MODELS", ""), provider),
+        }
+        return cls(**asdict(_model_from_env(provider)), **shared)
 
-        if provider == "groq":
-            groq_key = os.getenv("GROQ_API_KEY", "")
-            if not groq_key:
-                raise EnvironmentError("Missing required env var: GROQ_API_KEY")
-            model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-            return cls(provider="groq", model_name=model, api_key=groq_key)
-
-        # Azure provider
-        def _require(key: str, *alternates: str) -> str:
-            value = os.getenv(key)
-            if value:
-                return value
-            for alt in alternates:
-                value = os.getenv(alt)
-                if value:
-                    return value
-            raise EnvironmentError(f"Missing required env var: {key}")
-
-        return cls(
-            provider="azure",
-            model_name=_require("AZURE_OPENAI_DEPLOYMENT", "AZURE_OPENAI_MODEL_NAME"),
-            api_key=os.getenv("AZURE_OPENAI_KEY", ""),
-            azure_openai_endpoint=_require("AZURE_OPENAI_ENDPOINT"),
-            azure_openai_api_version=_require("AZURE_OPENAI_API_VERSION"),
-        )
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load ``.env`` from the project root into the environment, once (on first use, not at import)."""
+    from dotenv import load_dotenv
+
+    load_dotenv(_PROJECT_ROOT / ".env")
+
+
+def _require(key: str, *alternates: str) -> str:
+    value = os.getenv(key)
+    if value:
+        return value
+    for alt in alternates:
+        value = os.getenv(alt)
+        if value:
+            return value
+    raise EnvironmentError(f"Missing required env var: {key}")
+
+
+def _model_from_env(provider: str, model_name: str = "") -> ModelConfig:
+    """Credentials for ``provider`` from the environment, serving ``model_name`` (default: the provider's model)."""
+    if provider == "groq":
+        groq_key = os.getenv("GROQ_API_KEY", "")
+        if not groq_key:
+            raise EnvironmentError("Missing required env var: GROQ_API_KEY")
+        model = model_name or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+        return ModelConfig(provider="groq", model_name=model, api_key=groq_key, base_url=os.getenv("GROQ_BASE_URL", ""))
+
+    # Azure provider
+    return ModelConfig(
+        provider="azure",
+        model_name=model_name or _require("AZURE_OPENAI_DEPLOYMENT", "AZURE_OPENAI_MODEL_NAME"),
+        api_key=os.getenv("AZURE_OPENAI_KEY", ""),
+        azure_openai_endpoint=_require("AZURE_OPENAI_ENDPOINT"),
+        azure_openai_api_version=_require("AZURE_OPENAI_API_VERSION"),
+    )
+
+
+def _agent_models(spec: str, default_provider: str) -> tuple[tuple[str, ModelConfig], ...]:
+    """Parse ``AGENT_MODELS`` — comma-separated ``agent=[provider:]model`` entries.
+
+    e.g. ``specialists=llama-3.1-8b-instant,selector=llama-3.1-8b-instant,itinerary_agent=azure:gpt-4.1``
+    """
+    models = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        agent, sep, target = (part.strip() for part in entry.partition("="))
+        if not sep or not agent or not target:
+            raise EnvironmentError(f"Invalid AGENT_MODELS entry {entry!r}; expected agent=[provider:]model")
+        prefix, sep, model = target.partition(":")
+        if sep and prefix.lower() in ("groq", "azure"):
+            models[agent] = _model_from_env(prefix.lower(), model.strip())
+        else:
+            models[agent] = _model_from_env(default_provider, target)
+    return tuple(models.items())
 
 
+@lru_cache(maxsize=None)
 def load_prompt(name: str) -> str:
-    """Read a prompt file from the prompts/ directory.
+    """Read a prompt file from the prompts/ directory (cached — every team reuses the first read).
 
     Args:
         name: filename without extension, e.g. ``"planner"`` → ``prompts/planner.md``
@@ -0,0 +1,4 @@
+from llm.cache import CachedChatCompletionClient, CacheMissError
+from llm.tokens import count_tokens
+
+__all__ = ["CachedChatCompletionClient", "CacheMissError", "count_tokens"]
@@ -0,0 +1,196 @@
+"""Disk-backed completion cache with record/replay modes for any ChatCompletionClient."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, ModelCapabilities, ModelInfo, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+CacheMode = Literal["cache", "record", "replay"]
+
+
+class CacheMissError(LookupError):
+    """Raised in ``replay`` mode when a request was never recorded."""
+
+
+class _CompletionStore:
+    """SQLite key → serialized ``CreateResult`` table."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, result TEXT NOT NULL)")
+
+    def get(self, key: str) -> CreateResult | None:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM completions WHERE key = ?", (key,)).fetchone()
+        return CreateResult.model_validate_json(row[0]) if row else None
+
+    def set(self, key: str, result: CreateResult) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, result) VALUES (?, ?)", (key, result.model_dump_json())
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedChatCompletionClient(ChatCompletionClient):
+    """Wrap a model client with a content-addressed completion store.
+
+    The key is a SHA-256 of the model name, messages, tool schemas, tool
+    choice, JSON mode and extra create args, so only byte-identical requests
+    share an entry.
+
+    Modes:
+        - ``cache``  — serve hits from the store, call the model on a miss and record it.
+        - ``record`` — always call the model and overwrite the stored result.
+        - ``replay`` — never call the model; a miss raises :class:`CacheMissError`.
+          Lets full team runs be replayed offline and deterministically.
+
+    Args:
+        client: the real provider client (still used for token counting / model info).
+        model: model or deployment name, part of every cache key.
+        db_path: SQLite file holding recorded completions.
+        mode: one of ``cache``, ``record`` or ``replay``.
+    """
+
+    def __init__(self, client: ChatCompletionClient, model: str, db_path: str, mode: CacheMode = "cache") -> None:
+        if mode not in ("cache", "record", "replay"):
+            raise ValueError(f"Unknown LLM cache mode: {mode!r}")
+        self._client = client
+        self._model = model
+        self._mode = mode
+        self._store = _CompletionStore(db_path)
+        self._stats = {"hits": 0, "misses": 0, "recorded": 0}
+
+    def _key(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        tool_choice: Tool | str,
+        json_output: Optional[bool | type[BaseModel]],
+        extra_create_args: Mapping[str, Any],
+    ) -> str:
+        if isinstance(json_output, type) and issubclass(json_output, BaseModel):
+            json_output_data: Any = json_output.model_json_schema()
+        else:
+            json_output_data = json_output
+        payload = {
+            "model": self._model,
+            "messages": [message.model_dump(mode="json") for message in messages],
+            "tools": [tool.schema if isinstance(tool, Tool) else tool for tool in tools],
+            "tool_choice": tool_choice.name if isinstance(tool_choice, Tool) else tool_choice,
+            "json_output": json_output_data,
+            "extra_create_args": extra_create_args,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _lookup(self, key: str) -> CreateResult | None:
+        if self._mode == "record":
+            return None
+        cached = self._store.get(key)
+        if cached is not None:
+            self._stats["hits"] += 1
+            return cached.model_copy(update={"cached": True})
+        self._stats["misses"] += 1
+        if self._mode == "replay":
+            raise CacheMissError(f"No recorded completion for request {key[:12]} (LLM cache mode is 'replay').")
+        return None
+
+    def _record(self, key: str, result: CreateResult) -> None:
+        self._store.set(key, result)
+        self._stats["recorded"] += 1
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        result = await self._client.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self._record(key, result)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+        cached = self._lookup(key)
+        if cached is not None:
+            if isinstance(cached.content, str):
+                yield cached.content
+            yield cached
+            return
+        async for chunk in self._client.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(chunk, CreateResult):
+                self._record(key, chunk)
+            yield chunk
+
+    def stats(self) -> dict[str, int]:
+        """Hit / miss / recorded counters since construction."""
+        return dict(self._stats)
+
+    async def close(self) -> None:
+        self._store.close()
+        await self._client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self._client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore[override]
+        return self._client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._client.model_info
@@ -0,0 +1,109 @@
+"""Deferred model client construction.
+
+Building a provider client imports its SDK and sets up an HTTP connection
+pool (TLS context included), which dominates ``build_team()`` on a cold
+process. ``LazyChatCompletionClient`` answers ``model_info`` from what the
+caller already knows and builds the real client on the first request, so
+teams whose agents never reach the model (fast path, replayed cache,
+short-lived workers that exit early) never pay for it.
+"""
+
+import threading
+from typing import Any, AsyncGenerator, Callable, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, ModelCapabilities, ModelInfo, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+
+class LazyChatCompletionClient(ChatCompletionClient):
+    """Build the wrapped client with ``factory`` on first use.
+
+    Args:
+        factory: returns the real client; called at most once.
+        model_info: served before (and instead of) asking the real client.
+    """
+
+    def __init__(self, factory: Callable[[], ChatCompletionClient], model_info: ModelInfo) -> None:
+        self._factory = factory
+        self._model_info = model_info
+        self._client: ChatCompletionClient | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._client is not None
+
+    def _get(self) -> ChatCompletionClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        return await self._get().create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self._get().create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._client.actual_usage() if self._client else RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def total_usage(self) -> RequestUsage:
+        return self._client.total_usage() if self._client else RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._get().count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._get().remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore[override]
+        return ModelCapabilities(
+            vision=self._model_info["vision"],
+            function_calling=self._model_info["function_calling"],
+            json_output=self._model_info["json_output"],
+        )
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._model_info
@@ -0,0 +1,385 @@
+"""Process-wide rate limiting, adaptive concurrency and retries for LLM calls.
+
+Every agent of every session (and every team in batch / server mode) that
+talks to the same model shares one ``RateLimiter``, so the provider sees a
+single well-behaved client:
+
+- token buckets on requests per minute and tokens per minute — a request
+  reserves its estimated prompt + completion tokens up front and the
+  difference is settled once the real usage is known;
+- an AIMD concurrency cap — grows by one slot per window of successful
+  calls, halves (at most once a second) when the provider throttles;
+- retries with full-jitter exponential backoff on 429, 5xx and connection
+  errors, honoring ``Retry-After``.
+
+State is guarded by thread locks and waiters are woken through their own
+event loop, so one limiter is safe to share across threads and loops.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, ModelCapabilities, ModelInfo, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from llm.tokens import count_message_tokens
+
+Outcome = Literal["ok", "throttled", "error"]
+
+
+def status_code(exc: BaseException) -> int | None:
+    """HTTP status carried by a provider error (``openai.APIStatusError`` and friends), if any."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    try:
+        import openai
+    except ImportError:
+        return isinstance(exc, (ConnectionError, TimeoutError))
+    return isinstance(exc, (openai.APIConnectionError, ConnectionError, TimeoutError))
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units a minute, holding at most one minute's worth.
+
+    Callers reserve what they need and sleep off any debt, so waiters are
+    served roughly in arrival order without a queue.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._level = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` units; returns the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self._rate)
+            self._updated = now
+            self._level -= amount
+            return 0.0 if self._level >= 0 else -self._level / self._rate
+
+    def settle(self, amount: float) -> None:
+        """Give back ``amount`` units (negative to take more than was reserved)."""
+        with self._lock:
+            self._level = min(self.capacity, self._level + amount)
+
+
+class AdaptiveConcurrency:
+    """AIMD cap on requests in flight.
+
+    Args:
+        max_limit: ceiling (and starting point) for the cap.
+        min_limit: floor the cap never drops below.
+        cooldown: seconds between two decreases, so one burst of 429s halves the cap once.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, cooldown: float = 1.0) -> None:
+        self.limit = float(max_limit)
+        self._max = float(max_limit)
+        self._min = float(min_limit)
+        self._cooldown = cooldown
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        while True:
+            with self._lock:
+                if self._in_flight < int(self.limit):
+                    self._in_flight += 1
+                    return
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    self._wake()  # pass on a wake-up this waiter may have consumed
+                raise
+
+    def release(self, outcome: Outcome) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if outcome == "throttled":
+                if now - self._last_decrease >= self._cooldown:
+                    self.limit = max(self._min, self.limit / 2)
+                    self._last_decrease = now
+            elif outcome == "ok":
+                self.limit = min(self._max, self.limit + 1 / self.limit)  # ≈ +1 per window of `limit` successes
+            self._wake()
+
+    def _wake(self) -> None:
+        """Wake as many waiters as there are free slots (caller holds the lock)."""
+        free = int(self.limit) - self._in_flight
+        while free > 0 and self._waiters:
+            loop, future = self._waiters.popleft()
+            if future.done():
+                continue
+            loop.call_soon_threadsafe(_resolve, future)
+            free -= 1
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimiter:
+    """Shared limits for one model endpoint.
+
+    Args:
+        rpm: requests per minute (0 = unlimited).
+        tpm: prompt + completion tokens per minute (0 = unlimited).
+        max_concurrency: ceiling of the AIMD in-flight cap (0 = uncapped).
+        max_retries: retries after a 429, 5xx or connection error.
+        base_delay: first backoff step in seconds (doubles per retry, full jitter).
+        max_delay: longest backoff between two attempts.
+        completion_tokens: completion size reserved up front, before the real usage is known.
+    """
+
+    def __init__(
+        self, rpm: int = 0, tpm: int = 0, max_concurrency: int = 0, max_retries: int = 4,
+        base_delay: float = 0.5, max_delay: float = 30.0, completion_tokens: int = 256,
+    ) -> None:
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.concurrency = AdaptiveConcurrency(max_concurrency) if max_concurrency else None
+        self.max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._completion_tokens = completion_tokens
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "throttled": 0, "server_errors": 0, "failures": 0, "wait_seconds": 0.0}
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    async def acquire(self, prompt_tokens: int) -> int:
+        """Wait for a request slot and token budget; returns the tokens reserved.
+
+        A caller cancelled while waiting gives its reservations back.
+        """
+        reserved = prompt_tokens + self._completion_tokens
+        wait = max(
+            self.requests.reserve(1) if self.requests else 0.0,
+            self.tokens.reserve(reserved) if self.tokens else 0.0,
+        )
+        started = time.monotonic()
+        try:
+            if wait:
+                await asyncio.sleep(wait)
+            if self.concurrency:
+                await self.concurrency.acquire()
+        except asyncio.CancelledError:
+            if self.requests:
+                self.requests.settle(1)
+            if self.tokens:
+                self.tokens.settle(reserved)
+            raise
+        self._count("requests")
+        self._count("wait_seconds", time.monotonic() - started)
+        return reserved
+
+    def release(self, reserved: int, used: int, outcome: Outcome) -> None:
+        """Return the concurrency slot and settle the token reservation against ``used``."""
+        if self.tokens:
+            self.tokens.settle(reserved - used)
+        if self.concurrency:
+            self.concurrency.release(outcome)
+
+    def classify(self, exc: BaseException) -> Outcome | None:
+        """``throttled`` / ``error`` for retryable failures, None for ones retrying cannot fix."""
+        status = status_code(exc)
+        if status == 429:
+            self._count("throttled")
+            return "throttled"
+        if (status is not None and status >= 500) or (status is None and _is_connection_error(exc)):
+            self._count("server_errors")
+            return "error"
+        return None
+
+    def record_failure(self) -> None:
+        """A call failed for good (not retryable, or out of retries)."""
+        self._count("failures")
+
+    def backoff(self, attempt: int, exc: BaseException) -> float:
+        """Seconds to sleep before retry ``attempt`` (0-based): full jitter, at least ``Retry-After``."""
+        self._count("retries")
+        delay = random.uniform(0, min(self._max_delay, self._base_delay * 2 ** attempt))
+        return max(delay, min(self._max_delay, _retry_after(exc) or 0.0))
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        if self.concurrency:
+            stats["concurrency_limit"] = round(self.concurrency.limit, 2)
+        return stats
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, **limits: Any) -> RateLimiter:
+    """Process-wide limiter for ``key`` (e.g. provider + model); ``limits`` apply on first use."""
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(**limits)
+        return _limiters[key]
+
+
+class RateLimitedChatCompletionClient(ChatCompletionClient):
+    """Wrap a model client so every call goes through a shared ``RateLimiter``.
+
+    Streaming calls are retried only until their first chunk has been
+    yielded; after that a failure is raised to the caller.
+
+    Args:
+        client: the provider client (build it with its own retries off).
+        limiter: limits shared with every other client of the same model.
+    """
+
+    def __init__(self, client: ChatCompletionClient, limiter: RateLimiter) -> None:
+        self._client = client
+        self._limiter = limiter
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        prompt_tokens = count_message_tokens(messages)
+        attempt = 0
+        while True:
+            reserved = await self._limiter.acquire(prompt_tokens)
+            try:
+                result = await self._client.create(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                )
+            except Exception as exc:
+                outcome = self._limiter.classify(exc)
+                self._limiter.release(reserved, 0, outcome or "error")
+                if outcome is None or attempt >= self._limiter.max_retries:
+                    self._limiter.record_failure()
+                    raise
+                await asyncio.sleep(self._limiter.backoff(attempt, exc))
+                attempt += 1
+                continue
+            except BaseException:  # cancelled mid-call: free the slot and the tokens
+                self._limiter.release(reserved, 0, "error")
+                raise
+            self._limiter.release(reserved, _used_tokens(result, prompt_tokens), "ok")
+            return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        prompt_tokens = count_message_tokens(messages)
+        attempt = 0
+        while True:
+            reserved = await self._limiter.acquire(prompt_tokens)
+            started = False
+            used = 0
+            outcome: Outcome = "ok"
+            try:
+                async for chunk in self._client.create_stream(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    started = True
+                    if isinstance(chunk, CreateResult):
+                        used = _used_tokens(chunk, prompt_tokens)
+                    yield chunk
+            except Exception as exc:
+                failure = exc
+                retryable = self._limiter.classify(exc)
+                outcome = retryable or "error"
+                if started or retryable is None or attempt >= self._limiter.max_retries:
+                    self._limiter.record_failure()
+                    raise
+            finally:
+                # Also runs when the consumer stops early, so the slot is never leaked
+                self._limiter.release(reserved, used, outcome)
+            if outcome == "ok":
+                return
+            await asyncio.sleep(self._limiter.backoff(attempt, failure))
+            attempt += 1
+
+    def stats(self) -> dict[str, float]:
+        return self._limiter.stats()
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self._client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore[override]
+        return self._client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._client.model_info
+
+
+def _used_tokens(result: CreateResult, prompt_estimate: int) -> int:
+    """Tokens the call actually consumed, falling back to the estimate when the provider reports none."""
+    return (result.usage.prompt_tokens or prompt_estimate) + result.usage.completion_tokens
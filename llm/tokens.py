@@ -0,0 +1,36 @@
+"""Token counting with tiktoken, degrading to a character estimate when unavailable."""
+
+import functools
+import json
+from typing import Sequence
+
+from autogen_core.models import LLMMessage
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    """Load the tokenizer once; ``None`` when tiktoken or its BPE file is unavailable (e.g. offline)."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text`` (cl100k_base, or ~4 characters per token as a fallback)."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: Sequence[LLMMessage]) -> int:
+    """Estimated prompt tokens of ``messages`` (text content, or the JSON of tool calls / results)."""
+    return sum(
+        count_tokens(m.content if isinstance(m.content, str) else json.dumps(m.model_dump(mode="json")["content"]))
+        for m in messages
+    )
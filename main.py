@@ -1,44 +1,75 @@
-"""Travel Planner Assistant — AutoGen 0.4+ multi-agent entry point."""
+"""Travel Planner Assistant — AutoGen 0.4+ multi-agent entry point.
 
+AutoGen and the provider SDKs are imported inside the mode that needs them,
+so ``--help`` and argument errors return immediately and each mode only
+loads its own dependencies.
+"""
+
+import argparse
 import asyncio
-import json
-import re
+import uuid
 
-from autogen_agentchat.ui import Console
-from agents.team import build_team
-from config.memory import load_memory, save_memory
+from config.checkpoints import CheckpointStore, get_checkpoint_store
+from config.memory import DEFAULT_USER, extract_preferences, load_memory, save_memory
+from config.settings import Settings
 
 
-def _extract_preferences(messages: list) -> dict:
-    """Scan agent messages for SAVE_PREFERENCE markers and extract them."""
-    preferences = {}
-    pattern = re.compile(r"SAVE_PREFERENCE:\s*(\{.*?\})", re.DOTALL)
-    for msg in messages:
-        content = getattr(msg, "content", "") or ""
-        if not isinstance(content, str):
-            continue
-        for match in pattern.finditer(content):
-            try:
-                prefs = json.loads(match.group(1))
-                preferences.update(prefs)
-            except json.JSONDecodeError:
-                pass
-    return preferences
+async def _plan(team, settings: Settings, user_id: str, store: CheckpointStore | None, task: str | None, session_id: str) -> None:
+    """Run one conversation (``task=None`` resumes ``session_id``), then save preferences and reset the team."""
+    from autogen_agentchat.ui import Console
+
+    from agents.checkpoint import run_checkpointed
+
+    if store is None:
+        result = await Console(team.run_stream(task=task))
+    else:
+        result = await Console(run_checkpointed(team, store, session_id, task=task, user_id=user_id))
+
+    # Extract and persist any preferences the planner flagged
+    new_prefs = extract_preferences(result.messages)
+    if new_prefs:
+        save_memory(new_prefs, user_id, settings.memory_db)
+        print(f"\n📝 Saved preferences: {new_prefs}")
+
+    # Reset the team for a fresh conversation
+    await team.reset()
 
 
-async def main() -> None:
-    """Run the travel planner interactively."""
+async def main(user_id: str = DEFAULT_USER, resume: str = "") -> None:
+    """Run the travel planner interactively for ``user_id``, first finishing session ``resume`` if given."""
     print("\n✈️  Travel Planner Assistant")
     print("=" * 40)
 
-    memory = load_memory()
+    settings = Settings.from_env()
+    store = get_checkpoint_store(settings.checkpoint_db) if settings.checkpoint_db else None
+    checkpoint = None
+    if resume:
+        checkpoint = store.load(resume) if store else None
+        if checkpoint is None:
+            print(f"No checkpoint for session {resume} (is CHECKPOINT_DB set?)")
+            return
+        user_id = checkpoint.user_id
+    elif store:
+        unfinished = store.sessions(user_id)[:3]
+        if unfinished:
+            print("⏸️  Unfinished sessions (resume with --resume <session>):")
+            for session in unfinished:
+                print(f"   {session['session_id']}  {session['turns']} turn(s)  {session['request'][:60]}")
+
+    memory = load_memory(user_id, settings.memory_db)
     if memory:
         print(f"📝 Remembered preferences: {', '.join(f'{k}={v}' for k, v in memory.items())}")
 
     print("Describe your trip and I'll plan it for you!")
     print("Type 'quit' or 'exit' to stop.\n")
 
-    team = build_team()
+    from agents.team import build_team
+
+    team = build_team(settings=settings, user_id=user_id)
+
+    if checkpoint:
+        print(f"Resuming after turn {checkpoint.turns}: {checkpoint.request}\n")
+        await _plan(team, settings, user_id, store, None, checkpoint.session_id)
 
     while True:
         try:
@@ -53,17 +84,41 @@ async def main() -> None:
             print("Goodbye! Happy travels! 🌍")
             break
 
-        result = await Console(team.run_stream(task=user_input))
-
-        # Extract and persist any preferences the planner flagged
-        new_prefs = _extract_preferences(result.messages)
-        if new_prefs:
-            save_memory(new_prefs)
-            print(f"\n📝 Saved preferences: {new_prefs}")
-
-        # Reset the team for a fresh conversation
-        await team.reset()
+        await _plan(team, settings, user_id, store, user_input, uuid.uuid4().hex)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Travel Planner Assistant")
+    parser.add_argument("--user", default=DEFAULT_USER, help="whose preferences to load and save")
+    parser.add_argument("--resume", metavar="SESSION", default="", help="finish a checkpointed session first (needs CHECKPOINT_DB)")
+    parser.add_argument("--batch", metavar="INPUT.jsonl", help="plan trips from a JSONL file instead of the terminal")
+    parser.add_argument("--output", default="output/itineraries.jsonl", help="where batch results are appended")
+    parser.add_argument("--concurrency", type=int, default=4, help="number of teams planning in parallel")
+    parser.add_argument("--serve", action="store_true", help="run the HTTP/SSE server instead of the terminal loop")
+    parser.add_argument("--host", default="127.0.0.1", help="server bind address")
+    parser.add_argument("--port", type=int, default=8000, help="server port")
+    parser.add_argument("--pool", type=int, default=4, help="prebuilt teams kept warm by the server")
+    parser.add_argument("--max-sessions", type=int, default=64, help="concurrent server sessions before 503s")
+    args = parser.parse_args()
+
+    if args.serve:
+        from server import serve
+
+        try:
+            asyncio.run(serve(args.host, args.port, args.pool, args.max_sessions))
+        except KeyboardInterrupt:
+            pass
+    elif args.batch:
+        from agents.fast_path import fast_path_metrics
+        from batch import run_batch
+        from tools.cache import get_tool_cache
+
+        count = asyncio.run(run_batch(args.batch, args.output, args.concurrency))
+        print(f"Processed {count} request(s) → {args.output}")
+        print(f"Fast path: {fast_path_metrics()['fraction']:.0%} of requests skipped the planner's parsing call")
+        for tool, counters in get_tool_cache(Settings.from_env().tool_cache_db).stats().items():
+            if counters["prefetched"]:
+                print(f"Prefetch {tool}: {counters['prefetch_hits']}/{counters['prefetched']} used "
+                      f"({counters['prefetch_hit_rate']:.0%}), {counters['prefetch_discarded']} discarded")
+    else:
+        asyncio.run(main(args.user, args.resume))
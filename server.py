@@ -0,0 +1,503 @@
+"""Async HTTP server mode — plan trips over HTTP with Server-Sent Events.
+
+Standard library only (``asyncio.start_server``), so it runs wherever the
+planner does and can sit behind any HTTP load balancer::
+
+    python main.py --serve --host 0.0.0.0 --port 8000 --pool 8
+
+Endpoints::
+
+    POST   /sessions               {"request": "...", "user": "alice"} → 201 {"session_id", "events", "answer"}
+    GET    /sessions/{id}/events   text/event-stream (resumes after Last-Event-ID)
+    POST   /sessions/{id}/answer   {"answer": "..."} — reply to the planner's clarifying question
+    POST   /sessions/{id}/resume   continue a checkpointed session (after a crash, or from another worker)
+    DELETE /sessions/{id}          cancel a running session
+    GET    /healthz                {"status": "ok", "sessions": …, "pool": …}
+
+Event types: ``message`` (every agent message), ``token`` (itinerary text
+as it is generated), ``event`` (tool calls and other agent events),
+``question`` (the planner is waiting for an answer), ``done`` (stop reason
+and the final itinerary) and ``error``.
+
+Every session runs on its own team. Teams are prebuilt and kept warm in a
+``TeamPool``: a finished session's team is reset and handed to the next
+session instead of calling ``build_team()`` again. When a session saves new
+preferences, the traveler's teams built before that (idle or still running)
+are closed instead of reused.
+
+With ``CHECKPOINT_DB`` set, every session is checkpointed after each turn
+(agents/checkpoint.py). Workers sharing the database can resume each
+other's interrupted sessions under the same session id.
+"""
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseChatMessage, ModelClientStreamingChunkEvent, UserInputRequestedEvent
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient
+
+from agents.checkpoint import run_checkpointed
+from agents.team import build_team, close_team
+from batch import DEFAULT_ANSWER, itinerary_text
+from config.checkpoints import get_checkpoint_store
+from config.memory import DEFAULT_USER, extract_preferences, save_memory
+from config.settings import Settings
+from telemetry.tracing import Tracer, get_exporter
+from tools.inventory import load_inventory
+
+MAX_BODY_BYTES = 64 * 1024
+HEARTBEAT_SECONDS = 15.0  # SSE comment lines keep idle connections open through proxies
+_SESSION_PATH = re.compile(r"^/sessions/([0-9a-f]{32})(/events|/answer|/resume)?$")
+_REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class HttpUser:
+    """Answers the ``user`` agent's questions with replies posted over HTTP (``input_func=HttpUser(...).ask``).
+
+    Args:
+        timeout: seconds to wait for an answer before the planner is told to
+            proceed with reasonable assumptions.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.session: "Session | None" = None
+        self.questions = 0
+        self._answer: asyncio.Future[str] | None = None
+
+    async def ask(self, prompt: str, cancellation_token: CancellationToken | None = None) -> str:
+        self.questions += 1
+        self._answer = asyncio.get_running_loop().create_future()
+        if cancellation_token is not None:
+            cancellation_token.link_future(self._answer)
+        if self.session:
+            self.session.publish("question", {"prompt": prompt})
+        try:
+            return await asyncio.wait_for(self._answer, self.timeout)
+        except asyncio.TimeoutError:
+            return DEFAULT_ANSWER
+        finally:
+            self._answer = None
+
+    def answer(self, text: str) -> bool:
+        """Deliver ``text`` to the waiting question; False if nothing is waiting."""
+        if self._answer is None or self._answer.done():
+            return False
+        self._answer.set_result(text)
+        return True
+
+    def cancel(self) -> None:
+        """Abandon a pending question (the session was cancelled)."""
+        if self._answer is not None and not self._answer.done():
+            self._answer.cancel()
+
+
+@dataclass
+class PooledTeam:
+    team: Any
+    user: HttpUser
+    user_id: str
+    generation: int = 0  # the user's preference generation the planner prompt was built with
+
+
+class TeamPool:
+    """Prebuilt teams kept warm per traveler, so sessions skip ``build_team()``.
+
+    Preferences are part of the planner's system prompt, so teams are pooled
+    per ``user_id``; ``size`` caps the idle teams kept across all users.
+    ``invalidate`` starts a new preference generation for a user, and teams
+    built in an older one are closed when released instead of kept.
+
+    Args:
+        settings: configuration every team is built with.
+        size: idle teams to keep (and to prebuild for the default user).
+        answer_timeout: seconds a clarifying question waits for an HTTP answer.
+        model_client: optional client shared by every team (benchmarks inject a fake).
+    """
+
+    def __init__(
+        self, settings: Settings, size: int = 4, answer_timeout: float = 300.0,
+        model_client: ChatCompletionClient | None = None,
+    ) -> None:
+        self._settings = settings
+        self._size = size
+        self._answer_timeout = answer_timeout
+        self._model_client = model_client
+        self._exporter = get_exporter(settings.trace_file) if settings.trace_file else None
+        self._idle: dict[str, list[PooledTeam]] = {}
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self, user_id: str) -> PooledTeam:
+        user = HttpUser(self._answer_timeout)
+        tracer = Tracer(self._exporter) if self._exporter else None
+        team = build_team(
+            input_func=user.ask, settings=self._settings, model_client=self._model_client,
+            tracer=tracer, user_id=user_id, stream=True,
+        )
+        return PooledTeam(team, user, user_id, self._generations.get(user_id, 0))
+
+    def warm(self, user_id: str = DEFAULT_USER) -> None:
+        """Prebuild idle teams for ``user_id`` up to the pool size."""
+        while self.idle() < self._size:
+            self._idle.setdefault(user_id, []).append(self._build(user_id))
+
+    def idle(self) -> int:
+        return sum(len(teams) for teams in self._idle.values())
+
+    def acquire(self, user_id: str = DEFAULT_USER) -> PooledTeam:
+        teams = self._idle.get(user_id)
+        if teams:
+            self.hits += 1
+            return teams.pop()
+        self.misses += 1
+        return self._build(user_id)
+
+    async def release(self, entry: PooledTeam, reusable: bool = True) -> None:
+        """Reset ``entry`` and keep it warm; close it instead if the pool is full, the run did
+        not finish cleanly or the user's preferences changed since it was built."""
+        entry.user.session = None
+        if reusable and self._current(entry) and self.idle() < self._size:
+            await entry.team.reset()
+            # Other sessions may have filled the pool or saved preferences during the reset
+            if self._current(entry) and self.idle() < self._size:
+                self._idle.setdefault(entry.user_id, []).append(entry)
+                return
+        await close_team(entry.team)
+
+    def _current(self, entry: PooledTeam) -> bool:
+        return entry.generation == self._generations.get(entry.user_id, 0)
+
+    async def invalidate(self, user_id: str) -> None:
+        """Start a new preference generation for ``user_id`` and close the idle teams of the old one."""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        await asyncio.gather(*(close_team(entry.team) for entry in self._idle.pop(user_id, [])))
+
+    def stats(self) -> dict[str, int]:
+        return {"idle": self.idle(), "size": self._size, "hits": self.hits, "misses": self.misses}
+
+
+class Session:
+    """One planning conversation and the events it has produced so far."""
+
+    def __init__(self, request: str, entry: PooledTeam, session_id: str = "", resumed: bool = False) -> None:
+        self.id = session_id or uuid.uuid4().hex
+        self.request = request
+        self.resumed = resumed
+        self.entry = entry
+        self.events: list[tuple[str, dict]] = []
+        self.finished = False
+        self.cancellation = CancellationToken()
+        self.task: asyncio.Task | None = None
+        self._changed = asyncio.Event()
+
+    def publish(self, kind: str, data: dict) -> None:
+        self.events.append((kind, data))
+        self._notify()
+
+    def finish(self) -> None:
+        self.finished = True
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self, seen: int, timeout: float) -> bool:
+        """Wait until there are more than ``seen`` events or the session ends; False on timeout."""
+        changed = self._changed
+        if len(self.events) > seen or self.finished:
+            return True
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class PlannerServer:
+    """HTTP front end: sessions, SSE event streams and clarifying answers.
+
+    Args:
+        pool: where sessions get their teams.
+        settings: used to persist the preferences a session learns (and to find ``CHECKPOINT_DB``).
+        max_sessions: running sessions allowed at once; more get ``503``.
+        session_ttl: seconds a finished session stays readable.
+    """
+
+    def __init__(self, pool: TeamPool, settings: Settings, max_sessions: int = 64, session_ttl: float = 300.0) -> None:
+        self._pool = pool
+        self._settings = settings
+        self._max_sessions = max_sessions
+        self._session_ttl = session_ttl
+        self._sessions: dict[str, Session] = {}
+        self._checkpoints = get_checkpoint_store(settings.checkpoint_db) if settings.checkpoint_db else None
+
+    def running(self) -> int:
+        return sum(not session.finished for session in self._sessions.values())
+
+    # --- sessions ---
+
+    def start_session(self, request: str, user_id: str = DEFAULT_USER, session_id: str = "", resumed: bool = False) -> Session:
+        if self.running() >= self._max_sessions:
+            raise HttpError(503, "Too many concurrent sessions")
+        entry = self._pool.acquire(user_id)
+        session = Session(request, entry, session_id, resumed)
+        entry.user.session = session
+        self._sessions[session.id] = session
+        session.task = asyncio.create_task(self._run(session))
+        return session
+
+    def resume_session(self, session_id: str) -> Session:
+        """Continue ``session_id`` from its last checkpoint on this worker."""
+        if self._checkpoints is None:
+            raise HttpError(404, "Checkpoints are disabled (set CHECKPOINT_DB)")
+        current = self._sessions.get(session_id)
+        if current is not None and not current.finished:
+            raise HttpError(409, "The session is still running")
+        checkpoint = self._checkpoints.load(session_id)
+        if checkpoint is None:
+            raise HttpError(404, "No checkpoint for this session")
+        return self.start_session(checkpoint.request, checkpoint.user_id, session_id, resumed=True)
+
+    async def _run(self, session: Session) -> None:
+        entry = session.entry
+        clean = False
+        if self._checkpoints is None:
+            stream = entry.team.run_stream(task=session.request, cancellation_token=session.cancellation)
+        else:
+            stream = run_checkpointed(
+                entry.team, self._checkpoints, session.id, task=None if session.resumed else session.request,
+                user_id=entry.user_id, cancellation_token=session.cancellation,
+            )
+        try:
+            async for item in stream:
+                if isinstance(item, TaskResult):
+                    preferences = extract_preferences(item.messages)
+                    if preferences:
+                        save_memory(preferences, entry.user_id, self._settings.memory_db)
+                        await self._pool.invalidate(entry.user_id)
+                    session.publish("done", {
+                        "stop_reason": item.stop_reason,
+                        "itinerary": itinerary_text(item.messages),
+                        "preferences": preferences,
+                        "clarifying_questions": entry.user.questions,
+                    })
+                elif isinstance(item, ModelClientStreamingChunkEvent):
+                    session.publish("token", {"source": item.source, "content": item.content})
+                elif isinstance(item, BaseChatMessage):
+                    session.publish("message", {"source": item.source, "type": item.type, "content": item.to_text()})
+                elif not isinstance(item, UserInputRequestedEvent):  # HttpUser publishes the question itself
+                    session.publish("event", {"source": item.source, "type": item.type, "content": item.to_text()})
+            clean = True
+        except asyncio.CancelledError:
+            session.publish("error", {"error": "cancelled"})
+            if self._checkpoints and session.cancellation.is_cancelled():  # the traveler gave up on it
+                self._checkpoints.delete(session.id)
+        except Exception as exc:  # one failed session must not take the server down
+            session.publish("error", {"error": f"{type(exc).__name__}: {exc}"})
+        finally:
+            entry.user.questions = 0
+            session.finish()
+            # A team whose run was interrupted is not reused — its state is unknown — and one
+            # built before this traveler's preferences changed is dropped by the pool
+            await self._pool.release(entry, reusable=clean and not session.cancellation.is_cancelled())
+            asyncio.get_running_loop().call_later(self._session_ttl, self._forget, session)
+
+    def _forget(self, session: Session) -> None:
+        if self._sessions.get(session.id) is session:  # not since replaced by a resumed run
+            del self._sessions[session.id]
+
+    def _session(self, session_id: str) -> Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise HttpError(404, "Unknown session")
+        return session
+
+    # --- HTTP ---
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection (keep-alive until the client closes or an event stream ends)."""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    if method == "GET" and path.endswith("/events"):
+                        await self._stream_events(writer, self._session_id(path), headers)
+                        break
+                    status, payload = await self._dispatch(method, path, body)
+                except HttpError as exc:
+                    status, payload, keep_alive = exc.status, {"error": str(exc)}, False
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as exc:  # a failed team build or database error still gets an answer
+                    status, payload, keep_alive = 500, {"error": f"{type(exc).__name__}: {exc}"}, False
+                _write_json(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # client went away
+        finally:
+            writer.close()
+
+    def _session_id(self, path: str) -> str:
+        match = _SESSION_PATH.match(path)
+        if not match:
+            raise HttpError(404, "Not found")
+        return match.group(1)
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if path == "/healthz":
+            return 200, {"status": "ok", "sessions": self.running(), "pool": self._pool.stats()}
+        if path == "/sessions":
+            if method != "POST":
+                raise HttpError(405, "Use POST")
+            data = _json_body(body)
+            if not isinstance(data.get("request"), str) or not data["request"].strip():
+                raise HttpError(400, '"request" must be a non-empty string')
+            session = self.start_session(data["request"], str(data.get("user") or DEFAULT_USER))
+            base = f"/sessions/{session.id}"
+            return 201, {"session_id": session.id, "events": f"{base}/events", "answer": f"{base}/answer"}
+
+        match = _SESSION_PATH.match(path)
+        if not match:
+            raise HttpError(404, "Not found")
+        if match.group(2) == "/resume":
+            if method != "POST":
+                raise HttpError(405, "Use POST")
+            session = self.resume_session(match.group(1))
+            base = f"/sessions/{session.id}"
+            return 201, {"session_id": session.id, "events": f"{base}/events", "answer": f"{base}/answer"}
+        session, action = self._session(match.group(1)), match.group(2)
+        if action == "/answer":
+            if method != "POST":
+                raise HttpError(405, "Use POST")
+            answer = _json_body(body).get("answer")
+            if not isinstance(answer, str):
+                raise HttpError(400, '"answer" must be a string')
+            if not session.entry.user.answer(answer):
+                raise HttpError(409, "The planner is not waiting for an answer")
+            return 200, {"accepted": True}
+        if method == "DELETE":
+            cancelled = not session.finished
+            if cancelled:
+                session.cancellation.cancel()
+                session.entry.user.cancel()
+            return 200, {"cancelled": cancelled}
+        if method == "GET":
+            return 200, {"session_id": session.id, "finished": session.finished, "events": len(session.events)}
+        raise HttpError(405, "Unsupported method")
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, session_id: str, headers: dict[str, str]) -> None:
+        session = self._session(session_id)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"Connection: close\r\nX-Accel-Buffering: no\r\n\r\n"
+        )
+        try:
+            seen = int(headers.get("last-event-id", "-1")) + 1
+        except ValueError:
+            seen = 0
+        while True:
+            while seen < len(session.events):
+                kind, data = session.events[seen]
+                writer.write(f"id: {seen}\nevent: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode())
+                seen += 1
+            await writer.drain()
+            if session.finished and seen >= len(session.events):
+                return
+            if not await session.wait(seen, HEARTBEAT_SECONDS):
+                writer.write(b": keep-alive\n\n")
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], bytes] | None:
+    """Parse one HTTP/1.1 request; None when the client closed the connection."""
+    line = await _readline(reader)
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {}
+    while True:
+        header = await _readline(reader)
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+async def _readline(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readline()
+    except ValueError:  # the line is longer than the stream's limit
+        raise HttpError(431, "Request line or header too long")
+
+
+def _json_body(body: bytes) -> dict:
+    try:
+        data = json.loads(body or b"{}")
+    except json.JSONDecodeError:
+        raise HttpError(400, "Body must be JSON")
+    if not isinstance(data, dict):
+        raise HttpError(400, "Body must be a JSON object")
+    return data
+
+
+def _write_json(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n"
+    )
+    if status == 503:
+        head += "Retry-After: 1\r\n"
+    writer.write((head + "\r\n").encode() + body)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000, pool_size: int = 4, max_sessions: int = 64) -> None:
+    """Run the planner HTTP server until cancelled."""
+    settings = Settings.from_env()
+    pool = TeamPool(settings, size=pool_size)
+    started = time.perf_counter()
+    if settings.inventory:
+        await load_inventory(settings.inventory)
+    pool.warm()
+    app = PlannerServer(pool, settings, max_sessions=max_sessions)
+    server = await asyncio.start_server(app.handle, host, port)
+    print(f"Warmed {pool.idle()} team(s) in {time.perf_counter() - started:.2f}s")
+    print(f"Serving on http://{host}:{port} (POST /sessions, GET /sessions/<id>/events)")
+    async with server:
+        await server.serve_forever()
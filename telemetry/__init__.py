@@ -0,0 +1,12 @@
+from telemetry.instrument import TracedAgent, TracingChatCompletionClient, trace_tool
+from telemetry.tracing import JsonlSpanExporter, Span, Tracer, get_exporter
+
+__all__ = [
+    "JsonlSpanExporter",
+    "Span",
+    "Tracer",
+    "TracedAgent",
+    "TracingChatCompletionClient",
+    "get_exporter",
+    "trace_tool",
+]
@@ -0,0 +1,209 @@
+"""Wrappers that emit spans for agent turns, LLM calls and tool invocations."""
+
+import asyncio
+import functools
+import json
+from typing import Any, AsyncGenerator, Callable, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, ModelCapabilities, ModelInfo, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from llm.tokens import count_message_tokens, count_tokens
+from telemetry.tracing import Tracer
+
+
+class TracedAgent(BaseChatAgent):
+    """Delegate to ``agent`` and record each turn as an ``agent.turn`` span.
+
+    The span is current only while the wrapped agent works on a step, never
+    across ``yield``, so the consumer's own spans keep their parent.
+    """
+
+    def __init__(self, agent: ChatAgent, tracer: Tracer) -> None:
+        super().__init__(name=agent.name, description=agent.description)
+        self._agent = agent
+        self._tracer = tracer
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self._agent.produced_message_types
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response: Response | None = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        with self._tracer.span("agent.turn", activate=False, agent=self.name, input_messages=len(messages)) as span:
+            inner = 0
+            async for item in _steps(self._agent.on_messages_stream(messages, cancellation_token), span):
+                if isinstance(item, Response):
+                    span.set(response_type=type(item.chat_message).__name__, inner_messages=inner)
+                else:
+                    inner += 1
+                yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self._agent.on_reset(cancellation_token)
+
+    async def on_pause(self, cancellation_token: CancellationToken) -> None:
+        await self._agent.on_pause(cancellation_token)
+
+    async def on_resume(self, cancellation_token: CancellationToken) -> None:
+        await self._agent.on_resume(cancellation_token)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return await self._agent.save_state()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await self._agent.load_state(state)
+
+    async def close(self) -> None:
+        await self._agent.close()
+
+
+async def _steps(stream: AsyncGenerator[Any, None], span) -> AsyncGenerator[Any, None]:
+    """Items of ``stream``, producing each one with ``span`` current."""
+    try:
+        while True:
+            with Tracer.activate(span):
+                try:
+                    item = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+    finally:
+        await stream.aclose()
+
+
+def _estimate_completion_tokens(result: CreateResult) -> int:
+    if isinstance(result.content, str):
+        return count_tokens(result.content)
+    return count_tokens(json.dumps([call.model_dump() for call in result.content]))
+
+
+class TracingChatCompletionClient(ChatCompletionClient):
+    """Per-agent view of a shared client that records ``llm.create`` spans and token usage.
+
+    Token counts come from the provider's ``usage``; when a provider reports
+    none (e.g. some streaming modes) they are estimated with tiktoken.
+    """
+
+    def __init__(self, client: ChatCompletionClient, tracer: Tracer, agent: str) -> None:
+        self._client = client
+        self._tracer = tracer
+        self._agent = agent
+
+    def _account(self, span, messages: Sequence[LLMMessage], result: CreateResult) -> None:
+        prompt = result.usage.prompt_tokens or count_message_tokens(messages)
+        completion = result.usage.completion_tokens or _estimate_completion_tokens(result)
+        self._tracer.record_usage(self._agent, prompt, completion)
+        span.set(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            finish_reason=result.finish_reason,
+            cached=result.cached,
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        with self._tracer.span("llm.create", agent=self._agent, messages=len(messages), tools=len(tools)) as span:
+            result = await self._client.create(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            self._account(span, messages, result)
+            return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        with self._tracer.span(
+            "llm.create_stream", activate=False, agent=self._agent, messages=len(messages), tools=len(tools)
+        ) as span:
+            stream = self._client.create_stream(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            async for chunk in _steps(stream, span):
+                if isinstance(chunk, CreateResult):
+                    self._account(span, messages, chunk)
+                yield chunk
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self._client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore[override]
+        return self._client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._client.model_info
+
+
+def trace_tool(func: Callable[..., Any], tracer: Tracer, agent: str) -> Callable[..., Any]:
+    """Async twin of a tool that records a ``tool.<name>`` span around each call.
+
+    A sync tool body runs in a worker thread (as ``FunctionTool`` would do
+    for a sync function) but the span is opened on the event loop, so it
+    nests under the calling agent's turn. Async tools are awaited directly.
+    """
+    is_async = asyncio.iscoroutinefunction(func)
+
+    @functools.wraps(func)
+    async def traced(*args, **kwargs) -> str:
+        with tracer.span(f"tool.{func.__name__}", agent=agent, arguments=kwargs or list(args)) as span:
+            if is_async:
+                result = await func(*args, **kwargs)
+            else:
+                result = await asyncio.to_thread(func, *args, **kwargs)
+            span.set(result_chars=len(result))
+            return result
+
+    return traced
@@ -0,0 +1,152 @@
+"""Minimal span tracer with an OpenTelemetry-shaped JSONL exporter."""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("current_span", default=None)
+
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+@dataclass
+class Span:
+    """One timed operation. Field names follow the OTLP JSON span layout."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str
+    start_time_unix_nano: int
+    end_time_unix_nano: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "OK"
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "duration_ms": round((self.end_time_unix_nano - self.start_time_unix_nano) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class JsonlSpanExporter:
+    """Append finished spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+_exporters: dict[str, JsonlSpanExporter] = {}
+_exporters_lock = threading.Lock()
+
+
+def get_exporter(path: str) -> JsonlSpanExporter:
+    """Process-wide exporter per file, so concurrent teams never interleave partial lines."""
+    with _exporters_lock:
+        if path not in _exporters:
+            _exporters[path] = JsonlSpanExporter(path)
+        return _exporters[path]
+
+
+class Tracer:
+    """Creates spans for one team and aggregates token usage per agent.
+
+    Each team run is one trace; :meth:`new_trace` starts the next one (the
+    selector calls it when it sees a fresh conversation).
+    """
+
+    def __init__(self, exporter: JsonlSpanExporter | None = None, session: str = "") -> None:
+        self._exporter = exporter
+        self.session = session or _new_id(4)
+        self.trace_id = _new_id(16)
+        self._usage: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def new_trace(self) -> None:
+        self.trace_id = _new_id(16)
+
+    @contextlib.contextmanager
+    def span(self, name: str, activate: bool = True, **attributes: Any) -> Iterator[Span]:
+        """Time the block as ``name``, a child of the span current when it starts.
+
+        With ``activate`` the new span is current inside the block, so spans
+        opened there nest under it. An async generator that yields inside the
+        block must pass ``activate=False`` and wrap each step of its work in
+        :meth:`activate` instead: a context variable still set at ``yield``
+        leaks into whoever consumes the generator.
+        """
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else self.trace_id,
+            span_id=_new_id(8),
+            parent_span_id=parent.span_id if parent else "",
+            start_time_unix_nano=time.time_ns(),
+            attributes={"session": self.session, **attributes},
+        )
+        try:
+            if activate:
+                with self.activate(span):
+                    yield span
+            else:
+                yield span
+        except BaseException as exc:
+            span.status = "ERROR"
+            span.set(error=f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            span.end_time_unix_nano = time.time_ns()
+            if self._exporter:
+                self._exporter.export(span)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def activate(span: Span) -> Iterator[None]:
+        """Make ``span`` the parent of spans opened in the block (which must not ``yield``)."""
+        token = _current_span.set(span)
+        try:
+            yield
+        finally:
+            _current_span.reset(token)
+
+    def record_usage(self, agent: str, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            usage = self._usage.setdefault(agent, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            usage["calls"] += 1
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+
+    def token_usage(self) -> dict[str, dict[str, int]]:
+        """Cumulative LLM calls and prompt/completion tokens per agent."""
+        with self._lock:
+            return {agent: dict(usage) for agent, usage in self._usage.items()}
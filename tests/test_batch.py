@@ -0,0 +1,51 @@
+"""Batch input: lines that cannot be planned become error records and the batch goes on."""
+
+import asyncio
+import json
+
+import pytest
+
+from batch import InvalidRequest, _parse_request, _read_requests, run_batch
+
+VALID = {"id": "trip-1", "request": "New York to Tokyo, 2026-03-10 to 2026-03-15, $3000", "answers": ["2 travelers"]}
+
+
+@pytest.mark.parametrize("line, record_id, reason", [
+    ('{"id": "trip-2", "request": ', "line-3", "Invalid JSON"),
+    ('["New York to Tokyo"]', "line-3", "Expected a JSON object"),
+    ('{"id": "trip-2"}', "trip-2", '"request" must be a non-empty string'),
+    ('{"request": "   "}', "line-3", '"request" must be a non-empty string'),
+    ('{"id": "trip-2", "request": "Paris", "answers": "yes"}', "trip-2", '"answers" must be a list of strings'),
+])
+def test_invalid_line_is_rejected_with_its_id(line, record_id, reason):
+    with pytest.raises(InvalidRequest, match=reason) as caught:
+        _parse_request(line, 3)
+    assert (caught.value.record_id, caught.value.line_no) == (record_id, 3)
+
+
+def test_reader_yields_errors_in_place_of_invalid_lines(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text("\n".join([json.dumps(VALID), "not json", "", json.dumps({"request": "Boston to Paris"})]) + "\n")
+
+    async def read():
+        return [record async for record in _read_requests(path)]
+
+    valid, invalid, unnamed = asyncio.run(read())
+    assert valid == VALID
+    assert isinstance(invalid, InvalidRequest) and invalid.line_no == 2
+    assert unnamed["id"] == "line-4"  # blank lines still count toward line numbers
+
+
+def test_batch_writes_an_error_record_per_invalid_line(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "groq")
+    monkeypatch.setenv("GROQ_API_KEY", "unused")  # the provider client is built lazily and never called
+    monkeypatch.setenv("MEMORY_DB", str(tmp_path / "preferences.sqlite"))
+    monkeypatch.delenv("TRACE_FILE", raising=False)
+    source, results = tmp_path / "requests.jsonl", tmp_path / "out" / "results.jsonl"
+    source.write_text('{"id": "trip-1", "request": ""}\n{broken\n')
+
+    assert asyncio.run(run_batch(str(source), str(results), concurrency=2)) == 2
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert [(record["id"], record["line"]) for record in records] == [("trip-1", 1), ("line-2", 2)]
+    assert records[0]["error"] == '"request" must be a non-empty string'
+    assert records[1]["error"].startswith("Invalid JSON")
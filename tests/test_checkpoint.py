@@ -0,0 +1,121 @@
+"""Checkpointed runs: snapshots per turn, and a resume that does not repeat finished turns."""
+
+import asyncio
+
+import pytest
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseChatMessage, ToolCallRequestEvent
+from autogen_core.models import SystemMessage
+
+from agents.checkpoint import TURN_SOURCES, run_checkpointed
+from agents.names import ITINERARY_AGENT, PLANNER, SPECIALISTS, USER
+from agents.team import build_team, close_team
+from benchmarks.fake_client import ScriptedChatCompletionClient, TripScript
+from config.checkpoints import CheckpointStore
+from config.settings import Settings
+from server import PlannerServer, TeamPool
+
+TASK = "Plan a trip from New York to Tokyo, 2026-03-10 to 2026-03-15. Budget: $3000"
+
+
+def _settings(tmp_path) -> Settings:
+    return Settings(
+        provider="fake", model_name="scripted", memory_db=str(tmp_path / "preferences.sqlite"),
+        checkpoint_db=str(tmp_path / "checkpoints.sqlite"),
+    )
+
+
+class _WorkerDied(Exception):
+    pass
+
+
+class _DyingClient(ScriptedChatCompletionClient):
+    """Scripted model whose planner call fails, as if the worker died during the planner's summary."""
+
+    async def create(self, messages, **kwargs):
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        if system.startswith("You are the **Travel Planner**"):
+            raise _WorkerDied()
+        return await super().create(messages, **kwargs)
+
+
+def _team(tmp_path, client_type=ScriptedChatCompletionClient):
+    client = client_type(TripScript())
+    return build_team(input_func=lambda prompt: "Sounds good.", settings=_settings(tmp_path), model_client=client), client
+
+
+async def _crash_after_specialists(tmp_path, store: CheckpointStore, session_id: str) -> list[str]:
+    """Run ``session_id`` until the planner's summary fails; the turns completed before that."""
+    team, _ = _team(tmp_path, _DyingClient)
+    turns = []
+    with pytest.raises(RuntimeError, match="_WorkerDied"):
+        async for item in run_checkpointed(team, store, session_id, task=TASK):
+            if isinstance(item, BaseChatMessage) and item.source in TURN_SOURCES:
+                turns.append(item.source)
+    await close_team(team)
+    return turns
+
+
+def test_store_round_trip(tmp_path):
+    store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+    state = {"agent_states": {"planner": {"messages": ["Trip: New York → Tokyo"] * 50}}}
+    size = store.save("s1", state, "Plan a trip", "alice", turns=2)
+    assert 0 < size < len(str(state))
+
+    checkpoint = store.load("s1")
+    assert (checkpoint.request, checkpoint.user_id, checkpoint.turns, checkpoint.state) == ("Plan a trip", "alice", 2, state)
+    assert [s["session_id"] for s in store.sessions("alice")] == ["s1"]
+    assert store.sessions("bob") == []
+
+    store.delete("s1")
+    assert store.load("s1") is None
+    store.close()
+
+
+def test_resume_skips_completed_turns(tmp_path):
+    async def scenario():
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+
+        # First worker: dies in the planner's turn after the specialists reported
+        first_turns = await _crash_after_specialists(tmp_path, store, "s1")
+        assert first_turns == [USER, PLANNER, SPECIALISTS]
+        assert store.load("s1").turns == 3
+
+        # Second worker: a fresh team picks the session up from the checkpoint
+        team, client = _team(tmp_path)
+        resumed_turns, tool_calls, result = [], 0, None
+        async for item in run_checkpointed(team, store, "s1"):
+            if isinstance(item, TaskResult):
+                result = item
+            elif isinstance(item, ToolCallRequestEvent):
+                tool_calls += 1
+            elif isinstance(item, BaseChatMessage) and item.source in TURN_SOURCES:
+                resumed_turns.append(item.source)
+        await close_team(team)
+
+        assert resumed_turns == [PLANNER, ITINERARY_AGENT]
+        assert tool_calls == 0  # the specialists' searches are not run again
+        assert client.calls == 2  # only the planner's summary and the itinerary
+        assert "TERMINATE" in result.messages[-1].to_text()
+        assert store.load("s1") is None  # a finished run drops its checkpoint
+        store.close()
+
+    asyncio.run(scenario())
+
+
+def test_server_resumes_a_checkpointed_session(tmp_path):
+    async def scenario():
+        settings = _settings(tmp_path)
+        server = PlannerServer(TeamPool(settings, size=1, model_client=ScriptedChatCompletionClient(TripScript())), settings)
+        session_id = "0" * 32
+        await _crash_after_specialists(tmp_path, CheckpointStore(settings.checkpoint_db), session_id)
+
+        session = server.resume_session(session_id)
+        await session.task
+        kinds = [kind for kind, _ in session.events]
+        sources = [data["source"] for kind, data in session.events if kind == "message"]
+        assert sources == [PLANNER, ITINERARY_AGENT]
+        assert "event" not in kinds  # no tool calls replayed
+        assert kinds[-1] == "done" and "Tokyo" in session.events[-1][1]["itinerary"]
+
+    asyncio.run(scenario())
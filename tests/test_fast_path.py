@@ -0,0 +1,115 @@
+"""Planner fast-path parser: what it delegates, and what it leaves to the LLM planner."""
+
+import pytest
+
+from agents.fast_path import extract_trip_fields, parse_trip_request
+
+DATES = "2026-03-10 to 2026-03-15"
+
+
+def test_well_formed_request():
+    trip = parse_trip_request(f"Plan a trip from New York to Tokyo, {DATES}. Budget: $3000")
+    assert (trip.origin, trip.destination) == ("New York", "Tokyo")
+    assert (trip.depart, trip.return_date) == ("2026-03-10", "2026-03-15")
+    assert trip.budget_usd == 3000
+
+
+@pytest.mark.parametrize("text", [
+    f"Plan a trip from Boston To Paris, {DATES}, $3k",
+    f"Plan a trip From Boston TO Paris, {DATES}, $3k",
+    f"plan a trip from boston to paris, {DATES}, budget $3000",
+    f"boston to paris {DATES}, $3,000",
+])
+def test_route_in_any_case(text):
+    trip = parse_trip_request(text)
+    assert trip is not None
+    assert (trip.origin, trip.destination, trip.budget_usd) == ("Boston", "Paris", 3000)
+
+
+def test_lowercase_multiword_cities():
+    trip = parse_trip_request("plan a trip from new york to st. louis on 2026-03-10 returning 2026-03-15")
+    assert (trip.origin, trip.destination) == ("New York", "St. Louis")
+
+
+@pytest.mark.parametrize("text", [
+    f"Plan a trip from Boston to Paris, {DATES} for 2 people. Hotels under $150 per night.",
+    f"Plan a trip from Boston to Paris, {DATES}, $150/night",
+    f"Plan a trip from Boston to Paris, {DATES}, $100 per person",
+    f"Plan a trip from Boston to Paris, {DATES}, budget 300,000 yen",
+    f"Plan a trip from Boston to Paris, {DATES}, €3000",
+    f"Plan a trip from Boston to Paris, {DATES}, C$3000",
+    f"Plan a trip from Boston to Paris, {DATES}, between $2000 and $3000",
+])
+def test_ambiguous_budget_falls_back(text):
+    assert parse_trip_request(text) is None
+
+
+def test_budget_in_us_dollars():
+    assert parse_trip_request(f"Boston to Paris, {DATES}, US$3000").budget_usd == 3000
+
+
+def test_budget_label_skips_traveler_count():
+    trip = parse_trip_request(f"Plan a trip from Boston to Paris, {DATES}, budget for 2 people: $3000")
+    assert (trip.budget_usd, trip.travelers) == (3000, 2)
+
+
+def test_unparsed_constraints_reach_the_specialists():
+    text = f"Plan a trip from Boston to Paris, {DATES}, $3000, business class, hotel with a pool"
+    delegation = parse_trip_request(text).delegation()
+    assert "business class" in delegation and "hotel with a pool" in delegation
+    assert delegation.startswith("Trip: Boston → Paris, 2026-03-10 to 2026-03-15, budget $3,000.")
+
+
+@pytest.mark.parametrize("text", [
+    "Plan a trip to Paris next week",
+    f"Trip from the coast to the mountains {DATES}",
+    f"Plan a trip from Boston to Paris then Rome, {DATES}",
+    f"Plan a trip from Boston to Boston, {DATES}",
+])
+def test_incomplete_or_ambiguous_requests(text):
+    assert parse_trip_request(text) is None
+
+
+def test_home_city_fills_in_the_origin():
+    trip = parse_trip_request(f"fly me to lisbon, {DATES}", {"home_city": "Chicago"})
+    assert (trip.origin, trip.destination) == ("Chicago", "Lisbon")
+
+
+def test_extract_fields_skips_per_night_amounts():
+    fields = extract_trip_fields(f"Boston to Paris, {DATES} for 2 people. Hotels under $150 per night.")
+    assert "budget_usd" not in fields
+    assert fields["travelers"] == 2
+
+
+@pytest.mark.parametrize("text", [
+    f"New York to Tokyo to Osaka, {DATES}",
+    f"From New York to Los Angeles to Tokyo, {DATES}",
+    f"Boston to Paris and Rome, {DATES}",
+    f"new york to tokyo to osaka, {DATES}",
+    f"fly me to Paris and Rome, {DATES}",
+])
+def test_multi_city_chains_fall_back(text):
+    assert parse_trip_request(text, {"home_city": "Chicago"}) is None
+
+
+@pytest.mark.parametrize("text, travelers", [
+    (f"Boston to Paris, {DATES}, 2 adults and 1 child", 3),
+    (f"Boston to Paris, {DATES}, 2 adults, 2 kids and 1 infant", 5),
+    (f"Boston to Paris, {DATES} for 4 people: 2 adults and 2 children", 4),
+])
+def test_party_size(text, travelers):
+    assert parse_trip_request(text).travelers == travelers
+
+
+@pytest.mark.parametrize("text", [
+    f"Boston to Paris, {DATES}, I prefer Delta",
+    f"Boston to Paris, {DATES}, window seat please",
+    f"Boston to Paris, {DATES}. I always fly United.",
+])
+def test_stated_preferences_go_to_the_planner(text):
+    assert parse_trip_request(text) is None
+
+
+def test_home_city_with_a_lone_destination():
+    trip = parse_trip_request(f"I want to go to paris, {DATES}", {"home_city": "Chicago"})
+    assert (trip.origin, trip.destination) == ("Chicago", "Paris")
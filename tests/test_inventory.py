@@ -0,0 +1,98 @@
+"""Synthetic inventory: same result shapes as the mock backend, filters honored, saved copy identical."""
+
+import asyncio
+import json
+
+import pytest
+
+import tools.inventory as inventory_module
+from tools.flight_search import search_flight_dates, search_flights
+from tools.hotel_search import search_hotel_rates, search_hotels
+from tools.inventory import SyntheticInventory, load_inventory
+
+STAY = ("Tokyo", "2026-03-10", "2026-03-14")
+
+
+@pytest.fixture(scope="module")
+def inventory() -> SyntheticInventory:
+    return SyntheticInventory.generate(cities=60, routes_per_city=4, hotels_per_city=(8, 12), days=14, seed=3)
+
+
+def _shape(value):
+    """Keys and value types of a tool result, recursively (the values themselves differ by backend)."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_shape(value[0])] if value else []
+    return type(value).__name__
+
+
+def test_tools_return_the_mock_backend_shapes(inventory):
+    tools = inventory.tools()
+    cases = [
+        ("search_flights", search_flights, ("New York", "Tokyo", "2026-03-10")),
+        ("search_flight_dates", search_flight_dates, ("New York", "Tokyo", "2026-03-10", "", 2)),
+        ("search_hotels", search_hotels, STAY),
+        ("search_hotel_rates", search_hotel_rates, STAY),
+    ]
+    for name, mock, args in cases:
+        ours, theirs = json.loads(tools[name](*args)), json.loads(mock(*args))
+        assert ours and _shape(ours) == _shape(theirs), name
+
+
+def test_flights_are_the_cheapest_matches(inventory):
+    everything = inventory.flights("New York", "Tokyo", "2026-03-10", limit=0)
+    prices = [flight["price_usd"] for flight in everything]
+    assert prices == sorted(prices)
+    assert inventory.flights("new york", " Tokyo ", "2026-03-10", limit=3) == everything[:3]
+
+    cap = prices[len(prices) // 2]
+    assert inventory.flights("New York", "Tokyo", "2026-03-10", max_price=cap, limit=0) == [
+        flight for flight in everything if flight["price_usd"] <= cap
+    ]
+    airline = everything[0]["airline"]
+    assert all(f["airline"] == airline for f in inventory.flights("New York", "Tokyo", "2026-03-10", airline=airline.lower()))
+    assert inventory.flights("New York", "Atlantis", "2026-03-10") == []
+
+
+def test_hotels_are_the_best_rated_matches(inventory):
+    everything = inventory.hotels(*STAY, limit=0)
+    ratings = [hotel["rating"] for hotel in everything]
+    assert ratings == sorted(ratings, reverse=True)
+
+    pool = inventory.hotels(*STAY, min_rating=4.0, amenities="pool", limit=0)
+    assert pool == [h for h in everything if h["rating"] >= 4.0 and "Pool" in h["amenities"]]
+    assert inventory.hotels(*STAY, amenities="Helipad") == []
+    assert inventory.hotels("Tokyo", "2026-03-10", "2026-03-10") == []
+
+
+def test_saved_inventory_answers_identically(inventory, tmp_path):
+    inventory.save(tmp_path / "inventory")
+    mapped = SyntheticInventory.load(tmp_path / "inventory")
+    assert mapped.describe() == inventory.describe()
+    assert mapped.flights("New York", "Tokyo", "2026-03-10") == inventory.flights("New York", "Tokyo", "2026-03-10")
+    assert mapped.hotel_rates(*STAY) == inventory.hotel_rates(*STAY)
+
+
+def test_load_inventory_builds_off_the_event_loop(tmp_path, inventory, monkeypatch):
+    inventory.save(tmp_path / "inventory")
+    spec = str(tmp_path / "inventory")
+    monkeypatch.setattr(inventory_module, "_inventories", {})
+
+    async def scenario():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        loaded = await load_inventory(spec)
+        ticker.cancel()
+        return loaded, ticks
+
+    loaded, ticks = asyncio.run(scenario())
+    assert ticks > 0  # the loop kept running while the inventory was mapped
+    assert inventory_module.get_inventory(spec) is loaded
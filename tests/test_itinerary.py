@@ -0,0 +1,138 @@
+"""Template itinerary: trip collection from the specialists' report and the rendered totals."""
+
+import json
+
+from agents.itinerary import TripPlan, _pick_hotel, collect_trip, render_tail
+
+REQUEST = "Plan a trip from Boston to Paris, 2026-03-10 to 2026-03-13 for 3 people."
+
+
+def _flight(origin, destination, day, flight_no, price):
+    return {
+        "airline": "SkyWay Airlines", "flight_no": flight_no, "origin": origin, "destination": destination,
+        "date": day, "departure": "09:30", "duration": "7h 10m", "price_usd": price, "class": "Economy",
+    }
+
+
+HOTELS = [
+    {"name": "Grand Plaza Hotel", "city": "Paris", "check_in": "2026-03-10", "check_out": "2026-03-13",
+     "price_per_night_usd": 83, "rating": 4.6, "amenities": ["Free WiFi"]},
+    {"name": "Sakura Inn", "city": "Paris", "check_in": "2026-03-10", "check_out": "2026-03-13",
+     "price_per_night_usd": 97, "rating": 4.2, "amenities": ["Pool"]},
+]
+RATES = {
+    "city": "Paris", "nights": ["2026-03-10", "2026-03-11", "2026-03-12"],
+    "columns": ["name", "rating", "total_usd", "nightly_usd"],
+    "rows": [["Sakura Inn", 4.2, 304, [103, 106, 95]], ["The Metropolitan", 4.2, 423, [144, 144, 135]]],
+}
+WEATHER = [
+    {"city": "Paris", "date": f"2026-03-1{d}", "condition": "Rain", "temperature_celsius": 8} for d in range(4)
+]
+
+
+def _report(flights=(), hotels=(), weather=(), extra=None):
+    """The merged ``specialists`` message, one JSON tool result per agent (``extra`` appended to the flights)."""
+    sections = {
+        "flight_agent": json.dumps(flights) + (json.dumps(extra) if extra else ""),
+        "hotel_agent": json.dumps(hotels),
+        "weather_agent": json.dumps(weather),
+    }
+    return "\n\n".join(f"### {name}\n{body}" for name, body in sections.items())
+
+
+def test_pick_hotel_prices_nights_and_rooms():
+    plan = TripPlan(depart="2026-03-10", return_date="2026-03-13", travelers=3)
+    hotel = _pick_hotel(HOTELS, plan)
+    assert hotel["name"] == "Grand Plaza Hotel"
+    assert (hotel["nights"], hotel["rooms"], hotel["subtotal_usd"]) == (3, 2, 83 * 3 * 2)
+
+
+def test_pick_hotel_from_nightly_rates():
+    plan = TripPlan(depart="2026-03-10", return_date="2026-03-13", travelers=1)
+    records = [{"city": RATES["city"], "nights": RATES["nights"], **dict(zip(RATES["columns"], row))} for row in RATES["rows"]]
+    hotel = _pick_hotel(records, plan)
+    assert (hotel["check_in"], hotel["check_out"], hotel["nights"]) == ("2026-03-10", "2026-03-13", 3)
+    assert (hotel["rooms"], hotel["subtotal_usd"]) == (1, 304)
+
+
+def test_collect_trip_cheapest_flights_and_best_hotel():
+    flights = [
+        _flight("Boston", "Paris", "2026-03-10", "SK139", 271),
+        _flight("Boston", "Paris", "2026-03-10", "PA142", 305),
+        _flight("Paris", "Boston", "2026-03-13", "SK533", 377),
+    ]
+    plan = collect_trip(REQUEST, _report(flights, HOTELS, WEATHER))
+    assert (plan.origin, plan.destination, plan.travelers) == ("Boston", "Paris", 3)
+    assert [f["flight_no"] for f in plan.flights] == ["SK139", "SK533"]
+    assert plan.flights_usd == (271 + 377) * 3
+    assert plan.hotels_usd == 83 * 3 * 2
+    assert plan.total_usd == (271 + 377) * 3 + 83 * 3 * 2
+    assert plan.days == ["2026-03-10", "2026-03-11", "2026-03-12", "2026-03-13"]
+    assert len(plan.weather) == 4
+
+
+def test_collect_trip_reads_column_matrices():
+    plan = collect_trip("Boston to Paris", _report(hotels=RATES))
+    assert plan.hotels[0]["name"] == "Sakura Inn"
+    assert (plan.depart, plan.return_date) == ("2026-03-10", "2026-03-13")
+
+
+def test_collect_trip_uses_the_first_bundle():
+    bundle = {
+        "budget_usd": 5000, "travelers": 3,
+        "bundles": [{
+            "total_usd": 2442.0,
+            "flights": [
+                {"leg": "Boston → Paris", "date": "2026-03-10", "flight_no": "SK139", "price_usd": 271, "subtotal_usd": 813},
+                {"leg": "Paris → Boston", "date": "2026-03-13", "flight_no": "SK533", "price_usd": 377, "subtotal_usd": 1131},
+            ],
+            "hotels": [{"city": "Paris", "name": "Grand Plaza Hotel", "check_in": "2026-03-10", "check_out": "2026-03-13",
+                        "nights": 3, "price_per_night_usd": 83, "subtotal_usd": 498}],
+        }],
+    }
+    plan = collect_trip("Plan a trip to Paris", _report(extra=bundle))
+    assert (plan.origin, plan.destination, plan.budget_usd, plan.travelers) == ("Boston", "Paris", 5000, 3)
+    assert plan.total_usd == 2442.0
+    assert (plan.depart, plan.return_date) == ("2026-03-10", "2026-03-13")
+
+
+def test_per_night_amount_is_not_the_trip_budget():
+    text = "Plan a trip from Boston to Paris, 2026-03-10 to 2026-03-15 for 2 people. Hotels under $150 per night."
+    assert collect_trip(text, "").budget_usd is None
+    assert collect_trip("Boston to Paris, 2026-03-10 to 2026-03-15, $3000", "").budget_usd is None
+    assert collect_trip("Boston to Paris, 2026-03-10 to 2026-03-15. Budget: $3000", "").budget_usd == 3000
+
+
+def _plan(budget):
+    plan = TripPlan(
+        origin="Boston", destination="Paris", depart="2026-03-10", return_date="2026-03-13", travelers=3, budget_usd=budget,
+    )
+    plan.flights = [
+        {**_flight("Boston", "Paris", "2026-03-10", "SK139", 271), "subtotal_usd": 813},
+        {**_flight("Paris", "Boston", "2026-03-13", "SK533", 377), "subtotal_usd": 1131},
+    ]
+    plan.hotels = [_pick_hotel(HOTELS, plan)]
+    return plan
+
+
+def test_render_tail_within_budget():
+    tail = render_tail(_plan(3000))
+    assert "  • Flights: $1,944 (3 travelers)" in tail
+    assert "  • Hotels: $498 (3 nights × $83/night × 2 rooms)" in tail
+    assert "  • Total: $2,442" in tail
+    assert "  • Left for daily expenses: $558 ($139.50/day)" in tail
+    assert "Hotel prices assume 2 rooms for 3 travelers." in tail
+    assert tail.endswith("TERMINATE")
+
+
+def test_render_tail_over_budget():
+    tail = render_tail(_plan(2000))
+    assert "Flights and hotels exceed the $2,000 budget by $442." in tail
+    assert "Left for daily expenses" not in tail
+
+
+def test_render_tail_without_budget():
+    tail = render_tail(_plan(None))
+    assert "  • Total: $2,442" in tail
+    assert "budget" not in tail.split("📊")[0]
+    assert "Left for daily expenses" not in tail
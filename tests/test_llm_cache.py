@@ -0,0 +1,71 @@
+"""Completion cache: a recorded team run replays offline, and what a cache key depends on."""
+
+import asyncio
+
+import pytest
+from autogen_agentchat.base import TaskResult
+from autogen_core.models import SystemMessage, UserMessage
+
+from agents.team import build_team
+from benchmarks.fake_client import ScriptedChatCompletionClient, TripScript
+from config.settings import Settings
+from llm.cache import CacheMissError, CachedChatCompletionClient
+
+TASK = "Plan a trip from New York to Tokyo, 2026-03-10 to 2026-03-15. Budget: $3000"
+MESSAGES = [SystemMessage(content="You are a travel planner."), UserMessage(content="Trip to Tokyo", source="user")]
+TOOL = {"name": "search_flights", "description": "Search flights.", "parameters": {"type": "object", "properties": {}}}
+
+
+class _NoProvider(ScriptedChatCompletionClient):
+    """Stands in for an unreachable provider: any request that gets through fails the test."""
+
+    async def create(self, messages, **kwargs):
+        raise AssertionError("replay reached the provider")
+
+
+async def _plan(tmp_path, client) -> list[str]:
+    settings = Settings(provider="fake", model_name="scripted", memory_db=str(tmp_path / "preferences.sqlite"))
+    team = build_team(input_func=lambda prompt: "Sounds good.", settings=settings, model_client=client)
+    result = None
+    async for item in team.run_stream(task=TASK):
+        if isinstance(item, TaskResult):
+            result = item
+    return [f"{message.source}: {message.to_text()}" for message in result.messages]
+
+
+def test_recorded_run_replays_without_the_provider(tmp_path):
+    db = str(tmp_path / "llm.sqlite")
+
+    async def scenario():
+        recorder = CachedChatCompletionClient(ScriptedChatCompletionClient(TripScript()), "scripted", db, mode="record")
+        recorded = await _plan(tmp_path, recorder)
+        replayer = CachedChatCompletionClient(_NoProvider(), "scripted", db, mode="replay")
+        replayed = await _plan(tmp_path, replayer)
+        return recorder.stats(), replayer.stats(), recorded, replayed
+
+    recording, replay, recorded, replayed = asyncio.run(scenario())
+    assert recording["recorded"] > 0
+    assert replay == {"hits": recording["recorded"], "misses": 0, "recorded": 0}
+    assert replayed == recorded
+
+
+@pytest.mark.parametrize("change", [
+    {"messages": [*MESSAGES[:1], UserMessage(content="Trip to Osaka", source="user")]},
+    {"tools": []},
+    {"model": "another-model"},
+])
+def test_key_changes_with_messages_tools_and_model(tmp_path, change):
+    db = str(tmp_path / "llm.sqlite")
+
+    async def scenario():
+        recorder = CachedChatCompletionClient(ScriptedChatCompletionClient(TripScript()), "scripted", db, mode="record")
+        await recorder.create(MESSAGES, tools=[TOOL])
+
+        replayer = CachedChatCompletionClient(_NoProvider(), "scripted", db, mode="replay")
+        assert (await replayer.create(MESSAGES, tools=[TOOL])).cached
+
+        changed = CachedChatCompletionClient(_NoProvider(), change.get("model", "scripted"), db, mode="replay")
+        with pytest.raises(CacheMissError):
+            await changed.create(change.get("messages", MESSAGES), tools=change.get("tools", [TOOL]))
+
+    asyncio.run(scenario())
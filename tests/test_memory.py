@@ -0,0 +1,58 @@
+"""Preference store: each traveler's preferences stay in their own namespace."""
+
+import threading
+
+from autogen_agentchat.messages import TextMessage
+
+from config.memory import PreferenceStore, extract_preferences
+
+
+def test_preferences_stay_separate_per_user(tmp_path):
+    store = PreferenceStore(tmp_path / "preferences.sqlite")
+    store.update({"seat": "aisle", "budget": 3000}, "alice")
+    store.update({"seat": "window"}, "bob")
+    store.update({"budget": 2500}, "alice")
+
+    assert store.get("alice") == {"seat": "aisle", "budget": 2500}
+    assert store.get("bob") == {"seat": "window"}
+    assert store.get("carol") == {}
+    store.close()
+
+    reopened = PreferenceStore(tmp_path / "preferences.sqlite")  # the namespaces survive a new process
+    assert reopened.get("alice") == {"seat": "aisle", "budget": 2500}
+    assert reopened.get("bob") == {"seat": "window"}
+    reopened.close()
+
+
+def test_concurrent_saves_from_different_users_do_not_mix(tmp_path):
+    store = PreferenceStore(tmp_path / "preferences.sqlite")
+    users = [f"user-{i}" for i in range(8)]
+    threads = [
+        threading.Thread(target=lambda u=user: [store.update({f"key-{k}": u}, u) for k in range(10)])
+        for user in users
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store.invalidate()  # read back from SQLite, not the cache
+    for user in users:
+        assert store.get(user) == {f"key-{k}": user for k in range(10)}
+    store.close()
+
+
+def test_returned_preferences_are_a_copy(tmp_path):
+    store = PreferenceStore(tmp_path / "preferences.sqlite")
+    store.update({"seat": "aisle"}, "alice")
+    store.get("alice")["seat"] = "window"
+    assert store.get("alice") == {"seat": "aisle"}
+    store.close()
+
+
+def test_extract_preferences_merges_markers():
+    messages = [
+        TextMessage(content='Noted. SAVE_PREFERENCE: {"seat": "aisle"}', source="planner"),
+        TextMessage(content='SAVE_PREFERENCE: {"airline": "ANA"} and SAVE_PREFERENCE: {broken}', source="planner"),
+    ]
+    assert extract_preferences(messages) == {"seat": "aisle", "airline": "ANA"}
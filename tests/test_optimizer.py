@@ -0,0 +1,76 @@
+"""Trip optimizer: bundles fit the budget and match a brute-force search on small trips."""
+
+import asyncio
+import itertools
+import json
+import random
+
+import pytest
+
+from tools.flight_search import search_flights
+from tools.hotel_search import search_hotels
+from tools.optimizer import RATING_VALUE_USD, _Option, best_bundles, make_optimizer
+
+TRIP = {"origin": "New York", "destinations": "Tokyo, Kyoto", "dates": "2026-03-10,2026-03-13,2026-03-16", "travelers": 3}
+
+
+def _brute_force(travelers: int) -> list[tuple[float, float]]:
+    """``(score, total)`` of every flight + hotel combination of ``TRIP``, best score first."""
+    rooms = (travelers + 1) // 2
+    legs = [("New York", "Tokyo", "2026-03-10"), ("Tokyo", "Kyoto", "2026-03-13"), ("Kyoto", "New York", "2026-03-16")]
+    stays = [("Tokyo", "2026-03-10", "2026-03-13"), ("Kyoto", "2026-03-13", "2026-03-16")]
+    components = [
+        [(f["price_usd"] * travelers,) * 2 for f in json.loads(search_flights(*leg))] for leg in legs
+    ] + [
+        [(h["price_per_night_usd"] * 3 * rooms, h["price_per_night_usd"] * 3 * rooms - RATING_VALUE_USD * (h["rating"] - 3) * 3)
+         for h in json.loads(search_hotels(*stay))]
+        for stay in stays
+    ]
+    bundles = [(sum(score for _, score in combo), sum(cost for cost, _ in combo)) for combo in itertools.product(*components)]
+    return sorted(bundles)
+
+
+def _optimize(**kwargs) -> dict:
+    optimize_trip = make_optimizer(search_flights, search_hotels)
+    return json.loads(asyncio.run(optimize_trip(**{**TRIP, **kwargs})))
+
+
+@pytest.mark.parametrize("quantile", [0.1, 0.5, 1.0])
+def test_best_bundles_within_budget_match_brute_force(quantile):
+    every = _brute_force(TRIP["travelers"])
+    totals = sorted(total for _, total in every)
+    budget = totals[int(quantile * (len(totals) - 1))]
+    expected = [(round(score, 2), round(total, 2)) for score, total in every if total <= budget][:3]
+
+    report = _optimize(budget_usd=budget)
+    assert report["combinations"] == len(every)
+    assert [(b["score"], b["total_usd"]) for b in report["bundles"]] == pytest.approx(expected)
+    assert all(b["total_usd"] <= budget for b in report["bundles"])
+    assert [len(b["flights"]) for b in report["bundles"]] == [3] * len(expected)
+
+
+def test_budget_below_the_cheapest_bundle_reports_it():
+    cheapest = min(total for _, total in _brute_force(TRIP["travelers"]))
+    report = _optimize(budget_usd=cheapest - 1)
+    assert report["bundles"] == []
+    assert f"${cheapest:,.0f}" in report["note"]
+
+
+def test_branch_and_bound_matches_exhaustive_search():
+    rng = random.Random(7)
+    for _ in range(50):
+        components = [
+            [_Option(cost, cost - rng.randint(0, 80), {}) for cost in rng.sample(range(50, 500), rng.randint(1, 4))]
+            for _ in range(rng.randint(1, 4))
+        ]
+        for component in components:
+            component.sort(key=lambda option: option.score)
+        budget = rng.choice([0, rng.randint(100, 1500)])
+        feasible = sorted(
+            (sum(o.score for o in combo), sum(o.cost for o in combo))
+            for combo in itertools.product(*components)
+            if not budget or sum(o.cost for o in combo) <= budget
+        )
+        ranked, _ = best_bundles(components, budget, 3)
+        assert [score for score, _, _ in ranked] == [score for score, _ in feasible[:3]]
+        assert all(not budget or cost <= budget for _, cost, _ in ranked)
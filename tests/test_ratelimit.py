@@ -0,0 +1,134 @@
+"""Shared rate limiter: AIMD concurrency, Retry-After, and slots and tokens given back on early exits."""
+
+import asyncio
+from types import SimpleNamespace
+
+from autogen_core.models import UserMessage
+
+import llm.ratelimit as ratelimit_module
+from benchmarks.fake_client import ScriptedChatCompletionClient, TripScript
+from llm.ratelimit import AdaptiveConcurrency, RateLimitedChatCompletionClient, RateLimiter
+
+MESSAGES = [UserMessage(content="Trip to Tokyo", source="user")]
+
+
+class _Throttled(Exception):
+    """Provider 429 shaped like ``openai.RateLimitError``."""
+
+    def __init__(self, retry_after: str) -> None:
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": retry_after})
+
+
+class _ThrottledOnce(ScriptedChatCompletionClient):
+    async def create(self, messages, **kwargs):
+        if not self.calls:
+            self.calls += 1
+            raise _Throttled("0.05")
+        return await super().create(messages, **kwargs)
+
+
+class _Hanging(ScriptedChatCompletionClient):
+    async def create(self, messages, **kwargs):
+        await asyncio.Event().wait()
+
+
+def test_throttling_halves_the_cap_once_per_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ratelimit_module.time, "monotonic", lambda: now[0])
+
+    async def scenario():
+        concurrency = AdaptiveConcurrency(8, min_limit=2, cooldown=1.0)
+        for _ in range(3):
+            await concurrency.acquire()
+        concurrency.release("throttled")
+        concurrency.release("throttled")  # same burst: no second decrease
+        assert concurrency.limit == 4
+        now[0] += 1.0
+        concurrency.release("throttled")
+        assert concurrency.limit == 2
+        for _ in range(3):
+            await concurrency.acquire()
+            now[0] += 1.0
+            concurrency.release("throttled")
+        assert concurrency.limit == 2  # never below the floor
+
+        for _ in range(2):  # one window of `limit` successes adds about one slot
+            await concurrency.acquire()
+            concurrency.release("ok")
+        assert 2.8 < concurrency.limit < 3.0
+
+    asyncio.run(scenario())
+
+
+def test_backoff_waits_at_least_retry_after(monkeypatch):
+    monkeypatch.setattr(ratelimit_module.random, "uniform", lambda low, high: low)
+    limiter = RateLimiter(max_delay=30.0)
+    assert limiter.backoff(0, _Throttled("2")) == 2.0
+    assert limiter.backoff(0, _Throttled("120")) == 30.0  # capped at max_delay
+    assert limiter.backoff(0, _Throttled("soon")) == 0.0  # unparsable header is ignored
+
+
+def test_throttled_call_is_retried_after_retry_after():
+    async def scenario():
+        limiter = RateLimiter(max_concurrency=4)
+        provider = _ThrottledOnce(TripScript())
+        client = RateLimitedChatCompletionClient(provider, limiter)
+        started = asyncio.get_running_loop().time()
+        result = await client.create(MESSAGES)
+        return result, provider.calls, limiter, asyncio.get_running_loop().time() - started
+
+    result, calls, limiter, elapsed = asyncio.run(scenario())
+    assert isinstance(result.content, str) and calls == 2
+    assert elapsed >= 0.05
+    stats = limiter.stats()
+    assert (stats["throttled"], stats["retries"], stats["failures"]) == (1, 1, 0)
+    assert limiter.concurrency.limit < 4 and limiter.concurrency._in_flight == 0
+
+
+def test_stream_stopped_early_releases_its_slot():
+    async def scenario():
+        limiter = RateLimiter(max_concurrency=1)
+        client = RateLimitedChatCompletionClient(ScriptedChatCompletionClient(TripScript()), limiter)
+        stream = client.create_stream(MESSAGES)
+        await stream.__anext__()
+        assert limiter.concurrency._in_flight == 1
+        await stream.aclose()
+        assert limiter.concurrency._in_flight == 0
+        await asyncio.wait_for(client.create(MESSAGES), timeout=1)  # the slot can be taken again
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_returns_its_tokens():
+    async def scenario():
+        limiter = RateLimiter(tpm=600, completion_tokens=0)
+        await limiter.acquire(600)
+        waiter = asyncio.create_task(limiter.acquire(300))  # ~30s of token debt
+        await asyncio.sleep(0)
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        return limiter.tokens.reserve(0)
+
+    assert asyncio.run(scenario()) < 1  # without the refund the next caller would wait ~30s
+
+
+def test_cancelled_call_releases_its_slot():
+    async def scenario():
+        limiter = RateLimiter(max_concurrency=1)
+        client = RateLimitedChatCompletionClient(_Hanging(TripScript()), limiter)
+        call = asyncio.create_task(client.create(MESSAGES))
+        await asyncio.sleep(0.01)
+        assert limiter.concurrency._in_flight == 1
+        call.cancel()
+        try:
+            await call
+        except asyncio.CancelledError:
+            pass
+        return limiter.concurrency._in_flight
+
+    assert asyncio.run(scenario()) == 0
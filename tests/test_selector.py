@@ -0,0 +1,31 @@
+"""Deterministic speaker routing: who speaks after each planner message."""
+
+from autogen_agentchat.messages import TextMessage
+
+from agents.names import ITINERARY_AGENT, PLANNER, SPECIALISTS, USER
+from agents.selector import RoutingSelector
+
+DELEGATION = "**Flight Agent**: BOS→CDG. **Hotel Agent**: Paris. **Weather Agent**: Paris."
+
+
+def _next(*turns):
+    return RoutingSelector()([TextMessage(source=source, content=content) for source, content in turns])
+
+
+def test_planner_question_goes_to_user():
+    assert _next((USER, "Plan a trip to Paris"), (PLANNER, "Where are you flying from?")) == USER
+
+
+def test_planner_delegation_goes_to_specialists():
+    assert _next((USER, "Plan a trip from Boston to Paris"), (PLANNER, DELEGATION)) == SPECIALISTS
+
+
+def test_question_after_specialists_goes_to_user():
+    turns = [(USER, "Plan a trip from Boston to Paris"), (PLANNER, DELEGATION), (SPECIALISTS, "### flight_agent\n...")]
+    assert _next(*turns, (PLANNER, "Should I look for cheaper dates?")) == USER
+
+
+def test_summary_after_specialists_goes_to_itinerary():
+    turns = [(USER, "Plan a trip from Boston to Paris"), (PLANNER, DELEGATION), (SPECIALISTS, "### flight_agent\n...")]
+    assert _next(*turns, (PLANNER, "All set. Itinerary Agent, please compile the plan.")) == ITINERARY_AGENT
+    assert _next(*turns, (PLANNER, "Ready? Itinerary Agent, please compile the plan.")) == ITINERARY_AGENT
@@ -0,0 +1,62 @@
+"""Team pool: teams that leave the pool are closed along with their prefetch threads."""
+
+import asyncio
+import threading
+
+from benchmarks.fake_client import ScriptedChatCompletionClient, TripScript
+from config.settings import Settings
+from server import TeamPool
+
+TASK = "Plan a trip from New York to Tokyo, 2026-03-10 to 2026-03-15. Budget: $3000"
+
+
+def _prefetch_threads() -> set[threading.Thread]:
+    return {thread for thread in threading.enumerate() if thread.name.startswith("prefetch")}
+
+
+def _assert_stopped(threads: set[threading.Thread]) -> None:
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not [thread.name for thread in threads if thread.is_alive()]
+
+
+def _pool(tmp_path, size: int) -> TeamPool:
+    settings = Settings(provider="fake", model_name="scripted", memory_db=str(tmp_path / "preferences.sqlite"))
+    return TeamPool(settings, size=size, model_client=ScriptedChatCompletionClient(TripScript()))
+
+
+async def _run(pool: TeamPool, user_id: str):
+    before = _prefetch_threads()
+    entry = pool.acquire(user_id)
+    await entry.team.run(task=TASK)
+    return entry, _prefetch_threads() - before
+
+
+def test_evicted_team_stops_its_prefetch_threads(tmp_path):
+    async def scenario():
+        pool = _pool(tmp_path, size=1)
+        first, first_threads = await _run(pool, "alice")
+        second, second_threads = await _run(pool, "bob")
+        assert first_threads and second_threads
+        await pool.release(first)
+        await pool.release(second)  # the pool is full: this team is closed
+        assert pool.stats()["idle"] == 1
+        _assert_stopped(second_threads)
+        assert all(thread.is_alive() for thread in first_threads)
+
+        await pool.invalidate("alice")  # stale preferences: the idle team is closed
+        assert pool.stats()["idle"] == 0
+        _assert_stopped(first_threads)
+
+    asyncio.run(scenario())
+
+
+def test_unclean_run_closes_the_team(tmp_path):
+    async def scenario():
+        pool = _pool(tmp_path, size=2)
+        entry, threads = await _run(pool, "alice")
+        await pool.release(entry, reusable=False)
+        assert pool.stats()["idle"] == 0
+        _assert_stopped(threads)
+
+    asyncio.run(scenario())
@@ -0,0 +1,23 @@
+"""Settings from the environment: per-agent model overrides and hashability."""
+
+from config.settings import ModelConfig, Settings
+
+
+def test_agent_models_override_and_stay_hashable(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "groq")
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+    monkeypatch.setenv("AGENT_MODELS", "specialists=llama-3.1-8b-instant, selector=groq:llama-3.1-8b-instant")
+    settings = Settings.from_env()
+
+    assert settings.model_config("flight_agent", "specialists").model_name == "llama-3.1-8b-instant"
+    assert settings.model_config("selector").model_name == "llama-3.1-8b-instant"
+    assert settings.model_config("planner").model_name == "llama-3.3-70b-versatile"
+    assert hash(settings) == hash(Settings.from_env())
+    assert {settings: "cached"}[Settings.from_env()] == "cached"
+
+
+def test_default_model_without_overrides():
+    settings = Settings(provider="groq", model_name="llama-3.3-70b-versatile", api_key="k")
+    assert settings.model_config("planner") == ModelConfig(provider="groq", model_name="llama-3.3-70b-versatile", api_key="k")
+    hash(settings)
@@ -0,0 +1,77 @@
+"""Tool result cache: hits, TTL expiry, the persistent tier and the arguments tools receive."""
+
+import tools.cache as cache_module
+from tools.cache import ToolCache, normalize_city, normalize_date
+
+ROUTE = {"origin": normalize_city, "destination": normalize_city, "date": normalize_date}
+
+
+def _search(calls: list):
+    def search_flights(origin: str, destination: str, date: str) -> str:
+        calls.append((origin, destination, date))
+        return f"{origin}->{destination} on {date}"
+
+    return search_flights
+
+
+def test_repeat_call_is_a_hit():
+    calls = []
+    cached = ToolCache().wrap(_search(calls), ttl=60, normalizers=ROUTE)
+    first = cached("New York", "Tokyo", "2026-03-10")
+    assert cached("New York", "Tokyo", date="2026-03-10") == first
+    assert len(calls) == 1
+
+
+def test_tool_receives_the_arguments_of_its_cache_key():
+    calls = []
+    cache = ToolCache()
+    cached = cache.wrap(_search(calls), ttl=60, normalizers=ROUTE)
+    assert cached(" McAllen ", "New  York", "March 10, 2026") == "McAllen->New York on 2026-03-10"
+    assert cached("McAllen", "New York", "2026-03-10") == "McAllen->New York on 2026-03-10"
+    assert calls == [("McAllen", "New York", "2026-03-10")]
+    assert cache.stats()["search_flights"]["hits"] == 1
+
+
+def test_arguments_that_change_the_result_do_not_share_an_entry():
+    calls = []
+    cached = ToolCache().wrap(_search(calls), ttl=60, normalizers=ROUTE)
+    assert cached("tokyo", "Paris", "2026-03-10") == "tokyo->Paris on 2026-03-10"
+    assert cached("Tokyo", "Paris", "2026-03-10") == "Tokyo->Paris on 2026-03-10"
+    assert len(calls) == 2
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    calls = []
+    cache = ToolCache()
+    cached = cache.wrap(_search(calls), ttl=60, normalizers=ROUTE)
+    cached("Boston", "Paris", "2026-03-10")
+    now[0] += 59
+    cached("Boston", "Paris", "2026-03-10")
+    assert len(calls) == 1
+    now[0] += 2
+    cached("Boston", "Paris", "2026-03-10")
+    assert len(calls) == 2
+    assert cache.stats()["search_flights"]["misses"] == 2
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    db = str(tmp_path / "tools.sqlite")
+    calls = []
+    ToolCache(db_path=db).wrap(_search(calls), ttl=60, normalizers=ROUTE)("Boston", "Paris", "2026-03-10")
+    cache = ToolCache(db_path=db)
+    assert cache.wrap(_search(calls), ttl=60, normalizers=ROUTE)("Boston", "Paris", "2026-03-10")
+    assert len(calls) == 1
+    assert cache.stats()["search_flights"]["disk_hits"] == 1
+
+
+def test_unused_prefetch_is_discarded():
+    calls = []
+    cache = ToolCache()
+    cached = cache.wrap(_search(calls), ttl=60, normalizers=ROUTE)
+    cached.prefetch("Boston", "Paris", "2026-03-10")
+    assert cache.discard("search_flights", cached.cache_key("Boston", "Paris", "2026-03-10"))
+    cached("Boston", "Paris", "2026-03-10")
+    assert len(calls) == 2
+    assert cache.stats()["search_flights"]["prefetch_discarded"] == 1
@@ -1,5 +1,12 @@
-from tools.flight_search import search_flights
-from tools.hotel_search import search_hotels
-from tools.weather import get_weather
+from tools.flight_search import search_flight_dates, search_flights
+from tools.hotel_search import search_hotel_rates, search_hotels
+from tools.weather import get_weather, get_weather_range
 
-__all__ = ["search_flights", "search_hotels", "get_weather"]
+__all__ = [
+    "search_flights",
+    "search_flight_dates",
+    "search_hotels",
+    "search_hotel_rates",
+    "get_weather",
+    "get_weather_range",
+]
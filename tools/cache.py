@@ -0,0 +1,306 @@
+"""TTL-aware result cache for the travel tools — in-memory LRU + optional SQLite tier.
+
+Concurrent calls for the same key share one in-flight computation, and
+entries can be warmed speculatively (``cached.prefetch``) — those are
+tracked so the stats report how many prefetches a real call then used.
+"""
+
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+# Per-tool time-to-live in seconds (prices move faster than forecasts)
+FLIGHT_TTL = 15 * 60
+HOTEL_TTL = 30 * 60
+WEATHER_TTL = 3 * 60 * 60
+
+_DATE_FORMATS = [
+    "%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d", "%Y%m%d",
+    "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y", "%B %d, %Y", "%b %d, %Y",
+    "%m/%d/%Y",
+]
+
+
+def normalize_city(city: str) -> str:
+    """Canonical city argument: trimmed and single-spaced, spelling and case kept (``" New  York"`` → ``"New York"``)."""
+    return re.sub(r"\s+", " ", city).strip()
+
+
+def normalize_date(date: str) -> str:
+    """Canonical ``YYYY-MM-DD`` date argument; unparseable input is returned trimmed."""
+    text = re.sub(r"\s+", " ", date).strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text
+
+
+class _SQLiteTier:
+    """Persistent second tier shared across processes and sessions."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str, now: float) -> tuple[str, float] | None:
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM tool_cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tool_cache (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at)
+        )
+
+    def delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+
+    def purge_expired(self, now: float) -> None:
+        self._conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (now,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ToolCache:
+    """Two-tier cache for tool results keyed by tool name + normalized arguments.
+
+    Args:
+        max_entries: capacity of the in-memory LRU tier.
+        db_path: optional SQLite file for the persistent tier (empty → memory only).
+    """
+
+    def __init__(self, max_entries: int = 1024, db_path: str = "") -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _SQLiteTier(db_path) if db_path else None
+        if self._disk:
+            self._disk.purge_expired(time.time())
+        self._stats: dict[str, dict[str, int]] = {}
+        self._inflight: dict[str, Future] = {}
+        self._prefetched: set[str] = set()  # warmed speculatively, not yet used by a real call
+        self._discarding: set[str] = set()  # in-flight prefetches whose result must not be stored
+
+    def _count(self, tool: str, outcome: str) -> None:
+        counters = self._stats.setdefault(
+            tool,
+            {"hits": 0, "disk_hits": 0, "misses": 0, "waits": 0, "prefetched": 0, "prefetch_hits": 0, "prefetch_discarded": 0},
+        )
+        counters[outcome] += 1
+
+    def _lookup(self, key: str, now: float) -> tuple[str | None, str]:
+        """Value and outcome (``hits`` / ``disk_hits`` / ``misses``) for ``key``; caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry and entry[1] > now:
+            self._entries.move_to_end(key)
+            return entry[0], "hits"
+        if entry:
+            del self._entries[key]
+        if self._disk:
+            row = self._disk.get(key, now)
+            if row:
+                self._store(key, *row)
+                return row[0], "disk_hits"
+        return None, "misses"
+
+    def _used(self, tool: str, key: str) -> None:
+        """A real call was served by ``key``; credit the prefetch that warmed it (once)."""
+        if key in self._prefetched:
+            self._prefetched.discard(key)
+            self._count(tool, "prefetch_hits")
+
+    def get(self, tool: str, key: str) -> str | None:
+        with self._lock:
+            value, outcome = self._lookup(key, time.time())
+            self._count(tool, outcome)
+            if value is not None:
+                self._used(tool, key)
+            return value
+
+    def fetch(self, tool: str, key: str, compute: Callable[[], str], ttl: float, prefetch: bool = False) -> str:
+        """Cached value for ``key``, computing it at most once even under concurrent callers.
+
+        A caller that finds ``key`` already being computed waits for that
+        result instead of repeating the work. ``prefetch`` marks speculative
+        calls: they are left out of the hit/miss counters and their entry is
+        tracked until a real call uses it or it is discarded.
+        """
+        with self._lock:
+            value, outcome = self._lookup(key, time.time())
+            if value is not None:
+                if not prefetch:
+                    self._count(tool, outcome)
+                    self._used(tool, key)
+                return value
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                if prefetch:
+                    self._prefetched.add(key)
+                    self._count(tool, "prefetched")
+            if not prefetch:
+                self._count(tool, "misses" if owner else "waits")
+                self._discarding.discard(key)  # a real caller wants this result after all
+                if not owner:
+                    self._used(tool, key)
+
+        if not owner:
+            try:
+                return future.result()
+            except Exception:
+                return self.fetch(tool, key, compute, ttl, prefetch)  # the call we joined failed — try ourselves
+
+        try:
+            result = compute()
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+                self._prefetched.discard(key)
+                self._discarding.discard(key)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            discarded = key in self._discarding
+            self._discarding.discard(key)
+        if not discarded:
+            self.set(key, result, ttl)
+        future.set_result(result)
+        return result
+
+    def discard(self, tool: str, key: str) -> bool:
+        """Drop a prefetched entry no real call has used (a mis-speculation).
+
+        A prefetch still in flight finishes but its result is not stored.
+        Returns False if ``key`` was not an unused prefetch.
+        """
+        with self._lock:
+            if key not in self._prefetched:
+                return False
+            self._prefetched.discard(key)
+            if key in self._inflight:
+                self._discarding.add(key)
+            else:
+                self._entries.pop(key, None)
+                if self._disk:
+                    self._disk.delete(key)
+            self._count(tool, "prefetch_discarded")
+            return True
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._disk:
+                self._disk.set(key, value, expires_at)
+
+    def _store(self, key: str, value: str, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._prefetched.discard(evicted)
+
+    def wrap(
+        self,
+        func: Callable[..., str],
+        ttl: float,
+        normalizers: dict[str, Callable[[str], str]],
+        namespace: str = "",
+    ) -> Callable[..., str]:
+        """Return a cached version of ``func`` with the same name and signature.
+
+        ``normalizers`` put arguments in canonical form (``"Tokyo "`` →
+        ``"Tokyo"``, ``"March 10, 2026"`` → ``"2026-03-10"``) and ``func``
+        is called with exactly the arguments the cache key was built from,
+        so every caller that shares an entry would have got the same result.
+        They must therefore only remove differences the tool would not care
+        about (``normalize_city`` keeps ``"McAllen"`` as written). ``namespace``
+        keeps entries of same-named tools from different data backends apart.
+
+        The returned function also has ``cache_key(*args, **kwargs)`` and
+        ``prefetch(*args, **kwargs)``, which warms the entry speculatively
+        (see ``fetch``).
+        """
+        signature = inspect.signature(func)
+
+        def resolve(args: tuple, kwargs: dict) -> tuple[str, dict]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {
+                name: normalizers[name](value) if name in normalizers and isinstance(value, str) else value
+                for name, value in bound.arguments.items()
+            }
+            return f"{namespace}{func.__name__}:{json.dumps(arguments, sort_keys=True)}", arguments
+
+        def call(args: tuple, kwargs: dict, prefetch: bool) -> str:
+            key, arguments = resolve(args, kwargs)
+            return self.fetch(func.__name__, key, lambda: func(**arguments), ttl, prefetch)
+
+        @functools.wraps(func)
+        def cached(*args, **kwargs) -> str:
+            return call(args, kwargs, prefetch=False)
+
+        cached.cache_key = lambda *args, **kwargs: resolve(args, kwargs)[0]
+        cached.prefetch = lambda *args, **kwargs: call(args, kwargs, prefetch=True)
+        return cached
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Hit/miss counters per tool, with the combined hit rate and the share of prefetches used.
+
+        ``waits`` are calls that joined an identical in-flight call and count
+        as hits.
+        """
+        with self._lock:
+            report = {}
+            for tool, counters in self._stats.items():
+                hits = counters["hits"] + counters["disk_hits"] + counters["waits"]
+                total = hits + counters["misses"]
+                prefetched = counters["prefetched"]
+                report[tool] = {
+                    **counters,
+                    "hit_rate": round(hits / total, 4) if total else 0.0,
+                    "prefetch_hit_rate": round(counters["prefetch_hits"] / prefetched, 4) if prefetched else 0.0,
+                }
+            return report
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset counters (the SQLite tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+            self._prefetched.clear()
+
+    def close(self) -> None:
+        if self._disk:
+            self._disk.close()
+
+
+_caches: dict[str, ToolCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_tool_cache(db_path: str = "") -> ToolCache:
+    """Process-wide cache instance for ``db_path`` so every team shares hits."""
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = ToolCache(db_path=db_path)
+        return _caches[db_path]
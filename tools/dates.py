@@ -0,0 +1,22 @@
+"""Date-range helper shared by the batched travel tools."""
+
+from datetime import date, timedelta
+
+MAX_RANGE_DAYS = 62  # one call covers at most ~two months of dates
+
+
+def date_range(start: str, end: str = "", pad_days: int = 0) -> list[str]:
+    """ISO dates from ``start - pad_days`` through ``(end or start) + pad_days``, inclusive.
+
+    Raises:
+        ValueError: on malformed dates, an inverted range or more than
+            ``MAX_RANGE_DAYS`` dates.
+    """
+    first = date.fromisoformat(start) - timedelta(days=pad_days)
+    last = date.fromisoformat(end or start) + timedelta(days=pad_days)
+    days = (last - first).days + 1
+    if days < 1:
+        raise ValueError(f"End date {end} is before start date {start}")
+    if days > MAX_RANGE_DAYS:
+        raise ValueError(f"Date range of {days} days exceeds the {MAX_RANGE_DAYS}-day limit")
+    return [(first + timedelta(days=offset)).isoformat() for offset in range(days)]
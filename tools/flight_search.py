@@ -3,6 +3,8 @@
 import hashlib
 import json
 
+from tools.dates import date_range
+
 _AIRLINES = ["SkyWay Airlines", "Pacific Air", "Global Express", "Horizon Flights", "Atlas Airways"]
 _BASE_PRICES = [320, 450, 580, 710, 890]
 _DEPARTURE_HOURS = ["06:00", "09:30", "12:15", "15:45", "19:00"]
@@ -14,17 +16,8 @@ def _seed(text: str) -> int:
     return int(hashlib.md5(text.encode()).hexdigest(), 16)
 
 
-def search_flights(origin: str, destination: str, date: str) -> str:
-    """Search for available flights between two cities on a given date.
-
-    Args:
-        origin: Departure city (e.g. "New York").
-        destination: Arrival city (e.g. "Tokyo").
-        date: Travel date in YYYY-MM-DD format.
-
-    Returns:
-        JSON string with a list of flight options.
-    """
+def _flights(origin: str, destination: str, date: str) -> list[dict]:
+    """Flight options for one date, cheapest first."""
     seed = _seed(f"{origin}-{destination}-{date}")
     count = (seed % 3) + 3  # 3-5 results
 
@@ -48,4 +41,50 @@ def search_flights(origin: str, destination: str, date: str) -> str:
 
     # Sort by price
     flights.sort(key=lambda f: f["price_usd"])
-    return json.dumps(flights, indent=2)
+    return flights
+
+
+def search_flights(origin: str, destination: str, date: str) -> str:
+    """Search for available flights between two cities on a given date.
+
+    Args:
+        origin: Departure city (e.g. "New York").
+        destination: Arrival city (e.g. "Tokyo").
+        date: Travel date in YYYY-MM-DD format.
+
+    Returns:
+        JSON string with a list of flight options.
+    """
+    return json.dumps(_flights(origin, destination, date), indent=2)
+
+
+def search_flight_dates(origin: str, destination: str, start_date: str, end_date: str = "", flex_days: int = 0) -> str:
+    """Find the cheapest flight on every date of a range in one call.
+
+    Args:
+        origin: Departure city (e.g. "New York").
+        destination: Arrival city (e.g. "Tokyo").
+        start_date: First travel date in YYYY-MM-DD format.
+        end_date: Last travel date in YYYY-MM-DD format (defaults to start_date).
+        flex_days: Extra days to search on either side of the range (e.g. 3 for ±3 days).
+
+    Returns:
+        JSON string with a price-by-date matrix: one row per date with its
+        cheapest flight, plus the overall cheapest date.
+    """
+    columns = ["date", "price_usd", "airline", "flight_no", "departure", "duration", "options"]
+    rows = []
+    for day in date_range(start_date, end_date, flex_days):
+        options = _flights(origin, destination, day)
+        best = options[0]
+        rows.append([day, best["price_usd"], best["airline"], best["flight_no"], best["departure"], best["duration"], len(options)])
+    cheapest = min(rows, key=lambda row: (row[1], row[0]))
+    calendar = {
+        "origin": origin,
+        "destination": destination,
+        "cheapest_date": cheapest[0],
+        "cheapest_price_usd": cheapest[1],
+        "columns": columns,
+        "rows": rows,
+    }
+    return json.dumps(calendar)
@@ -0,0 +1,81 @@
+"""Token-efficient output formats shared by the travel tools.
+
+The mock APIs return pretty-printed JSON, which is what the specialists
+paste into the conversation. :func:`compact_output` re-serializes a tool's
+result in one of:
+
+- ``pretty`` — the tools' own ``indent=2`` JSON (unchanged behavior)
+- ``json``   — minified JSON
+- ``table``  — columnar JSON: fields that are identical on every row are
+  hoisted into ``shared`` and the rest become ``columns`` + ``rows``
+
+plus an optional top-k cut, applied after the tool's ranking (see
+``tools/ranking.py``) so the best rows are the ones kept.
+"""
+
+import functools
+import json
+from typing import Any, Callable
+
+FORMATS = ("pretty", "json", "table")
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown tool output format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def to_table(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Columnar form of ``records`` with the fields shared by every row hoisted out."""
+    if not records:
+        return {"shared": {}, "columns": [], "rows": []}
+    first = records[0]
+    shared = {
+        key: value for key, value in first.items()
+        if len(records) > 1 and all(key in r and r[key] == value for r in records[1:])
+    }
+    columns = [key for key in first if key not in shared]
+    for record in records[1:]:
+        columns.extend(key for key in record if key not in shared and key not in columns)
+    rows = [[record.get(key) for key in columns] for record in records]
+    return {"shared": shared, "columns": columns, "rows": rows}
+
+
+def expand_records(value: Any) -> list[Any]:
+    """Inverse of every format: a list of plain records, whatever ``value`` was serialized as."""
+    if isinstance(value, dict) and set(value) == {"shared", "columns", "rows"}:
+        return [{**value["shared"], **dict(zip(value["columns"], row))} for row in value["rows"]]
+    return value if isinstance(value, list) else [value]
+
+
+def format_result(value: Any, fmt: str = "pretty", top_k: int = 0) -> str:
+    """Serialize a tool result (a record or a ranked list of records) as ``fmt``."""
+    _check_format(fmt)
+    if isinstance(value, list) and top_k:
+        value = value[:top_k]
+    if fmt == "pretty":
+        return json.dumps(value, indent=2)
+    if fmt == "table" and isinstance(value, list) and all(isinstance(r, dict) for r in value):
+        value = to_table(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_output(
+    func: Callable[..., str],
+    fmt: str = "pretty",
+    top_k: int = 0,
+    rank: Callable[[list[Any]], list[Any]] | None = None,
+) -> Callable[..., str]:
+    """Wrap a JSON-returning tool so its result is ranked and re-serialized with :func:`format_result`."""
+    _check_format(fmt)
+    if fmt == "pretty" and not top_k and rank is None:
+        return func
+
+    @functools.wraps(func)
+    def compacted(*args, **kwargs) -> str:
+        value = json.loads(func(*args, **kwargs))
+        if rank is not None and isinstance(value, list):
+            value = rank(value)
+        return format_result(value, fmt, top_k)
+
+    return compacted
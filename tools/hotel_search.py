@@ -2,6 +2,9 @@
 
 import hashlib
 import json
+from datetime import date
+
+from tools.dates import date_range
 
 _HOTEL_NAMES = [
     "Grand Plaza Hotel", "Sakura Inn", "The Metropolitan",
@@ -20,17 +23,8 @@ def _seed(text: str) -> int:
     return int(hashlib.md5(text.encode()).hexdigest(), 16)
 
 
-def search_hotels(city: str, check_in: str, check_out: str) -> str:
-    """Search for available hotels in a city for given dates.
-
-    Args:
-        city: Destination city (e.g. "Tokyo").
-        check_in: Check-in date in YYYY-MM-DD format.
-        check_out: Check-out date in YYYY-MM-DD format.
-
-    Returns:
-        JSON string with a list of hotel options.
-    """
+def _hotels(city: str, check_in: str, check_out: str) -> list[dict]:
+    """Hotel options for one stay, best rated first."""
     seed = _seed(f"{city}-{check_in}-{check_out}")
     count = (seed % 3) + 3  # 3-5 results
 
@@ -57,4 +51,54 @@ def search_hotels(city: str, check_in: str, check_out: str) -> str:
         )
 
     hotels.sort(key=lambda h: -h["rating"])
-    return json.dumps(hotels, indent=2)
+    return hotels
+
+
+def search_hotels(city: str, check_in: str, check_out: str) -> str:
+    """Search for available hotels in a city for given dates.
+
+    Args:
+        city: Destination city (e.g. "Tokyo").
+        check_in: Check-in date in YYYY-MM-DD format.
+        check_out: Check-out date in YYYY-MM-DD format.
+
+    Returns:
+        JSON string with a list of hotel options.
+    """
+    return json.dumps(_hotels(city, check_in, check_out), indent=2)
+
+
+def _nightly_rate(hotel: dict, night: str) -> int:
+    """Rate for one night, varying around the stay's quoted price (Fri/Sat cost more)."""
+    jitter = (_seed(f"{hotel['name']}-{night}") % 21) - 10  # ±$10
+    weekend = date.fromisoformat(night).weekday() >= 4
+    base = hotel["price_per_night_usd"] * (1.15 if weekend else 1.0)
+    return max(60, round(base + jitter))
+
+
+def search_hotel_rates(city: str, check_in: str, check_out: str) -> str:
+    """Get every hotel's rate for each night of a stay in one call.
+
+    Args:
+        city: Destination city (e.g. "Tokyo").
+        check_in: Check-in date in YYYY-MM-DD format.
+        check_out: Check-out date in YYYY-MM-DD format.
+
+    Returns:
+        JSON string with a nightly-rate matrix: one row per hotel with its
+        rating, total for the stay and the rate for each night.
+    """
+    nights = date_range(check_in, check_out)[:-1]  # the check-out day is not a night
+    if not nights:
+        raise ValueError("check_out must be after check_in")
+    rows = []
+    for hotel in _hotels(city, check_in, check_out):
+        rates = [_nightly_rate(hotel, night) for night in nights]
+        rows.append([hotel["name"], hotel["rating"], sum(rates), rates])
+    matrix = {
+        "city": city,
+        "nights": nights,
+        "columns": ["name", "rating", "total_usd", "nightly_usd"],
+        "rows": rows,
+    }
+    return json.dumps(matrix)
@@ -0,0 +1,468 @@
+"""Synthetic, indexed flight and hotel inventory for load-testing the tool layer.
+
+The default tools (``tools/flight_search.py``, ``tools/hotel_search.py``)
+fabricate 3–5 rows per call. :class:`SyntheticInventory` instead generates a
+deterministic world — thousands of cities, tens of thousands of routes and
+hotels, millions of priced flight-days and hotel-nights — and serves the
+same tool signatures from it, with filter and top-k pushdown.
+
+Storage is columnar and array-backed (stdlib ``array``; no NumPy needed):
+
+- **schedule** — one row per daily flight on a route (airline, number,
+  departure, duration, base fare); rows of a route are contiguous and
+  ``route_offsets`` (CSR) maps route id → row range. Routes are found with a
+  ``(origin, destination)`` dict, so *route + date* is two lookups.
+- **fare_jitter** — per flight per day, ``row * days + day``.
+- **hotels** — one row per hotel (rating, amenity bitmask, base rate);
+  rows of a city are contiguous, best rated first, and ``hotel_offsets``
+  maps city id → row range, so *city + date* is a slice plus ``h * days + day``.
+- **rate_jitter** — per hotel per night, ``h * days + day``.
+
+The schedule repeats every ``days`` days (dates are taken modulo the
+horizon), so any date resolves. :meth:`SyntheticInventory.save` writes every
+column as a raw file; :meth:`SyntheticInventory.load` memory-maps them back.
+
+Build once and reuse::
+
+    python -m tools.inventory --cities 2000 --out .cache/inventory
+"""
+
+import argparse
+import asyncio
+import json
+import mmap
+import random
+import threading
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from tools.cache import normalize_city
+from tools.dates import date_range
+
+_EPOCH = date(2026, 1, 1)
+_REAL_CITIES = [
+    "New York", "Tokyo", "London", "Paris", "Rome", "Barcelona", "Madrid", "Lisbon", "Berlin", "Amsterdam",
+    "Dubai", "Singapore", "Sydney", "Los Angeles", "San Francisco", "Chicago", "Miami", "Toronto", "Mexico City",
+    "Bangkok", "Hong Kong", "Seoul", "Istanbul", "Cairo", "Cape Town", "Rio De Janeiro", "Buenos Aires",
+    "Mumbai", "Delhi", "Bali", "Kyoto", "Osaka", "Vienna", "Prague", "Athens", "Dublin", "Zurich", "Boston",
+    "Seattle", "Honolulu",
+]
+_SYLLABLES = ["ar", "bel", "cor", "dan", "el", "fen", "gal", "hal", "ist", "jor", "kal", "lin", "mar", "nor",
+              "os", "pol", "quin", "ros", "sal", "tor", "ul", "val", "wen", "yar", "zen"]
+_AIRLINES = ["SkyWay Airlines", "Pacific Air", "Global Express", "Horizon Flights", "Atlas Airways",
+             "Northern Star", "Coastal Jet", "Meridian Air"]
+_BRANDS = ["Grand Plaza Hotel", "Sakura Inn", "The Metropolitan", "Harbor View Resort", "City Center Suites",
+           "Sunset Lodge", "Royal Crown", "Blue Lagoon Hotel", "Parkside Inn", "The Continental",
+           "Maple Residences", "Ocean Breeze", "Summit Hotel", "Old Mill Inn", "Riverside Lodge"]
+_DISTRICTS = ["Central", "Airport", "Old Town", "Riverside", "Station", "Harbor", "Park", "Downtown"]
+AMENITIES = ["Free WiFi", "Pool", "Gym", "Spa", "Restaurant", "Airport Shuttle", "Breakfast Included",
+             "Business Center", "Rooftop Bar", "Room Service"]
+_AMENITY_BITS = {name.lower(): 1 << i for i, name in enumerate(AMENITIES)}
+
+# Column name → array typecode; everything needed to answer queries lives here
+_COLUMNS = {
+    "route_origin": "H", "route_destination": "H", "route_offsets": "I",
+    "flight_airline": "B", "flight_number": "H", "flight_departure": "H", "flight_duration": "H", "flight_fare": "H",
+    "fare_jitter": "B",
+    "hotel_brand": "B", "hotel_district": "B", "hotel_rating": "B", "hotel_amenities": "H", "hotel_rate": "H",
+    "hotel_offsets": "I", "rate_jitter": "B",
+}
+
+
+def _city_key(city: str) -> str:
+    """Lookup form of a city name (matched case-insensitively: ``"mcallen"`` finds ``"McAllen"``)."""
+    return normalize_city(city).casefold()
+
+
+def _city_names(count: int, rng: random.Random) -> list[str]:
+    names = list(_REAL_CITIES[:count])
+    seen = {name.lower() for name in names}
+    while len(names) < count:
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def _fmt_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _fmt_duration(minutes: int) -> str:
+    return f"{minutes // 60}h {minutes % 60}m"
+
+
+def _amenity_mask(amenities: str) -> int | None:
+    """Bitmask for a comma-separated amenity list; ``None`` if any amenity is unknown."""
+    mask = 0
+    for name in filter(None, (part.strip().lower() for part in amenities.split(","))):
+        if name not in _AMENITY_BITS:
+            return None
+        mask |= _AMENITY_BITS[name]
+    return mask
+
+
+class SyntheticInventory:
+    """Columnar flight + hotel inventory with route/date and city/date indexes."""
+
+    def __init__(self, meta: dict[str, Any], columns: dict[str, Any]) -> None:
+        self.meta = meta
+        self.days: int = meta["days"]
+        self.cities: list[str] = meta["cities"]
+        self._city_ids = {_city_key(name): i for i, name in enumerate(self.cities)}
+        self._columns = columns
+        for name, column in columns.items():
+            setattr(self, f"_{name}", column)
+        self._routes = {
+            (self._route_origin[r], self._route_destination[r]): r for r in range(len(self._route_origin))
+        }
+
+    # --- building ---
+
+    @classmethod
+    def generate(
+        cls,
+        cities: int = 2000,
+        routes_per_city: int = 12,
+        hotels_per_city: tuple[int, int] = (20, 60),
+        days: int = 60,
+        seed: int = 0,
+    ) -> "SyntheticInventory":
+        """Deterministically generate an inventory (same arguments → identical data)."""
+        rng = random.Random(seed)
+        names = _city_names(cities, rng)
+        real = min(len(_REAL_CITIES), cities)
+
+        # Routes: a full mesh between the well-known cities plus random links, always both directions
+        pairs: set[tuple[int, int]] = {(a, b) for a in range(real) for b in range(real) if a != b}
+        for origin in range(cities):
+            for destination in rng.sample(range(cities), min(routes_per_city, cities - 1)):
+                if destination != origin:
+                    pairs.add((origin, destination))
+                    pairs.add((destination, origin))
+        routes = sorted(pairs)
+
+        col = {name: array(code) for name, code in _COLUMNS.items()}
+        col["route_offsets"].append(0)
+        for origin, destination in routes:
+            col["route_origin"].append(origin)
+            col["route_destination"].append(destination)
+            duration = rng.randint(50, 900)
+            base_fare = 60 + duration // 2 + rng.randint(0, 250)
+            for _ in range(rng.randint(2, 8)):
+                airline = rng.randrange(len(_AIRLINES))
+                col["flight_airline"].append(airline)
+                col["flight_number"].append(rng.randint(100, 9999))
+                col["flight_departure"].append(rng.randrange(5 * 60, 23 * 60, 5))
+                col["flight_duration"].append(duration + rng.randint(0, 90))
+                col["flight_fare"].append(base_fare + rng.randint(-40, 120))
+            col["route_offsets"].append(len(col["flight_airline"]))
+        col["fare_jitter"].frombytes(rng.randbytes(len(col["flight_airline"]) * days))
+
+        col["hotel_offsets"].append(0)
+        combos = len(_BRANDS) * len(_DISTRICTS)
+        for _ in range(cities):
+            hotels = []
+            for combo in rng.sample(range(combos), rng.randint(*hotels_per_city)):
+                rating = rng.randint(30, 50)  # tenths of a star
+                hotels.append((rating, combo, rng.getrandbits(len(AMENITIES)), 50 + rating * 4 + rng.randint(0, 200)))
+            hotels.sort(key=lambda h: (-h[0], h[3]))  # best rated (then cheapest) first, for early termination
+            for rating, combo, amenities, rate in hotels:
+                col["hotel_brand"].append(combo // len(_DISTRICTS))
+                col["hotel_district"].append(combo % len(_DISTRICTS))
+                col["hotel_rating"].append(rating)
+                col["hotel_amenities"].append(amenities)
+                col["hotel_rate"].append(rate)
+            col["hotel_offsets"].append(len(col["hotel_rating"]))
+        col["rate_jitter"].frombytes(rng.randbytes(len(col["hotel_rating"]) * days))
+
+        meta = {"days": days, "cities": names, "seed": seed}
+        return cls(meta, col)
+
+    def save(self, directory: str | Path) -> None:
+        """Write each column as a raw binary file plus ``meta.json``."""
+        out = Path(directory)
+        out.mkdir(parents=True, exist_ok=True)
+        for name, column in self._columns.items():
+            with open(out / f"{name}.bin", "wb") as fh:
+                fh.write(memoryview(column).cast("B"))
+        (out / "meta.json").write_text(json.dumps(self.meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "SyntheticInventory":
+        """Memory-map an inventory written by :meth:`save` (columns are not copied into RAM)."""
+        src = Path(directory)
+        meta = json.loads((src / "meta.json").read_text(encoding="utf-8"))
+        columns = {}
+        for name, code in _COLUMNS.items():
+            with open(src / f"{name}.bin", "rb") as fh:
+                if fh.seek(0, 2) == 0:
+                    columns[name] = array(code)
+                    continue
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            columns[name] = memoryview(mapped).cast(code)
+        return cls(meta, columns)
+
+    def describe(self) -> dict[str, int]:
+        """Row counts and in-memory/on-disk size of the inventory."""
+        scheduled = len(self._flight_airline)
+        hotels = len(self._hotel_rating)
+        return {
+            "cities": len(self.cities),
+            "routes": len(self._route_origin),
+            "scheduled_flights": scheduled,
+            "flight_days": scheduled * self.days,
+            "hotels": hotels,
+            "hotel_nights": hotels * self.days,
+            "bytes": sum(memoryview(column).nbytes for column in self._columns.values()),
+        }
+
+    def route(self, index: int) -> tuple[str, str]:
+        """``(origin, destination)`` of route ``index`` (``0 <= index < describe()["routes"]``)."""
+        return self.cities[self._route_origin[index]], self.cities[self._route_destination[index]]
+
+    # --- lookups ---
+
+    def _day(self, iso_date: str) -> int:
+        return (date.fromisoformat(iso_date) - _EPOCH).days % self.days
+
+    def _flight(self, row: int, day: int, origin: str, destination: str, iso_date: str) -> dict[str, Any]:
+        airline = _AIRLINES[self._flight_airline[row]]
+        return {
+            "airline": airline,
+            "flight_no": f"{airline[:2].upper()}{self._flight_number[row]}",
+            "origin": origin,
+            "destination": destination,
+            "date": iso_date,
+            "departure": _fmt_minutes(self._flight_departure[row]),
+            "duration": _fmt_duration(self._flight_duration[row]),
+            "price_usd": self._fare(row, day),
+            "class": "Economy",
+        }
+
+    def _fare(self, row: int, day: int) -> int:
+        return max(39, self._flight_fare[row] + self._fare_jitter[row * self.days + day] - 100)
+
+    def _nightly(self, hotel: int, day: int) -> int:
+        return self._hotel_rate[hotel] + self._rate_jitter[hotel * self.days + day] // 4 - 32
+
+    def flights(
+        self, origin: str, destination: str, iso_date: str, max_price: float = 0, airline: str = "", limit: int = 5
+    ) -> list[dict[str, Any]]:
+        """Cheapest ``limit`` flights on a route and date that pass the filters."""
+        o, d = self._city_ids.get(_city_key(origin)), self._city_ids.get(_city_key(destination))
+        route = self._routes.get((o, d)) if o is not None and d is not None else None
+        if route is None:
+            return []
+        day = self._day(iso_date)
+        wanted = airline.strip().lower()
+        rows = []
+        for row in range(self._route_offsets[route], self._route_offsets[route + 1]):
+            fare = self._fare(row, day)
+            if max_price and fare > max_price:
+                continue
+            if wanted and wanted not in _AIRLINES[self._flight_airline[row]].lower():
+                continue
+            rows.append((fare, self._flight_departure[row], row))
+        rows.sort()
+        return [self._flight(row, day, self.cities[o], self.cities[d], iso_date) for _, _, row in rows[: max(limit, 0) or None]]
+
+    def hotels(
+        self,
+        city: str,
+        check_in: str,
+        check_out: str,
+        max_price: float = 0,
+        min_rating: float = 0,
+        amenities: str = "",
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Best-rated ``limit`` hotels in a city for a stay that pass the filters.
+
+        Hotels are stored best rated first, so the scan stops as soon as
+        ``limit`` matches are found or ratings fall below ``min_rating``.
+        """
+        c = self._city_ids.get(_city_key(city))
+        mask = _amenity_mask(amenities)
+        if c is None or mask is None:
+            return []
+        first, nights = self._day(check_in), (date.fromisoformat(check_out) - date.fromisoformat(check_in)).days
+        if nights < 1:
+            return []
+        days = [(first + n) % self.days for n in range(nights)]
+        results = []
+        for hotel in range(self._hotel_offsets[c], self._hotel_offsets[c + 1]):
+            rating = self._hotel_rating[hotel] / 10
+            if rating < min_rating:
+                break
+            if self._hotel_amenities[hotel] & mask != mask:
+                continue
+            rates = [self._nightly(hotel, day) for day in days]
+            nightly = round(sum(rates) / nights)
+            if max_price and nightly > max_price:
+                continue
+            bits = self._hotel_amenities[hotel]
+            results.append({
+                "name": f"{_BRANDS[self._hotel_brand[hotel]]} {_DISTRICTS[self._hotel_district[hotel]]}",
+                "city": self.cities[c],
+                "check_in": check_in,
+                "check_out": check_out,
+                "price_per_night_usd": nightly,
+                "rating": rating,
+                "amenities": [name for i, name in enumerate(AMENITIES) if bits >> i & 1],
+            })
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    # --- tool functions (same names and core arguments as the default mocks) ---
+
+    def hotel_rates(self, city: str, check_in: str, check_out: str, limit: int = 10) -> dict[str, Any]:
+        """Nightly-rate matrix for the best-rated ``limit`` hotels (same shape as ``search_hotel_rates``)."""
+        nights = date_range(check_in, check_out)[:-1]
+        if not nights:
+            raise ValueError("check_out must be after check_in")
+        c = self._city_ids.get(_city_key(city))
+        rows = []
+        if c is not None:
+            end = self._hotel_offsets[c + 1]
+            for hotel in range(self._hotel_offsets[c], min(end, self._hotel_offsets[c] + limit) if limit else end):
+                rates = [self._nightly(hotel, self._day(night)) for night in nights]
+                name = f"{_BRANDS[self._hotel_brand[hotel]]} {_DISTRICTS[self._hotel_district[hotel]]}"
+                rows.append([name, self._hotel_rating[hotel] / 10, sum(rates), rates])
+        return {"city": city, "nights": nights, "columns": ["name", "rating", "total_usd", "nightly_usd"], "rows": rows}
+
+    def flight_dates(
+        self, origin: str, destination: str, start_date: str, end_date: str = "", flex_days: int = 0
+    ) -> dict[str, Any]:
+        """Price-by-date matrix (same shape as ``search_flight_dates``)."""
+        columns = ["date", "price_usd", "airline", "flight_no", "departure", "duration", "options"]
+        rows = []
+        for day in date_range(start_date, end_date, flex_days):
+            options = self.flights(origin, destination, day, limit=0)
+            if options:
+                best = options[0]
+                rows.append([day, best["price_usd"], best["airline"], best["flight_no"], best["departure"], best["duration"], len(options)])
+        cheapest = min(rows, key=lambda row: (row[1], row[0])) if rows else [None, None]
+        return {
+            "origin": origin,
+            "destination": destination,
+            "cheapest_date": cheapest[0],
+            "cheapest_price_usd": cheapest[1],
+            "columns": columns,
+            "rows": rows,
+        }
+
+    def tools(self) -> dict[str, Any]:
+        """Flight and hotel tool callables backed by this inventory, keyed by tool name."""
+        inventory = self
+
+        def search_flights(
+            origin: str, destination: str, date: str, max_price: float = 0, airline: str = "", limit: int = 5
+        ) -> str:
+            """Search for available flights between two cities on a given date.
+
+            Args:
+                origin: Departure city (e.g. "New York").
+                destination: Arrival city (e.g. "Tokyo").
+                date: Travel date in YYYY-MM-DD format.
+                max_price: Only flights at or under this price in USD (0 = no limit).
+                airline: Only flights by this airline (case-insensitive substring).
+                limit: Maximum number of flights to return, cheapest first.
+
+            Returns:
+                JSON string with a list of flight options.
+            """
+            return json.dumps(inventory.flights(origin, destination, date, max_price, airline, limit), indent=2)
+
+        def search_hotels(
+            city: str, check_in: str, check_out: str, max_price: float = 0, min_rating: float = 0,
+            amenities: str = "", limit: int = 5,
+        ) -> str:
+            """Search for available hotels in a city for given dates.
+
+            Args:
+                city: Destination city (e.g. "Tokyo").
+                check_in: Check-in date in YYYY-MM-DD format.
+                check_out: Check-out date in YYYY-MM-DD format.
+                max_price: Only hotels whose average nightly rate is at or under this (0 = no limit).
+                min_rating: Only hotels rated at least this many stars.
+                amenities: Comma-separated amenities every hotel must have (e.g. "Pool, Gym").
+                limit: Maximum number of hotels to return, best rated first.
+
+            Returns:
+                JSON string with a list of hotel options.
+            """
+            return json.dumps(
+                inventory.hotels(city, check_in, check_out, max_price, min_rating, amenities, limit), indent=2
+            )
+
+        def search_flight_dates(
+            origin: str, destination: str, start_date: str, end_date: str = "", flex_days: int = 0
+        ) -> str:
+            """Find the cheapest flight on every date of a range in one call.
+
+            Args:
+                origin: Departure city (e.g. "New York").
+                destination: Arrival city (e.g. "Tokyo").
+                start_date: First travel date in YYYY-MM-DD format.
+                end_date: Last travel date in YYYY-MM-DD format (defaults to start_date).
+                flex_days: Extra days to search on either side of the range (e.g. 3 for ±3 days).
+
+            Returns:
+                JSON string with a price-by-date matrix.
+            """
+            return json.dumps(inventory.flight_dates(origin, destination, start_date, end_date, flex_days))
+
+        def search_hotel_rates(city: str, check_in: str, check_out: str) -> str:
+            """Get the best-rated hotels' rate for each night of a stay in one call.
+
+            Args:
+                city: Destination city (e.g. "Tokyo").
+                check_in: Check-in date in YYYY-MM-DD format.
+                check_out: Check-out date in YYYY-MM-DD format.
+
+            Returns:
+                JSON string with a nightly-rate matrix.
+            """
+            return json.dumps(inventory.hotel_rates(city, check_in, check_out))
+
+        return {
+            "search_flights": search_flights,
+            "search_flight_dates": search_flight_dates,
+            "search_hotels": search_hotels,
+            "search_hotel_rates": search_hotel_rates,
+        }
+
+
+_inventories: dict[str, SyntheticInventory] = {}
+_inventories_lock = threading.Lock()
+
+
+def get_inventory(spec: str) -> SyntheticInventory:
+    """Process-wide inventory: ``"synthetic"`` generates the default world, anything else is a saved directory."""
+    with _inventories_lock:
+        if spec not in _inventories:
+            _inventories[spec] = SyntheticInventory.generate() if spec == "synthetic" else SyntheticInventory.load(spec)
+        return _inventories[spec]
+
+
+async def load_inventory(spec: str) -> SyntheticInventory:
+    """``get_inventory`` in a worker thread: generating the default world takes seconds and would stall the event loop."""
+    return await asyncio.to_thread(get_inventory, spec)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate and save a synthetic travel inventory")
+    parser.add_argument("--out", required=True, help="directory to write the columns to")
+    parser.add_argument("--cities", type=int, default=2000)
+    parser.add_argument("--routes-per-city", type=int, default=12)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    inventory = SyntheticInventory.generate(args.cities, args.routes_per_city, days=args.days, seed=args.seed)
+    inventory.save(args.out)
+    print(json.dumps(inventory.describe()))
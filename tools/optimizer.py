@@ -0,0 +1,180 @@
+"""Budget-constrained trip optimizer — the best flight + hotel bundles in one tool call.
+
+Given an itinerary skeleton (origin, ordered destinations, the date of each
+move), every flight leg and hotel stay is fetched concurrently through the
+regular ``search_flights`` / ``search_hotels`` tools (so the result cache
+and the selected inventory backend apply), then a branch-and-bound search
+picks the best-scoring combinations whose exact total fits the budget.
+
+Score = total cost − ``rating_value`` × (hotel stars above 3) × nights, i.e.
+a better-rated hotel is worth paying a little more for.
+"""
+
+import asyncio
+import heapq
+import json
+import math
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Awaitable, Callable
+
+RATING_VALUE_USD = 40  # worth of one extra hotel star per night when scoring
+
+
+@dataclass(frozen=True)
+class _Option:
+    cost: float
+    score: float
+    detail: dict[str, Any]
+
+
+def _split(text: str) -> list[str]:
+    return [part.strip() for part in text.split(",") if part.strip()]
+
+
+def _flight_options(flights: list[dict], leg: str, travelers: int) -> list[_Option]:
+    options = []
+    for f in flights:
+        cost = f["price_usd"] * travelers
+        detail = {"leg": leg, "date": f["date"], "airline": f["airline"], "flight_no": f["flight_no"],
+                  "departure": f["departure"], "price_usd": f["price_usd"], "subtotal_usd": cost}
+        options.append(_Option(cost, cost, detail))
+    return sorted(options, key=lambda o: o.score)
+
+
+def _hotel_options(hotels: list[dict], nights: int, rooms: int) -> list[_Option]:
+    options = []
+    for h in hotels:
+        cost = h["price_per_night_usd"] * nights * rooms
+        score = cost - RATING_VALUE_USD * (h["rating"] - 3) * nights
+        detail = {"city": h["city"], "name": h["name"], "rating": h["rating"], "check_in": h["check_in"],
+                  "check_out": h["check_out"], "nights": nights, "price_per_night_usd": h["price_per_night_usd"],
+                  "subtotal_usd": cost}
+        options.append(_Option(cost, score, detail))
+    return sorted(options, key=lambda o: o.score)
+
+
+def best_bundles(components: list[list[_Option]], budget: float, top_n: int) -> tuple[list[tuple[float, float, list[_Option]]], int]:
+    """Branch-and-bound over one option per component.
+
+    Keeps the ``top_n`` lowest scores with total cost ≤ ``budget`` (0 = no
+    budget). A branch is cut when even the cheapest (or best-scoring) choice
+    for every remaining component cannot fit the budget (or beat the current
+    ``top_n``-th bundle). Returns ``(score, cost, options)`` sorted by score,
+    plus the number of nodes explored.
+    """
+    # Suffix bounds: the least cost / score still to add from component i on
+    min_cost = [0.0] * (len(components) + 1)
+    min_score = [0.0] * (len(components) + 1)
+    for i in range(len(components) - 1, -1, -1):
+        min_cost[i] = min_cost[i + 1] + min(o.cost for o in components[i])
+        min_score[i] = min_score[i + 1] + min(o.score for o in components[i])
+
+    best: list[tuple[float, int, float, list[_Option]]] = []  # max-heap on score via negation
+    explored = 0
+    counter = 0
+
+    def search(i: int, cost: float, score: float, chosen: list[_Option]) -> None:
+        nonlocal explored, counter
+        explored += 1
+        if i == len(components):
+            counter += 1
+            entry = (-score, counter, cost, list(chosen))
+            if len(best) < top_n:
+                heapq.heappush(best, entry)
+            elif score < -best[0][0]:
+                heapq.heapreplace(best, entry)
+            return
+        for option in components[i]:  # sorted by score, so later options only get worse
+            next_cost, next_score = cost + option.cost, score + option.score
+            if len(best) == top_n and next_score + min_score[i + 1] >= -best[0][0]:
+                break
+            if budget and next_cost + min_cost[i + 1] > budget:
+                continue
+            chosen.append(option)
+            search(i + 1, next_cost, next_score, chosen)
+            chosen.pop()
+
+    search(0, 0.0, 0.0, [])
+    ranked = sorted(((-neg, cost, options) for neg, _, cost, options in best), key=lambda b: b[0])
+    return ranked, explored
+
+
+def make_optimizer(
+    search_flights: Callable[..., str], search_hotels: Callable[..., str]
+) -> Callable[..., Awaitable[str]]:
+    """Build the ``optimize_trip`` tool on top of the given (cached) search functions."""
+
+    async def optimize_trip(
+        origin: str, destinations: str, dates: str, budget_usd: float = 0, travelers: int = 1,
+        return_home: bool = True, top_n: int = 3,
+    ) -> str:
+        """Find the best flight + hotel bundles for a round trip or multi-city trip within a budget.
+
+        Args:
+            origin: Home city the trip starts from (e.g. "New York").
+            destinations: Comma-separated cities in visiting order (e.g. "Tokyo, Kyoto").
+            dates: Comma-separated YYYY-MM-DD dates: the departure from the origin,
+                then the day you leave each destination (one more date than destinations).
+            budget_usd: Total budget for all flights and hotels (0 = no budget).
+            travelers: Number of travelers (one seat each, one room per two).
+            return_home: Whether the last leg flies back to the origin.
+            top_n: How many bundles to return.
+
+        Returns:
+            JSON string with the best bundles (exact totals, chosen flight per
+            leg and hotel per stay), best first.
+        """
+        stops, days = _split(destinations), _split(dates)
+        if not stops or len(days) != len(stops) + 1:
+            raise ValueError("Give one more date than destinations: the departure date, then the day you leave each city")
+        nights = [(date.fromisoformat(days[i + 1]) - date.fromisoformat(days[i])).days for i in range(len(stops))]
+        if min(nights) < 1:
+            raise ValueError("Dates must be strictly increasing")
+        travelers = max(1, travelers)
+        rooms = math.ceil(travelers / 2)
+
+        cities = [origin, *stops] + ([origin] if return_home else [])
+        legs = [(cities[i], cities[i + 1], days[i]) for i in range(len(cities) - 1)]
+        stays = [(stop, days[i], days[i + 1]) for i, stop in enumerate(stops)]
+
+        # Every leg and stay is independent — fetch them all at once
+        results = await asyncio.gather(
+            *(asyncio.to_thread(search_flights, a, b, d) for a, b, d in legs),
+            *(asyncio.to_thread(search_hotels, c, i, o) for c, i, o in stays),
+        )
+        flight_results, hotel_results = results[: len(legs)], results[len(legs):]
+        components = [
+            _flight_options(json.loads(raw), f"{a} → {b}", travelers) for (a, b, _), raw in zip(legs, flight_results)
+        ] + [
+            _hotel_options(json.loads(raw), n, rooms) for raw, n in zip(hotel_results, nights)
+        ]
+        missing = [desc for desc, options in zip([f"flights {a} → {b} on {d}" for a, b, d in legs]
+                                                 + [f"hotels in {c}" for c, _, _ in stays], components) if not options]
+        if missing:
+            return json.dumps({"bundles": [], "note": f"No availability for: {', '.join(missing)}"})
+
+        bundles, explored = best_bundles(components, budget_usd, max(1, top_n))
+        report: dict[str, Any] = {
+            "budget_usd": budget_usd or None,
+            "travelers": travelers,
+            "bundles": [
+                {
+                    "total_usd": round(cost, 2),
+                    "score": round(score, 2),
+                    "flights": [o.detail for o in options[: len(legs)]],
+                    "hotels": [o.detail for o in options[len(legs):]],
+                }
+                for score, cost, options in bundles
+            ],
+            "combinations": math.prod(len(c) for c in components),
+            "explored": explored,
+        }
+        if not bundles:
+            report["note"] = (
+                f"No combination fits the budget; the cheapest possible total is "
+                f"${sum(min(o.cost for o in c) for c in components):,.0f}"
+            )
+        return json.dumps(report)
+
+    return optimize_trip
@@ -0,0 +1,36 @@
+"""Deterministic ranking of tool results — what the specialists' prompts ask the model to do.
+
+With ranking applied before results reach the conversation, a specialist
+can hand its tool output straight back (no reflection completion) and the
+first row is always the recommended option.
+"""
+
+import re
+from typing import Any
+
+_DURATION = re.compile(r"(?:(\d+)\s*h)?\s*(?:(\d+)\s*m)?")
+
+
+def duration_minutes(text: str) -> int:
+    """``"13h 15m"`` → ``795``; unparseable durations sort last."""
+    match = _DURATION.fullmatch(text.strip()) if text else None
+    if not match or not any(match.groups()):
+        return 1 << 30
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def rank_flights(flights: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Cheapest first, then shortest, then earliest departure."""
+    return sorted(
+        flights,
+        key=lambda f: (f.get("price_usd", float("inf")), duration_minutes(f.get("duration", "")), f.get("departure", "")),
+    )
+
+
+def rank_hotels(hotels: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Best rated first, then cheapest per night, then by name."""
+    return sorted(
+        hotels,
+        key=lambda h: (-h.get("rating", 0), h.get("price_per_night_usd", float("inf")), h.get("name", "")),
+    )
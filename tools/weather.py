@@ -3,6 +3,8 @@
 import hashlib
 import json
 
+from tools.dates import date_range
+
 _CONDITIONS = ["Sunny", "Partly Cloudy", "Cloudy", "Light Rain", "Rainy", "Thunderstorms", "Snowy", "Foggy"]
 _WIND_DESCRIPTIONS = ["Calm", "Light Breeze", "Moderate Wind", "Windy", "Strong Gusts"]
 
@@ -11,16 +13,8 @@ def _seed(text: str) -> int:
     return int(hashlib.md5(text.encode()).hexdigest(), 16)
 
 
-def get_weather(city: str, date: str) -> str:
-    """Get the weather forecast for a city on a given date.
-
-    Args:
-        city: City name (e.g. "Tokyo").
-        date: Date in YYYY-MM-DD format.
-
-    Returns:
-        JSON string with weather forecast details.
-    """
+def _forecast(city: str, date: str) -> dict:
+    """Forecast for one city and date."""
     seed = _seed(f"{city}-{date}")
 
     temp_base = (seed % 30) + 5  # 5-34°C range
@@ -39,4 +33,36 @@ def get_weather(city: str, date: str) -> str:
         "wind": wind,
         "wind_speed_kmh": wind_speed_kmh,
     }
-    return json.dumps(forecast, indent=2)
+    return forecast
+
+
+def get_weather(city: str, date: str) -> str:
+    """Get the weather forecast for a city on a given date.
+
+    Args:
+        city: City name (e.g. "Tokyo").
+        date: Date in YYYY-MM-DD format.
+
+    Returns:
+        JSON string with weather forecast details.
+    """
+    return json.dumps(_forecast(city, date), indent=2)
+
+
+def get_weather_range(city: str, start_date: str, end_date: str) -> str:
+    """Get the daily weather forecast for a city over a date range in one call.
+
+    Args:
+        city: City name (e.g. "Tokyo").
+        start_date: First date in YYYY-MM-DD format.
+        end_date: Last date in YYYY-MM-DD format.
+
+    Returns:
+        JSON string with a forecast-by-day matrix (one row per date).
+    """
+    columns = ["date", "condition", "temperature_celsius", "temperature_fahrenheit", "humidity_percent", "wind", "wind_speed_kmh"]
+    rows = []
+    for day in date_range(start_date, end_date):
+        forecast = _forecast(city, day)
+        rows.append([forecast[column] for column in columns])
+    return json.dumps({"city": city, "columns": columns, "rows": rows})